@@ -1,29 +1,57 @@
 from flask import Flask
-from flask_bcrypt import Bcrypt
-from flask_jwt_extended import JWTManager
-from app.persistence.repository import db
-from app.api.v1 import api as api_v1
-from flask_sqlalchemy import SQLAlchemy
-
-db = SQLAlchemy()
-
-bcrypt = Bcrypt()
-jwt = JWTManager()
+from app.extensions import db, bcrypt, jwt
 
 def create_app(config_class="config.DevelopmentConfig"):
     app = Flask(__name__)
-    
-    # FIRST: Configure your app settings clearly and explicitly before init_db
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///yourdb.sqlite3'
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-    app.config['JWT_SECRET_KEY'] = 'your_secret_key_here'
+
+    # FIRST: Load the settings of the selected config class
+    app.config.from_object(config_class)
+
+    # Pool sizing, statement timeouts and pool metrics for this database
+    from app.persistence.engine import engine_options, install_engine_hooks
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
 
     # THEN initialize your extensions
     db.init_app(app)
     bcrypt.init_app(app)
     jwt.init_app(app)
+    with app.app_context():
+        app.extensions['hbnb_pool_metrics'] = {'primary': install_engine_hooks(db.engine, app.config)}
+    # Read replicas for read-only facade calls (SQLALCHEMY_REPLICA_URIS)
+    from app.persistence.routing import init_replicas
+    app.extensions['hbnb_replicas'] = init_replicas(app, install_engine_hooks)
+
+    # bcrypt cost and hashing pool size come from the config
+    from app.utils.security import hasher
+    hasher.init_app(app)
+
+    # Response JSON encoder (orjson, msgspec or stdlib json)
+    from app.utils.serialization import encoder
+    encoder.init_app(app)
+
+    # gzip/brotli negotiation for API responses (COMPRESSION_*)
+    from app.utils.compression import compressor
+    compressor.init_app(app)
+
+    # SQL statement and pool metrics for /metrics (METRICS_ENABLED)
+    from app.utils.metrics import init_metrics
+    with app.app_context():
+        init_metrics(app, db.engine)
+
+    # Per-client rate limits and admission control for the API (RATE_LIMITS, ADMISSION_*)
+    from app.utils.rate_limit import limiter
+    limiter.init_app(app)
+
+    # Repository caching is configured per app
+    from app.services import facade
+    facade.init_app(app)
 
     # THEN register your API blueprint
+    from app.api.v1 import api as api_v1
     app.register_blueprint(api_v1.blueprint, url_prefix='/api/v1')
 
-    return app
\ No newline at end of file
+    # Register `flask hbnb ...` CLI commands
+    from app.commands import hbnb_cli
+    app.cli.add_command(hbnb_cli)
+
+    return app
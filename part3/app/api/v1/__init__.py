@@ -3,7 +3,15 @@ from flask_restx import Api
 from app.api.v1.users import api as users_namespace
 from app.api.v1.amenities import api as amenities_namespace
 from app.api.v1.places import api as places_namespace
+from app.api.v1.reviews import api as reviews_namespace
 from app.api.v1.auth import api as auth_namespace  # make sure this line is correct
+from app.api.v1.stats import api as stats_namespace
+from app.api.v1.exports import api as exports_namespace
+from app.utils.serialization import encoder
+from app.utils.metrics import metrics
+from app.utils.rate_limit import limiter
+from app.utils.compression import compressor
+from app.utils.security import HasherBusy, HASHER_RETRY_AFTER
 
 blueprint = Blueprint('api_v1', __name__, url_prefix='/api/v1')
 
@@ -14,7 +22,42 @@ api = Api(
     description='HBnB Application API'
 )
 
+# Per-route latency, SQL and bcrypt time of every API request (served at /metrics)
+blueprint.before_request(metrics.start_request)
+
+# Per-client token buckets (429) and admission control (503) before any work is done
+blueprint.before_request(limiter.admit)
+blueprint.teardown_request(limiter.release)
+
+@blueprint.after_request
+def record_metrics(response):
+    for name, value in limiter.headers().items():
+        response.headers.setdefault(name, value)
+    metrics.finish_request(response.status_code)
+    return response
+
+# Registered last so it runs first: compression time counts in the request's metrics
+@blueprint.after_request
+def compress_response(response):
+    with metrics.timed("serialization"):
+        return compressor.compress_response(response)
+
+@api.errorhandler(HasherBusy)
+def hasher_busy(error):
+    """The bcrypt pool is saturated or too slow: shed the request like admission control does"""
+    return ({"error": "Too many password operations in progress, retry shortly"}, 503,
+            {"Retry-After": str(HASHER_RETRY_AFTER)})
+
+@api.representation('application/json')
+def output_json(data, code, headers=None):
+    """Encode responses with the configured JSON_ENCODER (orjson, msgspec or stdlib json)"""
+    with metrics.timed("serialization"):
+        return encoder.make_response(data, code, headers)
+
 api.add_namespace(users_namespace, path='/users')
 api.add_namespace(amenities_namespace, path='/amenities')
 api.add_namespace(places_namespace, path='/places')
-api.add_namespace(auth_namespace, path='/auth')
\ No newline at end of file
+api.add_namespace(reviews_namespace, path='/reviews')
+api.add_namespace(auth_namespace, path='/auth')
+api.add_namespace(stats_namespace, path='/stats')
+api.add_namespace(exports_namespace, path='/exports')
\ No newline at end of file
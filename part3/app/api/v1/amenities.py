@@ -1,6 +1,9 @@
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt
 from app.services import facade
+from app.api.v1.authorization import admin_required
+from app.api.v1.batch import check_batch_payload, batch_response
+from app.utils.http_cache import conditional, entity_validators
+from app.utils.serialization import compile_columns
 
 api = Namespace('amenities', description='Amenity operations')
 
@@ -9,26 +12,17 @@ amenity_model = api.model('Amenity', {
     'name': fields.String(required=True, description='Name of the amenity')
 })
 
-def admin_required():
-    """Ensure the user is an admin"""
-    claims = get_jwt()  # Get JWT claims
-    if not claims.get("is_admin", False):
-        return {"message": "Admin access required."}, 403
+serialize_amenity = compile_columns("amenity", ("id", "name", "created_at", "updated_at"))
 
 @api.route('/')
 class AmenityList(Resource):
-    @jwt_required()  # 🔒 Require authentication
+    @admin_required  # 🔒 Require an admin token
     @api.expect(amenity_model)
     @api.response(201, 'Amenity successfully created')
     @api.response(400, 'Invalid input data')
     @api.response(403, 'Admin access required')
     def post(self):
         """Admin: Register a new amenity"""
-        # 🔒 Ensure only admins can create amenities
-        admin_check = admin_required()
-        if admin_check:
-            return admin_check  # Returns {"message": "Admin access required."}, 403
-
         data = api.payload
 
         # ✅ Create amenity
@@ -37,26 +31,46 @@ class AmenityList(Resource):
         if not new_amenity:
             return {"message": "Invalid input data"}, 400
 
-        return {"message": "Amenity successfully created", "amenity": new_amenity}, 201
+        return {"message": "Amenity successfully created", "amenity": new_amenity.to_dict()}, 201
 
     @api.response(200, 'List of amenities retrieved successfully')
+    @api.response(304, 'Not modified since the client\'s copy')
     def get(self):
         """Retrieve a list of all amenities (Publicly accessible)"""
-        amenities = facade.get_all_amenities()
-        return amenities, 200
+        # The collection stamp is checked before any amenity is loaded
+        return conditional(*facade.versions.validators("amenities"),
+                           build=lambda: ([serialize_amenity(amenity) for amenity in facade.get_all_amenities()], 200))
+
+@api.route('/batch')
+class AmenityBatch(Resource):
+    @admin_required  # 🔒 Require an admin token
+    @api.expect([amenity_model])
+    @api.response(201, 'All amenities successfully created')
+    @api.response(207, 'Some amenities were created, see errors')
+    @api.response(400, 'No amenity could be created')
+    @api.response(403, 'Admin access required')
+    def post(self):
+        """Admin: Register many amenities at once, reporting errors per item"""
+        invalid = check_batch_payload(api.payload)
+        if invalid:
+            return invalid
+
+        created_ids, errors = facade.create_amenities(api.payload)
+        return batch_response(created_ids, errors)
 
 @api.route('/<amenity_id>')
 class AmenityResource(Resource):
     @api.response(200, 'Amenity details retrieved successfully')
+    @api.response(304, 'Not modified since the client\'s copy')
     @api.response(404, 'Amenity not found')
     def get(self, amenity_id):
         """Get amenity details by ID (Publicly accessible)"""
         amenity = facade.get_amenity_by_id(amenity_id)
         if not amenity:
             return {"message": "Amenity not found"}, 404
-        return amenity, 200
+        return conditional(*entity_validators(amenity), build=lambda: (serialize_amenity(amenity), 200))
 
-    @jwt_required()  # 🔒 Require authentication
+    @admin_required  # 🔒 Require an admin token
     @api.expect(amenity_model)
     @api.response(200, 'Amenity updated successfully')
     @api.response(404, 'Amenity not found')
@@ -64,11 +78,6 @@ class AmenityResource(Resource):
     @api.response(403, 'Admin access required')
     def put(self, amenity_id):
         """Admin: Update an amenity's information"""
-        # 🔒 Ensure only admins can update amenities
-        admin_check = admin_required()
-        if admin_check:
-            return admin_check  # Returns {"message": "Admin access required."}, 403
-
         data = api.payload
 
         # 🔎 Check if the amenity exists
@@ -82,4 +91,4 @@ class AmenityResource(Resource):
         if not updated_amenity:
             return {"message": "Invalid input data"}, 400
 
-        return {"message": "Amenity updated successfully", "amenity": updated_amenity}, 200
\ No newline at end of file
+        return {"message": "Amenity updated successfully", "amenity": updated_amenity.to_dict()}, 200
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""Async handlers for the public place reads, served natively by the ASGI app.
+
+They run inside a Flask request context (for the reqparse parsers and
+serializers in places.py) and return the same bodies and validators as
+the Resources, including 304 responses. Collection version stamps come from
+the sync facade's store (a database table or Redis), so they are read in a
+worker thread rather than on the event loop.
+"""
+import asyncio
+from app.api.v1.places import (
+    parse_listing_args, listing_response, parse_search_args, search_response, detail_response,
+    collection_validators, parse_facet_args, SEARCH_METHODS, SEARCH_UNAVAILABLE,
+)
+from app.persistence.fulltext import FullTextUnavailable
+from app.utils.http_cache import conditional_async
+
+
+async def collection_validators_async():
+    """collection_validators() in a worker thread (the request context goes along with the contextvars)"""
+    return await asyncio.to_thread(collection_validators)
+
+
+async def list_places(facade):
+    """GET /api/v1/places/"""
+    async def build():
+        listing_args, error = parse_listing_args()
+        if error:
+            return error
+        try:
+            places, next_cursor = await facade.get_all_places(**listing_args)
+        except ValueError as e:  # Bad sort key or InvalidCursor
+            return {"message": str(e)}, 400
+        return listing_response(places, next_cursor, listing_args["fields"], listing_args["with_relations"])
+    return await conditional_async(*await collection_validators_async(), build=build)
+
+
+async def search_places(facade):
+    """GET /api/v1/places/search"""
+    async def build():
+        search, error = parse_search_args()
+        if error:
+            return error
+        kind, params, limit = search
+        try:
+            results = await getattr(facade, SEARCH_METHODS[kind])(*params, limit=limit)
+        except FullTextUnavailable:
+            return SEARCH_UNAVAILABLE
+        return search_response(kind, results)
+    return await conditional_async(*await collection_validators_async(), build=build)
+
+
+async def place_facets(facade):
+    """GET /api/v1/places/facets"""
+    async def build():
+        facet_args, error = parse_facet_args()
+        if error:
+            return error
+        try:
+            return await facade.get_place_facets(**facet_args), 200
+        except ValueError as e:  # Bucket width not positive or too narrow
+            return {"message": str(e)}, 400
+    return await conditional_async(*await collection_validators_async(), build=build)
+
+
+async def get_place(facade, place_id):
+    """GET /api/v1/places/<place_id>"""
+    return detail_response(await facade.get_place_details(place_id))
+
+
+def match_route(path):
+    """(handler, kwargs) for the natively async routes, or (None, None)"""
+    prefix = "/api/v1/places/"
+    if not path.startswith(prefix):
+        return None, None
+    rest = path[len(prefix):]
+    if rest == "":
+        return list_places, {}
+    if rest == "search":
+        return search_places, {}
+    if rest == "facets":
+        return place_facets, {}
+    if "/" not in rest and rest != "batch":
+        return get_place, {"place_id": rest}
+    return None, None
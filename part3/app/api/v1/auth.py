@@ -1,7 +1,9 @@
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import create_access_token
 from app.services import facade
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.utils.security import HasherBusy, HASHER_RETRY_AFTER
+from flask_jwt_extended import jwt_required
+from app.api.v1.authorization import current_principal
 
 api = Namespace('auth', description='Authentication operations')
 
@@ -14,6 +16,9 @@ login_model = api.model('Login', {
 @api.route('/login')
 class Login(Resource):
     @api.expect(login_model)
+    @api.response(200, 'Login successful')
+    @api.response(401, 'Invalid credentials')
+    @api.response(503, 'Password hashing capacity exhausted')
     def post(self):
         """Authenticate user and return a JWT token"""
         credentials = api.payload  # Get the email and password from the request payload
@@ -22,11 +27,23 @@ class Login(Resource):
         user = facade.get_user_by_email(credentials['email'])
         
         # Step 2: Check if the user exists and the password is correct
-        if not user or not user.verify_password(credentials['password']):
-            return {'error': 'Invalid credentials'}, 401
+        try:
+            if not user or not user.verify_password(credentials['password']):
+                return {'error': 'Invalid credentials'}, 401
+        except HasherBusy:
+            return ({'error': 'Too many login attempts in progress, retry shortly'}, 503,
+                    {'Retry-After': str(HASHER_RETRY_AFTER)})
 
-        # Step 3: Create a JWT token with the user's id and is_admin flag
-        access_token = create_access_token(identity={'id': str(user.id), 'is_admin': user.is_admin})
+        # Step 2b: Upgrade the stored hash if the configured bcrypt cost changed
+        if user.password_needs_rehash():
+            try:
+                facade.update_user(user.id, {'password': user.hash_password(credentials['password'])})
+            except HasherBusy:
+                pass  # Retried on a later login
+
+        # Step 3: Create a JWT token with the user's id as subject and an is_admin claim,
+        # so authorization checks never need to look the user up again
+        access_token = create_access_token(identity=str(user.id), additional_claims={'is_admin': user.is_admin})
         
         # Step 4: Return the JWT token to the client
         return {'access_token': access_token}, 200
@@ -36,5 +53,5 @@ class ProtectedResource(Resource):
     @jwt_required()
     def get(self):
         """A protected endpoint that requires a valid JWT token"""
-        current_user = get_jwt_identity()  # Retrieve the user's identity from the token
-        return {'message': f'Hello, user {current_user["id"]}'}, 200
+        current_user = current_principal()  # Retrieve the user's identity from the token
+        return {'message': f'Hello, user {current_user.id}'}, 200
@@ -0,0 +1,53 @@
+"""Request-scoped authorization context shared by every namespace."""
+from dataclasses import dataclass
+from functools import wraps
+from flask import g
+from flask_jwt_extended import get_jwt, jwt_required
+from app.services import facade
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user as far as authorization checks are concerned."""
+    id: str
+    is_admin: bool = False
+
+
+def _resolve(claims):
+    """Build the principal from the token, falling back to the users table for old tokens.
+
+    Only the fallback costs a lookup; it goes through the user repository,
+    whose cache (CachedRepository) is invalidated when a user's role changes.
+    """
+    if "is_admin" in claims:
+        return Principal(id=str(claims["sub"]), is_admin=bool(claims["is_admin"]))
+    identity = claims["sub"]
+    if isinstance(identity, dict):  # Tokens issued with a dict identity
+        return Principal(id=str(identity["id"]), is_admin=bool(identity.get("is_admin", False)))
+    user = facade.get_user_by_id(identity)
+    return Principal(id=str(identity), is_admin=bool(user and user.is_admin))
+
+
+def current_principal():
+    """Principal of the current request.
+
+    The JWT is decoded once per request by @jwt_required; the principal is
+    memoized on ``g`` against that decoded token, so a later request (even
+    one sharing the application context, as in tests) resolves its own.
+    """
+    claims = get_jwt()
+    memo = g.get("hbnb_principal")
+    if memo is None or memo[0] is not claims:
+        memo = g.hbnb_principal = (claims, _resolve(claims))
+    return memo[1]
+
+
+def admin_required(fn):
+    """Require a valid JWT whose principal is an admin"""
+    @wraps(fn)
+    @jwt_required()
+    def wrapper(*args, **kwargs):
+        if not current_principal().is_admin:
+            return {"message": "Admin access required."}, 403
+        return fn(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,26 @@
+"""Helpers shared by the batch creation endpoints."""
+
+# Largest number of items accepted by one batch request
+MAX_BATCH_ITEMS = 1000
+
+
+def check_batch_payload(payload):
+    """Return an error response if the payload is not a list of 1..MAX_BATCH_ITEMS objects"""
+    if not isinstance(payload, list) or not payload:
+        return {"message": "Expected a non-empty JSON list"}, 400
+    if len(payload) > MAX_BATCH_ITEMS:
+        return {"message": f"A batch cannot contain more than {MAX_BATCH_ITEMS} items"}, 400
+    if not all(isinstance(item, dict) for item in payload):
+        return {"message": "Every batch item must be a JSON object"}, 400
+    return None
+
+
+def batch_response(created_ids, errors):
+    """201 when every item was created, 207 for partial success, 400 when nothing was"""
+    if not created_ids:
+        status = 400
+    elif errors:
+        status = 207
+    else:
+        status = 201
+    return {"created": created_ids, "errors": errors}, status
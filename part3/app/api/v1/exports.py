@@ -0,0 +1,82 @@
+import csv
+import io
+from datetime import timezone
+from flask import Response, stream_with_context
+from flask_restx import Namespace, Resource, reqparse, inputs
+from app.services import facade
+from app.services.facade import EXPORTS
+from app.api.v1.authorization import admin_required
+from app.utils.serialization import compile_tuple, encoder
+
+api = Namespace('exports', description='Streaming bulk exports')
+
+# Rows written per chunk of the chunked HTTP response
+EXPORT_CHUNK_ROWS = 500
+
+export_parser = reqparse.RequestParser()
+export_parser.add_argument('format', type=str, default='ndjson', choices=('ndjson', 'csv'), location='args',
+                           help='ndjson (one JSON object per line) or csv')
+export_parser.add_argument('updated_since', type=inputs.datetime_from_iso8601, location='args',
+                           help='Only rows updated at or after this ISO 8601 time (incremental pulls)')
+
+
+def _chunked(rows, write):
+    """Join the encoded rows into chunks of EXPORT_CHUNK_ROWS"""
+    chunk = []
+    for row in rows:
+        chunk.append(write(row))
+        if len(chunk) >= EXPORT_CHUNK_ROWS:
+            yield b"".join(chunk)
+            chunk = []
+    if chunk:
+        yield b"".join(chunk)
+
+
+def ndjson_stream(collection, columns, rows):
+    serialize = compile_tuple(collection, columns)
+    return _chunked(rows, lambda row: encoder.dumps(serialize(row)) + b"\n")
+
+
+def csv_stream(columns, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def write(row):
+        writer.writerow(value.isoformat() if hasattr(value, "isoformat") else value for value in row)
+        line = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    yield write(columns)
+    yield from _chunked(rows, write)
+
+
+@api.route('/<string:collection>')
+@api.param('collection', f"One of {', '.join(EXPORTS)}")
+class Export(Resource):
+    @admin_required  # 🔒 Require an admin token
+    @api.expect(export_parser)
+    @api.response(200, 'Rows streamed as NDJSON or CSV, oldest update first')
+    @api.response(403, 'Admin access required')
+    @api.response(404, 'Unknown collection')
+    def get(self, collection):
+        """Admin: Stream every row of a collection (optionally only those updated since a watermark)"""
+        if collection not in EXPORTS:
+            return {"message": f"Unknown collection, choose one of {', '.join(EXPORTS)}"}, 404
+        args = export_parser.parse_args()
+        updated_since = args['updated_since']
+        if updated_since is not None and updated_since.tzinfo is not None:
+            updated_since = updated_since.astimezone(timezone.utc).replace(tzinfo=None)  # Stored as naive UTC
+
+        columns, rows = facade.export_rows(collection, updated_since)
+        if args['format'] == 'csv':
+            body, mimetype = csv_stream(columns, rows), 'text/csv'
+        else:
+            body, mimetype = ndjson_stream(collection, columns, rows), 'application/x-ndjson'
+        # No Content-Length: the body is sent chunked while the cursor is read.
+        # stream_with_context keeps the request (and its database session) alive meanwhile.
+        return Response(stream_with_context(body), mimetype=mimetype, headers={
+            "Cache-Control": "no-store",
+            "Content-Disposition": f"attachment; filename={collection}.{args['format']}",
+        })
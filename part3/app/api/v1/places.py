@@ -1,6 +1,15 @@
-from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity
+import functools
+from flask import request
+from flask_restx import Namespace, Resource, fields, reqparse
+from flask_jwt_extended import jwt_required
 from app.services import facade
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.api.v1.batch import check_batch_payload, batch_response
+from app.api.v1.authorization import current_principal
+from app.utils.http_cache import conditional, entity_validators
+from app.utils.serialization import compile_model, compile_columns
+from app.persistence.fulltext import FullTextUnavailable, search_terms
+from app.persistence.PlaceRepository import DEFAULT_PRICE_BUCKET, MAX_SEARCH_RADIUS_KM, RELATION_NAMES
 
 api = Namespace('places', description='Place operations')
 
@@ -35,6 +44,131 @@ place_model = api.model('Place', {
     'reviews': fields.List(fields.Nested(review_model), description='List of reviews')
 })
 
+# Output model: a place with its owner, amenities and reviews expanded
+place_detail_model = api.model('PlaceDetail', {
+    'id': fields.String(description='Place ID'),
+    'title': fields.String(description='Title of the place'),
+    'description': fields.String(description='Description of the place'),
+    'price': fields.Float(description='Price per night'),
+    'latitude': fields.Float(description='Latitude of the place'),
+    'longitude': fields.Float(description='Longitude of the place'),
+    'review_count': fields.Integer(description='Number of reviews'),
+    'average_rating': fields.Float(description='Average rating (1-5)'),
+    'rating_histogram': fields.Raw(description='Number of reviews per rating value'),
+    'owner': fields.Nested(user_model, description='Owner of the place'),
+    'amenities': fields.List(fields.Nested(amenity_model), description='List of amenities'),
+    'reviews': fields.List(fields.Nested(review_model), description='List of reviews')
+})
+
+# Compiled serializers: same output as api.marshal(place, place_detail_model) / Place.to_dict()
+serialize_place_detail = compile_model(place_detail_model)
+serialize_place = compile_columns("place", (
+    "id", "title", "description", "price", "latitude", "longitude", "owner_id",
+    "review_count", "average_rating", "rating_histogram", "created_at", "updated_at",
+))
+
+# Attributes ?fields= may pick and relationships ?include= may expand, in output order
+PLACE_FIELDS = tuple(key for key in place_detail_model if key not in RELATION_NAMES)
+
+
+def place_serializer(fields=None, include=True):
+    """serialize_place_detail, or a serializer trimmed to fields (None: all) and include (True: all)"""
+    if fields is None and include is True:
+        return serialize_place_detail
+    return _sparse_place_serializer(PLACE_FIELDS if fields is None else tuple(fields),
+                                    RELATION_NAMES if include is True else tuple(include))
+
+
+@functools.lru_cache(maxsize=256)
+def _sparse_place_serializer(fields, include):
+    return compile_model(place_detail_model, keys=fields + include)
+
+
+# Query string for the place listing (filters, sort, keyset pagination and sparse fieldsets)
+place_list_parser = reqparse.RequestParser()
+place_list_parser.add_argument('min_price', type=float, location='args', help='Minimum price per night')
+place_list_parser.add_argument('max_price', type=float, location='args', help='Maximum price per night')
+place_list_parser.add_argument('amenities', type=str, action='split', location='args',
+                               help="Comma separated amenity ID's the place must offer")
+place_list_parser.add_argument('sort', type=str, default='created_at', location='args',
+                               choices=('price', '-price', 'created_at', '-created_at', 'title', '-title'),
+                               help='Sort key, prefix with - for descending order')
+place_list_parser.add_argument('limit', type=int, default=DEFAULT_PAGE_SIZE, location='args',
+                               help=f'Page size (max {MAX_PAGE_SIZE})')
+place_list_parser.add_argument('cursor', type=str, location='args', help='Cursor returned by the previous page')
+place_list_parser.add_argument('fields', type=str, action='split', location='args',
+                               help=f"Comma separated attributes to return, among {', '.join(PLACE_FIELDS)} "
+                                    "(default: all)")
+place_list_parser.add_argument('include', type=str, action='split', location='args',
+                               help=f"Comma separated relationships to expand, among {', '.join(RELATION_NAMES)} "
+                                    "(default: all, or none when fields is given)")
+
+
+def parse_sparse_args(args):
+    """(fields, include) in output order from the fields and include arguments, or an error response"""
+    fields = [name for name in args['fields'] or [] if name] or None
+    include = None if args['include'] is None else [name for name in args['include'] if name]
+    for requested, allowed, kind in ((fields, PLACE_FIELDS, "field"), (include, RELATION_NAMES, "relationship")):
+        unknown = [name for name in requested or [] if name not in allowed]
+        if unknown:
+            return None, ({"message": f"Unknown {kind} '{unknown[0]}', choose from {', '.join(allowed)}"}, 400)
+    if include is None:
+        include = True if fields is None else ()
+    else:
+        include = tuple(name for name in RELATION_NAMES if name in include)
+    if fields is not None:
+        fields = tuple(name for name in PLACE_FIELDS if name in fields)
+    return (fields, include), None
+
+
+# Request parsing and response shaping shared with the async handlers (async_places.py)
+def parse_listing_args():
+    """get_all_places keyword arguments from the query string, or an error response"""
+    args = place_list_parser.parse_args()
+    if args['min_price'] is not None and args['max_price'] is not None \
+            and args['min_price'] > args['max_price']:
+        return None, ({"message": "min_price cannot be greater than max_price"}, 400)
+    sparse, error = parse_sparse_args(args)
+    if error:
+        return None, error
+    fields, include = sparse
+    return {
+        "min_price": args['min_price'],
+        "max_price": args['max_price'],
+        "amenity_ids": [a for a in args['amenities'] or [] if a],
+        "sort": args['sort'],
+        "limit": args['limit'],
+        "cursor": args['cursor'],
+        # Only the requested columns, and one extra query per expanded relationship for the whole page
+        "with_relations": include,
+        "fields": fields,
+    }, None
+
+
+def build_listing():
+    listing_args, error = parse_listing_args()
+    if error:
+        return error
+    try:
+        places, next_cursor = facade.get_all_places(**listing_args)
+    except ValueError as e:  # Bad sort key or InvalidCursor
+        return {"message": str(e)}, 400
+    return listing_response(places, next_cursor, listing_args["fields"], listing_args["with_relations"])
+
+
+def collection_validators():
+    """ETag/Last-Modified of a listing or search: the places version stamp plus the query string"""
+    return facade.versions.validators("places", request.path, request.query_string)
+
+
+def listing_response(places, next_cursor, fields=None, include=True):
+    serialize = place_serializer(fields, include)
+    return {
+        "places": [serialize(place) for place in places],
+        "next_cursor": next_cursor,
+    }, 200
+
+
 @api.route('/')
 class PlaceList(Resource):
     @jwt_required()  # 🔒 Requires authentication for creating a place
@@ -43,10 +177,8 @@ class PlaceList(Resource):
     @api.response(400, 'Invalid input data')
     def post(self):
         """Register a new place"""
-        user_id = get_jwt_identity()  # Get the logged-in user ID
-
         data = api.payload  # Get request data
-        data['owner_id'] = user_id  # Ensure the authenticated user is the owner
+        data['owner_id'] = current_principal().id  # Ensure the authenticated user is the owner
 
         # Call service layer to create the place
         new_place = facade.create_place(data)
@@ -54,25 +186,197 @@ class PlaceList(Resource):
         if not new_place:
             return {"message": "Invalid input data"}, 400
 
-        return {"message": "Place successfully created", "place": new_place}, 201
+        return {"message": "Place successfully created", "place": new_place.to_dict()}, 201
 
+    @api.expect(place_list_parser)
     @api.response(200, 'List of places retrieved successfully')
+    @api.response(304, 'Not modified since the client\'s copy')
+    @api.response(400, 'Invalid filter or cursor')
+    def get(self):
+        """Retrieve a page of places (Publicly accessible)"""
+        return conditional(*collection_validators(), build=build_listing)
+
+
+@api.route('/batch')
+class PlaceBatch(Resource):
+    @jwt_required()  # 🔒 Requires authentication for creating places
+    @api.expect([place_model])
+    @api.response(201, 'All places successfully created')
+    @api.response(207, 'Some places were created, see errors')
+    @api.response(400, 'No place could be created')
+    def post(self):
+        """Register many places at once, reporting errors per item"""
+        invalid = check_batch_payload(api.payload)
+        if invalid:
+            return invalid
+
+        created_ids, errors = facade.create_places(api.payload, owner_id=current_principal().id)
+        return batch_response(created_ids, errors)
+
+
+# Query string for facets: the listing filters plus the price histogram bucket width
+place_facets_parser = reqparse.RequestParser()
+place_facets_parser.add_argument('min_price', type=float, location='args', help='Minimum price per night')
+place_facets_parser.add_argument('max_price', type=float, location='args', help='Maximum price per night')
+place_facets_parser.add_argument('amenities', type=str, action='split', location='args',
+                                 help="Comma separated amenity ID's the place must offer")
+place_facets_parser.add_argument('bucket_width', type=float, default=DEFAULT_PRICE_BUCKET, location='args',
+                                 help='Width of the price histogram buckets')
+
+
+def parse_facet_args():
+    """get_place_facets keyword arguments from the query string, or an error response"""
+    args = place_facets_parser.parse_args()
+    if args['min_price'] is not None and args['max_price'] is not None \
+            and args['min_price'] > args['max_price']:
+        return None, ({"message": "min_price cannot be greater than max_price"}, 400)
+    return {
+        "min_price": args['min_price'],
+        "max_price": args['max_price'],
+        "amenity_ids": [a for a in args['amenities'] or [] if a],
+        "bucket_width": args['bucket_width'],
+    }, None
+
+
+def build_facets():
+    facet_args, error = parse_facet_args()
+    if error:
+        return error
+    try:
+        return facade.get_place_facets(**facet_args), 200
+    except ValueError as e:  # Bucket width not positive or too narrow
+        return {"message": str(e)}, 400
+
+
+@api.route('/facets')
+class PlaceFacets(Resource):
+    @api.expect(place_facets_parser)
+    @api.response(200, 'Facet counts retrieved successfully')
+    @api.response(304, 'Not modified since the client\'s copy')
+    @api.response(400, 'Invalid filter or bucket width')
     def get(self):
-        """Retrieve a list of all places (Publicly accessible)"""
-        places = facade.get_all_places()
-        return places, 200
+        """Count the matching places per amenity and per price bucket (Publicly accessible)"""
+        return conditional(*collection_validators(), build=build_facets)
+
+
+# Query string for search: words (with optional price and amenity filters), a radius or a bounding box
+place_search_parser = reqparse.RequestParser()
+place_search_parser.add_argument('q', type=str, location='args',
+                                 help='Words to find in place titles, descriptions and reviews')
+place_search_parser.add_argument('min_price', type=float, location='args', help='Minimum price per night (with q)')
+place_search_parser.add_argument('max_price', type=float, location='args', help='Maximum price per night (with q)')
+place_search_parser.add_argument('amenities', type=str, action='split', location='args',
+                                 help="Comma separated amenity ID's the place must offer (with q)")
+place_search_parser.add_argument('lat', type=float, location='args', help='Latitude of the search center')
+place_search_parser.add_argument('lng', type=float, location='args', help='Longitude of the search center')
+place_search_parser.add_argument('radius_km', type=float, location='args', help='Search radius in kilometers')
+place_search_parser.add_argument('min_lat', type=float, location='args', help='Bounding box south edge')
+place_search_parser.add_argument('min_lng', type=float, location='args', help='Bounding box west edge')
+place_search_parser.add_argument('max_lat', type=float, location='args', help='Bounding box north edge')
+place_search_parser.add_argument('max_lng', type=float, location='args', help='Bounding box east edge')
+place_search_parser.add_argument('limit', type=int, default=DEFAULT_PAGE_SIZE, location='args',
+                                 help=f'Maximum number of results (max {MAX_PAGE_SIZE})')
+
+
+# Facade method answering each kind of search
+SEARCH_METHODS = {
+    "text": "search_places_text",
+    "radius": "search_places_near",
+    "bbox": "search_places_in_bbox",
+}
+
+
+def parse_search_args():
+    """("text" | "radius" | "bbox", positional search arguments, limit) from the query string, or an error response"""
+    args = place_search_parser.parse_args()
+    if args['q'] is not None:
+        if not search_terms(args['q']):
+            return None, ({"message": "q must contain at least one word"}, 400)
+        if args['min_price'] is not None and args['max_price'] is not None \
+                and args['min_price'] > args['max_price']:
+            return None, ({"message": "min_price cannot be greater than max_price"}, 400)
+        amenity_ids = [a for a in args['amenities'] or [] if a]
+        return ("text", [args['q'], args['min_price'], args['max_price'], amenity_ids], args['limit']), None
+
+    radius_args = [args['lat'], args['lng'], args['radius_km']]
+    bbox_args = [args['min_lat'], args['min_lng'], args['max_lat'], args['max_lng']]
+
+    if all(value is not None for value in radius_args):
+        lat, lng, radius_km = radius_args
+        if not -90.0 <= lat <= 90.0 or not -180.0 <= lng <= 180.0 or radius_km <= 0:
+            return None, ({"message": "Invalid center or radius"}, 400)
+        if radius_km > MAX_SEARCH_RADIUS_KM:
+            return None, ({"message": f"radius_km cannot exceed {MAX_SEARCH_RADIUS_KM:g}"}, 400)
+        return ("radius", radius_args, args['limit']), None
+
+    if all(value is not None for value in bbox_args):
+        min_lat, min_lng, max_lat, max_lng = bbox_args
+        # min_lng > max_lng is allowed and means the box crosses the antimeridian
+        if min_lat > max_lat or not -90.0 <= min_lat <= 90.0 or not -90.0 <= max_lat <= 90.0 \
+                or not -180.0 <= min_lng <= 180.0 or not -180.0 <= max_lng <= 180.0:
+            return None, ({"message": "Invalid bounding box"}, 400)
+        return ("bbox", bbox_args, args['limit']), None
+
+    return None, ({"message": "Provide q, or lat, lng and radius_km, or min_lat, min_lng, max_lat and max_lng"}, 400)
+
+
+def search_response(kind, results):
+    if kind == "text":
+        return {"places": [dict(serialize_place(place), score=float(score))
+                           for place, score in results]}, 200
+    if kind == "radius":
+        return {"places": [dict(serialize_place(place), distance_km=round(distance, 3))
+                           for place, distance in results]}, 200
+    return {"places": [serialize_place(place) for place in results]}, 200
+
+
+SEARCH_UNAVAILABLE = ({"message": "Full-text search is not available on this database"}, 501)
+
+
+def build_search():
+    search, error = parse_search_args()
+    if error:
+        return error
+
+    kind, params, limit = search
+    try:
+        results = getattr(facade, SEARCH_METHODS[kind])(*params, limit=limit)
+    except FullTextUnavailable:
+        return SEARCH_UNAVAILABLE
+    return search_response(kind, results)
+
+
+@api.route('/search')
+class PlaceSearch(Resource):
+    @api.expect(place_search_parser)
+    @api.response(200, 'Matching places retrieved successfully')
+    @api.response(304, 'Not modified since the client\'s copy')
+    @api.response(400, 'Invalid search parameters')
+    @api.response(501, 'Full-text search is not available on this database')
+    def get(self):
+        """Search places by words, near a point or inside a bounding box (Publicly accessible)"""
+        return conditional(*collection_validators(), build=build_search)
+
+
+def place_validators(place):
+    """Validators covering everything the detail body embeds, so a 304 skips serialization entirely"""
+    return entity_validators(place, place.owner, *place.amenities, *place.reviews)
+
+
+def detail_response(place):
+    if not place:
+        return {"message": "Place not found"}, 404
+    return conditional(*place_validators(place), build=lambda: (serialize_place_detail(place), 200))
 
 
 @api.route('/<place_id>')
 class PlaceResource(Resource):
     @api.response(200, 'Place details retrieved successfully')
+    @api.response(304, 'Not modified since the client\'s copy')
     @api.response(404, 'Place not found')
     def get(self, place_id):
         """Retrieve detailed information about a specific place (Publicly accessible)"""
-        place = facade.get_place_by_id(place_id)
-        if not place:
-            return {"message": "Place not found"}, 404
-        return place, 200
+        return detail_response(facade.get_place_details(place_id))
 
     @jwt_required()  # 🔒 Requires authentication for updating a place
     @api.expect(place_model)
@@ -82,15 +386,13 @@ class PlaceResource(Resource):
     @api.response(400, 'Invalid input data')
     def put(self, place_id):
         """Update a place's information (Only the owner can update)"""
-        user_id = get_jwt_identity()  # Get the authenticated user ID
-
         # Fetch the place to check ownership
         place = facade.get_place_by_id(place_id)
         if not place:
             return {"message": "Place not found"}, 404
 
         # Ensure the authenticated user is the owner
-        if place["owner_id"] != user_id:
+        if place.owner_id != current_principal().id:
             return {"message": "You are not authorized to modify this place"}, 403
 
         # Get updated data from request payload
@@ -100,4 +402,4 @@ class PlaceResource(Resource):
         if not updated_place:
             return {"message": "Invalid input data"}, 400
 
-        return {"message": "Place updated successfully", "place": updated_place}, 200
\ No newline at end of file
+        return {"message": "Place updated successfully", "place": updated_place.to_dict()}, 200
\ No newline at end of file
@@ -1,6 +1,8 @@
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from app.services import facade
+from app.api.v1.batch import check_batch_payload, batch_response
+from app.api.v1.authorization import current_principal
 
 api = Namespace('reviews', description='Review operations')
 
@@ -19,7 +21,7 @@ class ReviewList(Resource):
     @api.response(400, 'You cannot review your own place or already reviewed')
     def post(self):
         """Register a new review"""
-        user_id = get_jwt_identity()  # ✅ Get the authenticated user ID
+        user_id = current_principal().id  # ✅ Get the authenticated user ID
         data = api.payload
         place_id = data.get('place_id')
 
@@ -29,7 +31,7 @@ class ReviewList(Resource):
             return {"message": "Place not found"}, 404
 
         # ❌ Ensure the user is NOT reviewing their own place
-        if place["owner_id"] == user_id:
+        if place.owner_id == user_id:
             return {"message": "You cannot review your own place."}, 400
 
         # 🔎 Check if the user already reviewed this place
@@ -44,7 +46,24 @@ class ReviewList(Resource):
         if not new_review:
             return {"message": "Invalid input data"}, 400
 
-        return {"message": "Review successfully created", "review": new_review}, 201
+        return {"message": "Review successfully created", "review": new_review.to_dict()}, 201
+
+@api.route('/batch')
+class ReviewBatch(Resource):
+    @jwt_required()  # 🔒 Require authentication
+    @api.expect([review_model])
+    @api.response(201, 'All reviews successfully created')
+    @api.response(207, 'Some reviews were created, see errors')
+    @api.response(400, 'No review could be created')
+    def post(self):
+        """Register many reviews at once, reporting errors per item"""
+        user_id = current_principal().id  # ✅ Get the authenticated user ID
+        invalid = check_batch_payload(api.payload)
+        if invalid:
+            return invalid
+
+        created_ids, errors = facade.create_reviews(api.payload, user_id=user_id)
+        return batch_response(created_ids, errors)
 
 @api.route('/<review_id>')
 class ReviewResource(Resource):
@@ -55,7 +74,7 @@ class ReviewResource(Resource):
     @api.response(404, 'Review not found')
     def put(self, review_id):
         """Update a review (Only the creator can modify it)"""
-        user_id = get_jwt_identity()  # ✅ Get authenticated user ID
+        user_id = current_principal().id  # ✅ Get authenticated user ID
 
         # 🔎 Fetch the review to check ownership
         review = facade.get_review_by_id(review_id)
@@ -63,7 +82,7 @@ class ReviewResource(Resource):
             return {"message": "Review not found"}, 404
 
         # ❌ Ensure the user owns this review
-        if review["user_id"] != user_id:
+        if review.user_id != user_id:
             return {"message": "Unauthorized action."}, 403
 
         # ✅ Proceed to update the review
@@ -73,7 +92,7 @@ class ReviewResource(Resource):
         if not updated_review:
             return {"message": "Invalid input data"}, 400
 
-        return {"message": "Review updated successfully", "review": updated_review}, 200
+        return {"message": "Review updated successfully", "review": updated_review.to_dict()}, 200
 
     @jwt_required()  # 🔒 Require authentication
     @api.response(200, 'Review deleted successfully')
@@ -81,7 +100,7 @@ class ReviewResource(Resource):
     @api.response(404, 'Review not found')
     def delete(self, review_id):
         """Delete a review (Only the creator can delete it)"""
-        user_id = get_jwt_identity()  # ✅ Get authenticated user ID
+        user_id = current_principal().id  # ✅ Get authenticated user ID
 
         # 🔎 Fetch the review to check ownership
         review = facade.get_review_by_id(review_id)
@@ -89,7 +108,7 @@ class ReviewResource(Resource):
             return {"message": "Review not found"}, 404
 
         # ❌ Ensure the user owns this review
-        if review["user_id"] != user_id:
+        if review.user_id != user_id:
             return {"message": "Unauthorized action."}, 403
 
         # ✅ Proceed to delete the review
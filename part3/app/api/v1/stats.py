@@ -0,0 +1,40 @@
+from flask import current_app
+from flask_restx import Namespace, Resource
+from app.services import facade
+from app.api.v1.authorization import admin_required
+
+api = Namespace('stats', description='Runtime statistics')
+
+@api.route('/cache')
+class CacheStats(Resource):
+    @admin_required  # 🔒 Require an admin token
+    @api.response(200, 'Cache counters retrieved successfully')
+    @api.response(403, 'Admin access required')
+    def get(self):
+        """Admin: Hit/miss/eviction counters of the repository cache"""
+        return {
+            "backend": type(facade.cache).__name__ if facade.cache is not None else None,
+            "repositories": facade.cache_stats(),
+        }, 200
+
+
+@api.route('/pool')
+class PoolStats(Resource):
+    @admin_required  # 🔒 Require an admin token
+    @api.response(200, 'Pool metrics retrieved successfully')
+    @api.response(403, 'Admin access required')
+    def get(self):
+        """Admin: Connection pool checkout latency and saturation"""
+        metrics = current_app.extensions.get('hbnb_pool_metrics', {})
+        return {label: pool.snapshot() for label, pool in metrics.items()}, 200
+
+
+@api.route('/replicas')
+class ReplicaStats(Resource):
+    @admin_required  # 🔒 Require an admin token
+    @api.response(200, 'Replica status retrieved successfully')
+    @api.response(403, 'Admin access required')
+    def get(self):
+        """Admin: Read replicas and whether they currently pass their health check"""
+        replicas = current_app.extensions.get('hbnb_replicas')
+        return {"replicas": replicas.status() if replicas is not None else []}, 200
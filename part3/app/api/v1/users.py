@@ -1,7 +1,10 @@
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from flask_jwt_extended import jwt_required
 from app.services import facade
 from app.utils.security import hash_password
+from app.api.v1.authorization import admin_required, current_principal
+from app.utils.http_cache import conditional, entity_validators
+from app.utils.serialization import compile_columns
 
 api = Namespace('users', description='User operations')
 
@@ -21,26 +24,16 @@ update_user_model = api.model('UpdateUser', {
     'password': fields.String(description='New password of the user (Admins only)')
 })
 
-def admin_required():
-    """Ensure the user is an admin"""
-    claims = get_jwt()  # Get JWT claims
-    if not claims.get("is_admin", False):
-        return {"message": "Admin access required."}, 403
-
 @api.route('/')
 class UserList(Resource):
-    @jwt_required()  # 🔒 Require authentication
+    @admin_required  # 🔒 Require an admin token
     @api.expect(user_model, validate=True)
     @api.response(201, 'User successfully created')
     @api.response(400, 'Email already registered')
     @api.response(403, 'Admin access required')
+    @api.response(503, 'Password hashing capacity exhausted')
     def post(self):
         """Admin: Create a new user"""
-        # 🔒 Ensure only admins can create users
-        admin_check = admin_required()
-        if admin_check:
-            return admin_check  # Returns {"message": "Admin access required."}, 403
-
         user_data = api.payload
 
         # 🔎 Check if email is already registered
@@ -48,18 +41,19 @@ class UserList(Resource):
         if existing_user:
             return {'error': 'Email already registered'}, 400
 
-        # ✅ Hash password before storing
-        user_data['password'] = hash_password(user_data['password'])
-
-        # ✅ Create user
+        # ✅ Create user (the User model hashes the password once)
         new_user = facade.create_user(user_data)
 
         return {'id': new_user.id, 'message': 'User successfully created'}, 201
 
+# Public fields of a user (never the password)
+serialize_user = compile_columns("user", ("id", "first_name", "last_name", "email"))
+
 @api.route('/<string:user_id>')
 @api.param('user_id', 'The User identifier')
 class User(Resource):
     @api.response(200, 'Success')
+    @api.response(304, 'Not modified since the client\'s copy')
     @api.response(404, 'User not found')
     def get(self, user_id):
         """Retrieve user details by ID (excluding password)"""
@@ -67,12 +61,7 @@ class User(Resource):
         if not user:
             api.abort(404, 'User not found')
 
-        return {
-            'id': user.id,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'email': user.email
-        }, 200
+        return conditional(*entity_validators(user), build=lambda: (serialize_user(user), 200))
 
     @jwt_required()  # 🔒 Require authentication
     @api.expect(update_user_model)
@@ -80,10 +69,10 @@ class User(Resource):
     @api.response(400, 'You cannot modify email or password.')
     @api.response(403, 'Unauthorized action')
     @api.response(404, 'User not found')
+    @api.response(503, 'Password hashing capacity exhausted')
     def put(self, user_id):
         """Modify user information"""
-        auth_user_id = get_jwt_identity()  # ✅ Get authenticated user ID
-        claims = get_jwt()  # ✅ Get JWT claims
+        principal = current_principal()  # ✅ Authenticated user, no database lookup
 
         # 🔎 Fetch the user to ensure they exist
         user = facade.get_user_by_id(user_id)
@@ -93,7 +82,7 @@ class User(Resource):
         update_data = api.payload
 
         # 🔒 Admins can modify any user (including email & password)
-        if claims.get("is_admin", False):
+        if principal.is_admin:
             # 🔎 Check if email is already taken
             if "email" in update_data:
                 existing_user = facade.get_user_by_email(update_data["email"])
@@ -108,7 +97,7 @@ class User(Resource):
             return {"message": "User updated successfully", "user": updated_user}, 200
 
         # ❌ Regular users can only modify their own profile (excluding email/password)
-        if user_id != auth_user_id:
+        if user_id != principal.id:
             return {"message": "Unauthorized action."}, 403
 
         if "email" in update_data or "password" in update_data:
@@ -0,0 +1,107 @@
+"""ASGI deployment: `uvicorn asgi:application` (see asgi.py at the project root).
+
+The public place reads (listing, search, details) are served by async
+handlers on AsyncHBnBFacade, so a request waiting on the database does not
+hold a thread. Every other route of the API is the regular Flask app,
+bridged through asgiref's WsgiToAsgi (which runs it in a thread pool).
+"""
+import logging
+from asgiref.wsgi import WsgiToAsgi
+from flask import Response
+from werkzeug.exceptions import HTTPException
+from app import create_app
+from app.api.v1.async_places import match_route
+from app.services.async_facade import AsyncHBnBFacade
+from app.utils.serialization import encoder
+from app.utils.metrics import metrics
+from app.utils.rate_limit import limiter
+from app.utils.compression import compressor
+
+log = logging.getLogger(__name__)
+
+
+class HBnBAsgi:
+    """ASGI app routing the async read paths natively and the rest to Flask."""
+
+    def __init__(self, flask_app, facade):
+        self.flask_app = flask_app
+        self.facade = facade
+        self.wsgi = WsgiToAsgi(flask_app)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] == "http" and scope["method"] in ("GET", "HEAD"):
+            handler, kwargs = match_route(scope["path"])
+            if handler is not None:
+                await self._respond(scope, send, handler, kwargs)
+                return
+        await self.wsgi(scope, receive, send)
+
+    async def _respond(self, scope, send, handler, kwargs):
+        request_headers = [(name.decode("latin-1"), value.decode("latin-1")) for name, value in scope["headers"]]
+        # A request context gives the handlers the same parsers and serializers as the Resources
+        with self.flask_app.test_request_context(
+                scope["path"], method=scope["method"], query_string=scope["query_string"].decode("latin-1"),
+                headers=request_headers):
+            metrics.start_request()
+            status = 500
+            try:
+                status, headers, body = await self._render(handler, kwargs)
+            except Exception:
+                log.exception("Unhandled error serving %s", scope["path"])
+                headers = {"Content-Type": "application/json"}
+                body = encoder.dumps({"message": "Internal Server Error"})
+            finally:
+                metrics.finish_request(status)
+
+        headers["Content-Length"] = str(len(body))
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(name.lower().encode("latin-1"), str(value).encode("latin-1"))
+                        for name, value in headers.items()],
+        })
+        await send({"type": "http.response.body", "body": body if scope["method"] == "GET" else b""})
+
+    async def _render(self, handler, kwargs):
+        """(status, headers, body) of an async handler's response"""
+        # Never wait for an admission slot here: that would block the event loop
+        result = limiter.admit(wait=False)
+        try:
+            if result is None:
+                result = await handler(self.facade, **kwargs)
+        except HTTPException as e:  # reqparse validation errors
+            result = getattr(e, "data", None) or {"message": e.description}, e.code
+        finally:
+            limiter.release()
+        if isinstance(result, Response):  # 304 Not Modified
+            return result.status_code, dict(result.headers), b""
+        data, status, headers = result if len(result) == 3 else (*result, {})
+        headers = dict(limiter.headers(headers), **{"Content-Type": "application/json"})
+        with metrics.timed("serialization"):
+            body = encoder.dumps(data)
+            if status == 200:
+                body = compressor.compress_body(body, "application/json", headers)
+        return status, headers, body
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.facade.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+def create_asgi_app(config_class="config.DevelopmentConfig"):
+    """The Flask app plus the async facade, wrapped for an ASGI server"""
+    flask_app = create_app(config_class)
+    facade = AsyncHBnBFacade()
+    facade.init_app(flask_app)
+    if flask_app.config.get("METRICS_ENABLED", True):
+        metrics.instrument_engine(facade.engine.sync_engine, "async")
+    return HBnBAsgi(flask_app, facade)
@@ -0,0 +1,132 @@
+import hashlib
+import os
+import time
+import click
+from flask.cli import AppGroup
+from app.services import facade
+from app.persistence.repository import db
+from app.persistence import migrations
+from app.services.importer import Importer, IMPORT_ORDER, DEFAULT_IMPORT_BATCH_SIZE
+from app.services.dataset import DatasetSpec, DatabaseSink, NdjsonSink, generate
+from app.services.jobs import DEFAULT_WORKER_BATCH
+from app.persistence.jobs import job_counts
+
+# `flask hbnb <command>` maintenance commands
+hbnb_cli = AppGroup('hbnb', help='HBnB maintenance commands.')
+
+
+@hbnb_cli.command('reconcile-ratings')
+@click.option('--dry-run', is_flag=True, help='Only report drift, do not fix it.')
+def reconcile_ratings(dry_run):
+    """Recompute place rating aggregates from the reviews table."""
+    drift = facade.reconcile_rating_aggregates(fix=not dry_run)
+    for place_id, stored, expected in drift:
+        changed = ", ".join(f"{name} {stored[name]} -> {expected[name]}"
+                            for name in expected if stored[name] != expected[name])
+        click.echo(f"{place_id}: {changed}")
+    action = "found" if dry_run else "fixed"
+    click.echo(f"{len(drift)} place(s) with drifted rating aggregates {action}.")
+
+
+@hbnb_cli.command('migrate')
+@click.option('--status', is_flag=True, help='List pending migrations without applying them.')
+def migrate(status):
+    """Apply pending schema migrations."""
+    if status:
+        pending = migrations.pending_migrations(db.engine)
+        for version, description, _ in pending:
+            click.echo(f"pending {version:04d} {description}")
+        click.echo(f"{len(pending)} pending migration(s).")
+        return
+    applied = migrations.upgrade(db.engine)
+    for version, description in applied:
+        click.echo(f"applied {version:04d} {description}")
+    click.echo(f"{len(applied)} migration(s) applied.")
+
+
+def _default_job_name(sources):
+    """Same files, same job: rerunning an interrupted import resumes it"""
+    paths = "|".join(f"{kind}={os.path.abspath(path)}" for kind, path in sorted(sources.items()))
+    return "import-" + hashlib.sha1(paths.encode()).hexdigest()[:12]
+
+
+@hbnb_cli.command('import')
+@click.option('--users', type=click.Path(exists=True, dir_okay=False), help='Users file (.csv or .ndjson).')
+@click.option('--amenities', type=click.Path(exists=True, dir_okay=False), help='Amenities file.')
+@click.option('--places', type=click.Path(exists=True, dir_okay=False), help='Places file.')
+@click.option('--reviews', type=click.Path(exists=True, dir_okay=False), help='Reviews file.')
+@click.option('--job', help='Checkpoint name; run again with the same name to resume. Defaults to one per file set.')
+@click.option('--batch-size', default=DEFAULT_IMPORT_BATCH_SIZE, show_default=True, help='Rows per transaction.')
+@click.option('--show-errors', default=20, show_default=True, help='Rejected records to print per file.')
+def import_files(users, amenities, places, reviews, job, batch_size, show_errors):
+    """Bulk import partner users, amenities, places and reviews from CSV/NDJSON files."""
+    sources = {kind: path for kind, path in zip(IMPORT_ORDER, (users, amenities, places, reviews)) if path}
+    if not sources:
+        raise click.UsageError("Give at least one of --users, --amenities, --places or --reviews.")
+    job = job or _default_job_name(sources)
+    click.echo(f"Job {job}")
+
+    results = Importer(job, batch_size=batch_size).run(sources)
+    facade.versions.bump(*sources, "places")  # Cached collection ETags are stale now
+
+    click.echo(f"{'kind':<10} {'read':>9} {'resumed':>9} {'imported':>9} {'failed':>7} {'seconds':>8} {'rows/s':>9}")
+    for stats in results:
+        click.echo(f"{stats.kind:<10} {stats.read:>9} {stats.resumed:>9} {stats.imported:>9} {stats.failed:>7} "
+                   f"{stats.seconds:>8.1f} {stats.rows_per_second:>9.0f}")
+    imported = sum(stats.imported for stats in results)
+    seconds = sum(stats.seconds for stats in results)
+    click.echo(f"{imported} row(s) imported in {seconds:.1f}s ({imported / seconds if seconds else 0:.0f} rows/s).")
+
+    for stats in results:
+        for line, message in stats.errors[:show_errors]:
+            click.echo(f"{stats.kind} record {line}: {message}", err=True)
+        if stats.failed > show_errors:
+            click.echo(f"{stats.kind}: {stats.failed - show_errors} more rejected record(s).", err=True)
+
+
+@hbnb_cli.command('generate')
+@click.option('--users', default=DatasetSpec.users, show_default=True, help='Users to create.')
+@click.option('--places', default=DatasetSpec.places, show_default=True, help='Places to create.')
+@click.option('--amenities', default=DatasetSpec.amenities, show_default=True, help='Amenities to create.')
+@click.option('--max-reviews', default=DatasetSpec.max_reviews_per_place, show_default=True,
+              help='Most reviews a single place gets (counts are Zipf-distributed).')
+@click.option('--seed', default=DatasetSpec.seed, show_default=True, help='Same seed, same dataset.')
+@click.option('--workers', type=int, help='Generator processes. Defaults to one per CPU.')
+@click.option('--ndjson', 'directory', type=click.Path(file_okay=False),
+              help='Write users/amenities/places/reviews.ndjson for `flask hbnb import` instead of the database.')
+def generate_dataset(users, places, amenities, max_reviews, seed, workers, directory):
+    """Generate a realistic synthetic dataset for benchmarks and load tests."""
+    spec = DatasetSpec(users=users, places=places, amenities=amenities,
+                       max_reviews_per_place=max_reviews, seed=seed)
+    sink = NdjsonSink(directory) if directory else DatabaseSink()
+    started = time.perf_counter()
+    counts = generate(spec, sink, workers=workers,
+                      progress=lambda kind, done, total: click.echo(f"{kind}: {done}/{total}"))
+    seconds = time.perf_counter() - started
+    if not directory:
+        facade.versions.bump("users", "amenities", "places", "reviews")  # Cached collection ETags are stale now
+
+    for kind, rows in counts.items():
+        click.echo(f"{kind:<14} {rows:>10}")
+    rows = sum(counts.values())
+    click.echo(f"{rows} row(s) generated in {seconds:.1f}s ({rows / seconds if seconds else 0:.0f} rows/s).")
+
+
+@hbnb_cli.command('worker')
+@click.option('--once', is_flag=True, help='Exit once no job is due instead of polling.')
+@click.option('--batch-size', default=DEFAULT_WORKER_BATCH, show_default=True, help='Jobs claimed at a time.')
+@click.option('--poll-interval', default=1.0, show_default=True, help='Seconds between polls of an empty queue.')
+@click.option('--worker-id', help='Name recorded on claimed jobs. Defaults to host:pid.')
+@click.option('--status', is_flag=True, help='Only print the number of jobs per status.')
+def worker(once, batch_size, poll_interval, worker_id, status):
+    """Run background jobs queued by the API (JOB_QUEUE_BACKEND='database')."""
+    if status:
+        with db.engine.connect() as connection:
+            for state, count in sorted(job_counts(connection).items()):
+                click.echo(f"{state:<8} {count:>8}")
+        return
+    try:
+        succeeded, failed = facade.jobs.work(worker_id, poll_interval, batch_size, once=once)
+    except KeyboardInterrupt:
+        return
+    click.echo(f"{succeeded} job(s) done, {failed} failed attempt(s).")
@@ -2,7 +2,8 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
+from app.persistence.routing import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})  # Reads may go to replicas
 bcrypt = Bcrypt()
 jwt = JWTManager()
\ No newline at end of file
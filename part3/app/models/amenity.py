@@ -1,29 +1,20 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Table
-from sqlalchemy.ext.declarative import declarative_base
+import uuid
+from sqlalchemy import Column, String, DateTime
 from sqlalchemy.orm import relationship, validates
+from app.extensions import db
 
-Base = declarative_base()
-
-# Many-to-Many Association Table (Place ↔ Amenity)
-place_amenity_association = Table(
-    "place_amenity",
-    Base.metadata,
-    Column("place_id", Integer, ForeignKey("places.id"), primary_key=True),
-    Column("amenity_id", Integer, ForeignKey("amenities.id"), primary_key=True)
-)
-
-class Amenity(Base):
+class Amenity(db.Model):
     """Amenity model for storing amenity details."""
     __tablename__ = 'amenities'
 
-    id = Column(Integer, primary_key=True, autoincrement=True)  #Integer Auto-Increment
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String(50), nullable=False, unique=True)  #Ensures names are unique
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)  #Incremental exports
 
-    #Many-to-Many (Place ↔ Amenity)
-    places = relationship("Place", secondary=place_amenity_association, back_populates="amenities")
+    #Many-to-Many (Place ↔ Amenity), through place_amenity declared in app/models/place.py
+    places = relationship("Place", secondary="place_amenity", back_populates="amenities")
 
     def __init__(self, name):
         self.name = name  # Assign name directly, validation will be handled
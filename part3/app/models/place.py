@@ -1,20 +1,20 @@
 from datetime import datetime
 import uuid
-from sqlalchemy import Column, String, DateTime, Float, Integer, ForeignKey, Table
+from sqlalchemy import Column, String, DateTime, Float, Integer, ForeignKey, Table, Index, inspect
 from sqlalchemy.orm import relationship, validates
-from sqlalchemy.ext.declarative import declarative_base
-
-Base = declarative_base()
+from app.extensions import db
+from app.utils.geo import encode_geohash
 
 # 🟢 Many-to-Many Association Table (Place ↔ Amenity)
 place_amenity_association = Table(
     "place_amenity",
-    Base.metadata,
+    db.metadata,
     Column("place_id", String(36), ForeignKey("places.id"), primary_key=True),
-    Column("amenity_id", String(36), ForeignKey("amenities.id"), primary_key=True)
+    Column("amenity_id", String(36), ForeignKey("amenities.id"), primary_key=True),
+    Index("ix_place_amenity_amenity_id", "amenity_id")  # 🟢 Amenity → places lookups
 )
 
-class Place(Base):
+class Place(db.Model):
     """Place model for storing place details."""
     __tablename__ = 'places'
 
@@ -24,9 +24,19 @@ class Place(Base):
     price = Column(Float, nullable=False)
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
-    owner_id = Column(String(36), ForeignKey("users.id"), nullable=False)  # 🟢 One-to-Many (User → Place)
+    geohash = Column(String(12), nullable=False, index=True)  # 🟢 Spatial index key, kept in sync with latitude/longitude
+    owner_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)  # 🟢 One-to-Many (User → Place)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)  # 🟢 Incremental exports
+
+    # 🟢 Rating aggregates, maintained by the facade whenever a review changes
+    review_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    rating_count_1 = Column(Integer, nullable=False, default=0)
+    rating_count_2 = Column(Integer, nullable=False, default=0)
+    rating_count_3 = Column(Integer, nullable=False, default=0)
+    rating_count_4 = Column(Integer, nullable=False, default=0)
+    rating_count_5 = Column(Integer, nullable=False, default=0)
 
     # Relationships
     owner = relationship("User", back_populates="places")  # 🟢 One-to-Many (User → Place)
@@ -40,6 +50,9 @@ class Place(Base):
         self.latitude = latitude
         self.longitude = longitude
         self.owner_id = owner_id
+        # Column defaults only apply on flush; serializers read these before that
+        for column in ("review_count", "rating_sum") + tuple(f"rating_count_{r}" for r in range(1, 6)):
+            setattr(self, column, 0)
 
     @validates('title')
     def validate_title(self, key, title):
@@ -60,6 +73,8 @@ class Place(Base):
         """Ensures latitude is within -90 to 90."""
         if latitude < -90.0 or latitude > 90.0:
             raise ValueError("Latitude must be between -90.0 and 90.0.")
+        if self.longitude is not None:
+            self.geohash = encode_geohash(latitude, self.longitude)
         return latitude
 
     @validates('longitude')
@@ -67,8 +82,47 @@ class Place(Base):
         """Ensures longitude is within -180 to 180."""
         if longitude < -180.0 or longitude > 180.0:
             raise ValueError("Longitude must be between -180.0 and 180.0.")
+        if self.latitude is not None:
+            self.geohash = encode_geohash(self.latitude, longitude)
         return longitude
 
+    def record_rating(self, rating, delta=1):
+        """Adds (delta=1) or removes (delta=-1) one rating from the aggregates."""
+        self.apply_rating_changes({rating: delta})
+
+    def apply_rating_changes(self, changes):
+        """Applies a {rating: count delta} change to the aggregates.
+
+        Columns are incremented with SQL expressions so concurrent reviews
+        cannot overwrite each other's counts. Each column takes a single
+        expression per flush, so all changes to a place go through one call.
+        """
+        if inspect(self).persistent:
+            def base(column):
+                return getattr(Place, column)
+        else:
+            # Not stored in a database (e.g. the in-memory backend): plain arithmetic
+            def base(column):
+                return getattr(self, column) or 0
+        self.review_count = base("review_count") + sum(changes.values())
+        self.rating_sum = base("rating_sum") + sum(rating * delta for rating, delta in changes.items())
+        for rating, delta in changes.items():
+            if delta:
+                histogram_column = f"rating_count_{rating}"
+                setattr(self, histogram_column, base(histogram_column) + delta)
+
+    @property
+    def rating_histogram(self):
+        """Number of reviews per rating value, from 1 to 5."""
+        return {str(r): getattr(self, f"rating_count_{r}") or 0 for r in range(1, 6)}
+
+    @property
+    def average_rating(self):
+        """Mean rating, or None when the place has no reviews."""
+        if not self.review_count:
+            return None
+        return round(self.rating_sum / self.review_count, 2)
+
     def to_dict(self):
         """Converts the place object to a dictionary."""
         return {
@@ -79,81 +133,12 @@ class Place(Base):
             "latitude": self.latitude,
             "longitude": self.longitude,
             "owner_id": self.owner_id,
+            "review_count": self.review_count or 0,
+            "average_rating": self.average_rating,
+            "rating_histogram": self.rating_histogram,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
         }
 
     def __repr__(self):
         return f"<Place {self.title} (Owner: {self.owner_id})>"
-
-class Review(Base):
-    """Review model for storing place reviews."""
-    __tablename__ = 'reviews'
-
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    text = Column(String, nullable=False)
-    rating = Column(Integer, nullable=False)
-    place_id = Column(String(36), ForeignKey("places.id"), nullable=False)  # 🟢 One-to-Many (Place → Review)
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False)  # 🟢 One-to-Many (User → Review)
-    created_at = Column(DateTime, default=datetime.utcnow)
-
-    # Relationships
-    place = relationship("Place", back_populates="reviews")  # 🟢 One-to-Many (Place → Review)
-    user = relationship("User", back_populates="reviews")  # 🟢 One-to-Many (User → Review)
-
-    def __init__(self, text, rating, place_id, user_id):
-        self.text = text
-        self.rating = rating
-        self.place_id = place_id
-        self.user_id = user_id
-
-    @validates('rating')
-    def validate_rating(self, key, rating):
-        """Ensures the rating is between 1 and 5."""
-        if rating < 1 or rating > 5:
-            raise ValueError("Rating must be between 1 and 5.")
-        return rating
-
-    def to_dict(self):
-        """Converts the review object to a dictionary."""
-        return {
-            "id": self.id,
-            "text": self.text,
-            "rating": self.rating,
-            "place_id": self.place_id,
-            "user_id": self.user_id,
-            "created_at": self.created_at.isoformat(),
-        }
-
-    def __repr__(self):
-        return f"<Review {self.text[:30]} (Rating: {self.rating})>"
-
-class Amenity(Base):
-    """Amenity model for storing place amenities."""
-    __tablename__ = 'amenities'
-
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    name = Column(String(50), nullable=False)
-
-    # Many-to-Many (Place ↔ Amenity)
-    places = relationship("Place", secondary=place_amenity_association, back_populates="amenities")
-
-    def __init__(self, name):
-        self.name = name
-
-    @validates('name')
-    def validate_name(self, key, name):
-        """Ensures the name is not empty."""
-        if not name or len(name.strip()) == 0:
-            raise ValueError("Amenity name cannot be empty.")
-        return name
-
-    def to_dict(self):
-        """Converts the amenity object to a dictionary."""
-        return {
-            "id": self.id,
-            "name": self.name,
-        }
-
-    def __repr__(self):
-        return f"<Amenity {self.name}>"
\ No newline at end of file
@@ -1,21 +1,24 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+import uuid
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship, validates
-from sqlalchemy.ext.declarative import declarative_base
+from app.extensions import db
 
-Base = declarative_base()
-
-class Review(Base):
+class Review(db.Model):
     """Review model for storing review details."""
     __tablename__ = 'reviews'
+    __table_args__ = (
+        Index("uq_reviews_user_place", "user_id", "place_id", unique=True),  # ✅ One review per user and place
+        Index("ix_reviews_place_id", "place_id"),
+    )
 
-    id = Column(Integer, primary_key=True, autoincrement=True)  # ✅ Integer (Auto-Incremented)
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     text = Column(String, nullable=False)
     rating = Column(Integer, nullable=False)
-    place_id = Column(Integer, ForeignKey('places.id'), nullable=False)  # ✅ One-to-Many (Place → Review)
-    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)  # ✅ One-to-Many (User → Review)
+    place_id = Column(String(36), ForeignKey('places.id'), nullable=False)  # ✅ One-to-Many (Place → Review)
+    user_id = Column(String(36), ForeignKey('users.id'), nullable=False)  # ✅ One-to-Many (User → Review)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)  # ✅ Incremental exports
 
     # 🟢 Relationships
     place = relationship("Place", back_populates="reviews", lazy="joined")  # ✅ One-to-Many (Place → Review)
@@ -3,11 +3,8 @@ import re
 from datetime import datetime
 from sqlalchemy import Column, String, Boolean, DateTime
 from sqlalchemy.orm import relationship, validates
-from flask_bcrypt import Bcrypt
-from app import db
-import os
-
-bcrypt = Bcrypt()
+from app.extensions import db
+from app.utils.security import hasher
 
 class User(db.Model):  # Ensure this extends db.Model for SQLAlchemy
     """User model for storing user details."""
@@ -34,11 +31,15 @@ class User(db.Model):  # Ensure this extends db.Model for SQLAlchemy
 
     def hash_password(self, password):
         """Hashes the password before storing it."""
-        return bcrypt.generate_password_hash(password).decode('utf-8')
+        return hasher.hash(password)
 
     def verify_password(self, password):
         """Verifies if the provided password matches the hashed password."""
-        return bcrypt.check_password_hash(self.password, password)
+        return hasher.verify(self.password, password)
+
+    def password_needs_rehash(self):
+        """True when the stored hash uses a different bcrypt cost than configured."""
+        return hasher.needs_rehash(self.password)
 
     @staticmethod
     def validate_name(name: str, field: str) -> str:
@@ -69,20 +70,3 @@ class User(db.Model):  # Ensure this extends db.Model for SQLAlchemy
 
     def __repr__(self) -> str:
         return f"<User {self.first_name} {self.last_name} ({self.email})>"
-
-# Function to execute schema.sql when initializing the database
-def execute_sql_file(sql_file_path):
-    """Executes a raw SQL file in MySQL."""
-    with open(sql_file_path, "r") as file:
-        sql_commands = file.read()
-    db.session.execute(sql_commands)
-    db.session.commit()
-
-# Check if script should execute raw SQL
-schema_path = os.path.join(os.path.dirname(__file__), "schema.sql")
-
-if os.path.exists(schema_path):
-    execute_sql_file(schema_path)
-    print("Database schema.sql executed successfully!")
-else:
-    print("schema.sql not found, skipping raw SQL execution.")
\ No newline at end of file
@@ -0,0 +1,336 @@
+import math
+from sqlalchemy import Integer, and_, case, or_, exists, func, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import load_only, selectinload
+from sqlalchemy.sql.functions import FunctionElement
+from app.models.place import Place, place_amenity_association
+from app.models.review import Review
+from app.models.amenity import Amenity
+from app.persistence.repository import SQLAlchemyRepository, db
+from app.persistence.fulltext import refresh_documents, search_statement
+from app.utils.pagination import clamp_page_size, encode_cursor, decode_cursor
+from app.utils.geo import geohash_cover, split_antimeridian, radius_bounding_box, haversine_km
+
+# Columns holding the per-place rating aggregates
+RATING_COLUMNS = ("review_count", "rating_sum") + tuple(f"rating_count_{r}" for r in range(1, 6))
+
+# Allowed sort keys for place listings (prefix with "-" for descending)
+PLACE_SORT_FIELDS = ("price", "created_at", "title")
+
+# Largest radius search, and the rows it reads per result asked for (its SQL order is approximate)
+MAX_SEARCH_RADIUS_KM = 500.0
+RADIUS_OVERFETCH = 2
+
+# Price histogram bucket width when the caller gives none, and the most buckets one response may hold
+DEFAULT_PRICE_BUCKET = 50.0
+MAX_PRICE_BUCKETS = 200
+
+
+RELATION_NAMES = ("owner", "amenities", "reviews")
+
+# Columns read by the computed place attributes a sparse listing may ask for
+COMPUTED_FIELD_COLUMNS = {
+    "average_rating": ("review_count", "rating_sum"),
+    "rating_histogram": tuple(f"rating_count_{r}" for r in range(1, 6)),
+}
+
+
+def place_relations(names=RELATION_NAMES):
+    """Loader options that fetch a place's owner, amenities and reviews in one
+    extra SELECT ... WHERE id IN (...) per relationship, whatever the row count.
+
+    Built per call: creating them configures the mappers, which must not
+    happen before every model is imported.
+    """
+    return [selectinload(getattr(Place, name)) for name in names]
+
+
+def place_load_options(fields=None, with_relations=False):
+    """Loader options for listing places.
+
+    fields limits the SELECT to the columns behind these attributes (all
+    columns when None); with_relations is True for every relationship or
+    the names of the ones to load. Everything a serializer will read must be
+    listed: an unloaded column costs one more query per row.
+    """
+    with_relations = RELATION_NAMES if with_relations is True else tuple(with_relations or ())
+    options = place_relations(with_relations)
+    if fields is not None:
+        columns = {"id"}
+        for field in fields:
+            columns.update(COMPUTED_FIELD_COLUMNS.get(field, (field,)))
+        if "owner" in with_relations:
+            columns.add("owner_id")  # Key of the owner's selectin load
+        options.append(load_only(*(getattr(Place, column) for column in sorted(columns))))
+    return options
+
+
+def place_filters(min_price=None, max_price=None, amenity_ids=None):
+    """WHERE clauses for the price range and amenity filters of a place listing"""
+    clauses = []
+    if min_price is not None:
+        clauses.append(Place.price >= min_price)
+    if max_price is not None:
+        clauses.append(Place.price <= max_price)
+    # A place must offer every requested amenity
+    for amenity_id in amenity_ids or []:
+        clauses.append(exists().where(and_(
+            place_amenity_association.c.place_id == Place.id,
+            place_amenity_association.c.amenity_id == amenity_id,
+        )))
+    return clauses
+
+
+def listing_statement(filters, sort="created_at", limit=None, cursor=None, with_relations=False, fields=None):
+    """SELECT for one keyset-paginated page (plus one look-ahead row) and the clamped page size.
+
+    Shared by the sync and async place repositories. fields and
+    with_relations are those of place_load_options.
+    """
+    descending = sort.startswith("-")
+    field = sort.lstrip("-")
+    if field not in PLACE_SORT_FIELDS:
+        raise ValueError(f"Cannot sort by '{field}'.")
+    limit = clamp_page_size(limit)
+    column = getattr(Place, field)
+
+    if fields is not None:
+        fields = (*fields, field)  # The next page cursor reads the sort column
+    statement = select(Place).where(*filters).options(*place_load_options(fields, with_relations))
+
+    # Seek past the last row of the previous page; id breaks ties
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort)
+        if descending:
+            statement = statement.where(or_(column < value, and_(column == value, Place.id < last_id)))
+        else:
+            statement = statement.where(or_(column > value, and_(column == value, Place.id > last_id)))
+
+    if descending:
+        statement = statement.order_by(column.desc(), Place.id.desc())
+    else:
+        statement = statement.order_by(column.asc(), Place.id.asc())
+    # Fetch one extra row to know whether another page exists
+    return statement.limit(limit + 1), limit
+
+
+def listing_page(rows, sort, limit):
+    """Split the rows of listing_statement into the page and the next page cursor"""
+    places = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = places[-1]
+        next_cursor = encode_cursor(sort, getattr(last, sort.lstrip("-")), last.id)
+    return places, next_cursor
+
+
+class price_bucket(FunctionElement):
+    """Histogram bucket number of a non-negative price: FLOOR(price / width)"""
+    type = Integer()
+    inherit_cache = True
+
+
+@compiles(price_bucket)
+def _price_bucket(element, compiler, **kw):
+    price, width = element.clauses
+    return f"FLOOR({compiler.process(price, **kw)} / {compiler.process(width, **kw)})"
+
+
+@compiles(price_bucket, "sqlite")
+def _price_bucket_sqlite(element, compiler, **kw):
+    # FLOOR needs SQLite's optional math functions; truncating is flooring for prices >= 0
+    price, width = element.clauses
+    return f"CAST({compiler.process(price, **kw)} / {compiler.process(width, **kw)} AS INTEGER)"
+
+
+def facet_statements(filters, bucket_width=DEFAULT_PRICE_BUCKET):
+    """(summary, per-amenity count, price histogram) SELECTs over the places matching filters.
+
+    summary is one row (count, min price, max price): the price range lets
+    check_bucket_count refuse a too narrow bucket before the histogram's
+    GROUP BY runs. Amenity counts are one GROUP BY over place_amenity
+    (served by its amenity_id index), so no place or relationship is ever
+    loaded.
+    """
+    if bucket_width <= 0:
+        raise ValueError("The price bucket width must be positive.")
+    matching = select(Place.id).where(*filters)
+    summary = select(func.count(), func.min(Place.price), func.max(Place.price)).where(*filters)
+    amenities = (
+        select(Amenity.id, Amenity.name, func.count().label("count"))
+        .join(place_amenity_association, place_amenity_association.c.amenity_id == Amenity.id)
+        .where(place_amenity_association.c.place_id.in_(matching))
+        .group_by(Amenity.id, Amenity.name)
+        .order_by(func.count().desc(), Amenity.name)
+    )
+    bucket = price_bucket(Place.price, float(bucket_width)).label("bucket")
+    # Grouped by the output name so the width parameter appears only once
+    histogram = select(bucket, func.count()).where(*filters).group_by("bucket").order_by("bucket")
+    return summary, amenities, histogram
+
+
+def check_bucket_count(min_price, max_price, bucket_width):
+    """Raise ValueError when the price range spans more than MAX_PRICE_BUCKETS buckets"""
+    if min_price is None:
+        return  # No place matches
+    if int(max_price // bucket_width) - int(min_price // bucket_width) >= MAX_PRICE_BUCKETS:
+        raise ValueError(f"More than {MAX_PRICE_BUCKETS} price buckets, use a wider bucket.")
+
+
+def facet_summary(total, amenity_counts, bucket_counts, bucket_width=DEFAULT_PRICE_BUCKET):
+    """Facets response from (amenity_id, name, count) and (bucket number, count) rows"""
+    return {
+        "total": total,
+        "amenities": [{"id": amenity_id, "name": name, "count": count}
+                      for amenity_id, name, count in amenity_counts],
+        "price_histogram": [{"min": bucket * bucket_width, "max": (bucket + 1) * bucket_width, "count": count}
+                            for bucket, count in bucket_counts],
+        "bucket_width": bucket_width,
+    }
+
+
+def bbox_clauses(min_lat, min_lng, max_lat, max_lng):
+    """WHERE clauses selecting places inside a box via geohash prefix ranges on the indexed column"""
+    # Each covering prefix is a contiguous range of the B-tree index on geohash
+    prefix_ranges = [
+        and_(Place.geohash >= prefix, Place.geohash < prefix + "~")
+        for prefix in geohash_cover(min_lat, min_lng, max_lat, max_lng)
+    ]
+    # Cells overhang the box, so finish with the exact coordinate check
+    exact = [
+        and_(Place.latitude.between(lat0, lat1), Place.longitude.between(lng0, lng1))
+        for lat0, lng0, lat1, lng1 in split_antimeridian(min_lat, min_lng, max_lat, max_lng)
+    ]
+    return or_(*prefix_ranges), or_(*exact)
+
+
+def bbox_statement(min_lat, min_lng, max_lat, max_lng, limit=None):
+    """SELECT of the places inside a box, in geohash order.
+
+    Ordering by the indexed geohash keeps the plan on the prefix ranges (and
+    a sort of the rows they match); ordering by id alone makes SQLite walk
+    the whole primary key instead.
+    """
+    return (
+        select(Place)
+        .where(*bbox_clauses(min_lat, min_lng, max_lat, max_lng))
+        .order_by(Place.geohash, Place.id)
+        .limit(clamp_page_size(limit))
+    )
+
+
+def radius_statement(latitude, longitude, radius_km, limit=None):
+    """SELECT of the places nearest a point inside the radius' bounding box, nearest first.
+
+    Rows are ordered by the equirectangular distance (plain arithmetic any
+    database can index-scan and sort) and limited in SQL, so a search never
+    loads more than RADIUS_OVERFETCH rows per result; nearest_matches then
+    applies the exact great-circle distance to them.
+    """
+    if radius_km > MAX_SEARCH_RADIUS_KM:
+        raise ValueError(f"The search radius cannot exceed {MAX_SEARCH_RADIUS_KM:g} km.")
+    d_lat = Place.latitude - latitude
+    d_lng = Place.longitude - longitude
+    d_lng = case((d_lng > 180.0, d_lng - 360.0), (d_lng < -180.0, d_lng + 360.0), else_=d_lng)  # Antimeridian
+    scale = math.cos(math.radians(latitude)) ** 2
+    return (
+        select(Place)
+        .where(*bbox_clauses(*radius_bounding_box(latitude, longitude, radius_km)))
+        .order_by(d_lat * d_lat + d_lng * d_lng * scale, Place.id)
+        .limit(clamp_page_size(limit) * RADIUS_OVERFETCH)
+    )
+
+
+def nearest_matches(candidates, latitude, longitude, radius_km, limit=None):
+    """(place, distance_km) pairs of the candidates within the radius, nearest first"""
+    matches = []
+    for place in candidates:
+        distance = haversine_km(latitude, longitude, place.latitude, place.longitude)
+        if distance <= radius_km:
+            matches.append((place, distance))
+    matches.sort(key=lambda match: match[1])
+    return matches[:clamp_page_size(limit)]
+
+
+class PlaceRepository(SQLAlchemyRepository):
+    def __init__(self):
+        """Initialize the PlaceRepository with the Place model"""
+        super().__init__(Place)
+
+    def get_with_relations(self, place_id):
+        """Retrieve a place with its owner, amenities and reviews eagerly loaded"""
+        return db.session.query(Place).options(*place_relations()).filter(Place.id == place_id).first()
+
+    def filtered_query(self, min_price=None, max_price=None, amenity_ids=None):
+        """Build a query applying price range and amenity filters as SQL WHERE clauses"""
+        return db.session.query(Place).filter(*place_filters(min_price, max_price, amenity_ids))
+
+    def list_places(self, min_price=None, max_price=None, amenity_ids=None,
+                    sort="created_at", limit=None, cursor=None, with_relations=False, fields=None):
+        """Return one keyset-paginated page of places and the cursor for the next page.
+
+        fields restricts the columns read (see place_load_options).
+        """
+        statement, limit = listing_statement(
+            place_filters(min_price, max_price, amenity_ids), sort, limit, cursor, with_relations, fields)
+        return listing_page(db.session.scalars(statement).all(), sort, limit)
+
+    def facets(self, min_price=None, max_price=None, amenity_ids=None, bucket_width=DEFAULT_PRICE_BUCKET):
+        """Amenity counts and price histogram of the places matching the listing filters"""
+        summary, amenities, histogram = facet_statements(
+            place_filters(min_price, max_price, amenity_ids), bucket_width)
+        total, low, high = db.session.execute(summary).one()
+        check_bucket_count(low, high, bucket_width)
+        return facet_summary(total, db.session.execute(amenities), db.session.execute(histogram), bucket_width)
+
+    def search_bbox(self, min_lat, min_lng, max_lat, max_lng, limit=None):
+        """Return places inside a bounding box (boxes may cross the antimeridian), in geohash order"""
+        return db.session.scalars(bbox_statement(min_lat, min_lng, max_lat, max_lng, limit)).all()
+
+    def search_radius(self, latitude, longitude, radius_km, limit=None):
+        """Return (place, distance_km) pairs within a radius, nearest first"""
+        candidates = db.session.scalars(radius_statement(latitude, longitude, radius_km, limit)).all()
+        return nearest_matches(candidates, latitude, longitude, radius_km, limit)
+
+    def search_text(self, query, min_price=None, max_price=None, amenity_ids=None, limit=None):
+        """Return (place, score) pairs matching every word of query, most relevant first"""
+        statement = search_statement(db.engine.dialect.name, query,
+                                     place_filters(min_price, max_price, amenity_ids), clamp_page_size(limit))
+        return [(place, score) for place, score in db.session.execute(statement)]
+
+    def refresh_search(self, place_ids):
+        """Rebuild the full-text documents of these places from their current rows"""
+        refresh_documents(db.session, place_ids)
+        db.session.commit()
+
+    def reconcile_ratings(self, fix=True, batch_size=1000):
+        """Compare stored rating aggregates with the reviews table.
+
+        Returns a list of (place_id, stored, expected) tuples for every place
+        that drifted; when ``fix`` is set the expected values are written back.
+        """
+        # One GROUP BY over reviews gives the true histogram of every place
+        expected = {}
+        rows = db.session.query(Review.place_id, Review.rating, func.count()).group_by(Review.place_id, Review.rating)
+        for place_id, rating, count in rows:
+            totals = expected.setdefault(place_id, dict.fromkeys(RATING_COLUMNS, 0))
+            totals[f"rating_count_{rating}"] = count
+            totals["review_count"] += count
+            totals["rating_sum"] += rating * count
+
+        drift = []
+        columns = [getattr(Place, name) for name in RATING_COLUMNS]
+        stored_rows = db.session.query(Place.id, *columns).yield_per(batch_size)
+        for place_id, *values in stored_rows:
+            stored = dict(zip(RATING_COLUMNS, values))
+            wanted = expected.get(place_id, dict.fromkeys(RATING_COLUMNS, 0))
+            if stored != wanted:
+                drift.append((place_id, stored, wanted))
+
+        if fix and drift:
+            for start in range(0, len(drift), batch_size):
+                db.session.bulk_update_mappings(Place, [
+                    dict(wanted, id=place_id) for place_id, _, wanted in drift[start:start + batch_size]
+                ])
+            db.session.commit()
+        return drift
@@ -0,0 +1,16 @@
+from app.models.review import Review
+from app.persistence.repository import SQLAlchemyRepository, db
+
+class ReviewRepository(SQLAlchemyRepository):
+    def __init__(self):
+        """Initialize the ReviewRepository with the Review model"""
+        super().__init__(Review)
+
+    def get_by_user_and_place(self, user_id, place_id):
+        """Find the review a user left on a place"""
+        return db.session.query(Review).filter(Review.user_id == user_id, Review.place_id == place_id).first()
+
+    def reviewed_place_ids(self, user_id, place_ids):
+        """Return the subset of place_ids the user has already reviewed"""
+        rows = db.session.query(Review.place_id).filter(Review.user_id == user_id, Review.place_id.in_(list(place_ids)))
+        return {place_id for place_id, in rows}
@@ -1,6 +1,6 @@
 from app.models.user import User
 from app.persistence.repository import SQLAlchemyRepository
-from app import db
+from app.extensions import db
 
 class UserRepository(SQLAlchemyRepository):
     def __init__(self):
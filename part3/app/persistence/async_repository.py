@@ -0,0 +1,182 @@
+"""Async counterparts of the SQL repositories, built on SQLAlchemy's asyncio extension.
+
+Used by AsyncHBnBFacade in the ASGI deployment (asgi.py). Each call opens
+its own AsyncSession and returns detached objects, so anything a caller
+reads afterwards (e.g. a place's owner) must be loaded eagerly here.
+"""
+from abc import ABC, abstractmethod
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.models.place import Place
+from app.models.review import Review
+from app.persistence.engine import engine_options
+from app.persistence.fulltext import search_statement
+from app.persistence.PlaceRepository import (
+    place_relations, DEFAULT_PRICE_BUCKET, place_filters, listing_statement, listing_page, bbox_statement,
+    radius_statement, nearest_matches, facet_statements, check_bucket_count, facet_summary,
+)
+from app.utils.pagination import clamp_page_size
+
+# Async DBAPI driver used for each sync backend of SQLALCHEMY_DATABASE_URI
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "mysql": "aiomysql",
+    "mariadb": "aiomysql",
+    "postgresql": "asyncpg",
+}
+
+
+def async_database_uri(config):
+    """ASYNC_DATABASE_URI, or SQLALCHEMY_DATABASE_URI switched to its async driver"""
+    if config.get("ASYNC_DATABASE_URI"):
+        return config["ASYNC_DATABASE_URI"]
+    url = make_url(config["SQLALCHEMY_DATABASE_URI"])
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver known for '{backend}', set ASYNC_DATABASE_URI.")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+def make_async_engine(config):
+    """Async engine sized like the sync one (asyncio needs its own pool class)"""
+    uri = async_database_uri(config)
+    options = engine_options(config, uri)
+    options.pop("poolclass", None)
+    if make_url(uri).get_backend_name() == "postgresql":
+        options.pop("connect_args", None)  # asyncpg takes server_settings, not libpq options
+    return create_async_engine(uri, **options)
+
+
+def make_async_sessionmaker(engine):
+    # Objects outlive their session, keep their loaded state readable
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+class AsyncRepository(ABC):
+    @abstractmethod
+    async def add(self, obj):
+        pass
+
+    @abstractmethod
+    async def get(self, obj_id):
+        pass
+
+    @abstractmethod
+    async def get_all(self):
+        pass
+
+    @abstractmethod
+    async def update(self, obj_id, data):
+        pass
+
+    @abstractmethod
+    async def delete(self, obj_id):
+        pass
+
+    @abstractmethod
+    async def get_by_attribute(self, attr_name, attr_value):
+        pass
+
+
+class AsyncSQLAlchemyRepository(AsyncRepository):
+    def __init__(self, model, sessionmaker):
+        self.model = model
+        self.sessionmaker = sessionmaker
+
+    async def add(self, obj):
+        async with self.sessionmaker() as session:
+            session.add(obj)
+            await session.commit()
+        return obj
+
+    async def get(self, obj_id):
+        async with self.sessionmaker() as session:
+            return await session.get(self.model, obj_id)
+
+    async def get_all(self):
+        async with self.sessionmaker() as session:
+            return (await session.scalars(select(self.model))).all()
+
+    async def update(self, obj_id, data):
+        async with self.sessionmaker() as session:
+            obj = await session.get(self.model, obj_id)
+            if obj:
+                for key, value in data.items():
+                    setattr(obj, key, value)
+                await session.commit()
+            return obj
+
+    async def delete(self, obj_id):
+        async with self.sessionmaker() as session:
+            obj = await session.get(self.model, obj_id)
+            if obj:
+                await session.delete(obj)
+                await session.commit()
+            return obj
+
+    async def get_by_attribute(self, attr_name, attr_value):
+        async with self.sessionmaker() as session:
+            statement = select(self.model).where(getattr(self.model, attr_name) == attr_value)
+            return (await session.scalars(statement)).first()
+
+
+class AsyncPlaceRepository(AsyncSQLAlchemyRepository):
+    def __init__(self, sessionmaker):
+        super().__init__(Place, sessionmaker)
+
+    async def get_with_relations(self, place_id):
+        """Retrieve a place with its owner, amenities and reviews eagerly loaded"""
+        async with self.sessionmaker() as session:
+            statement = select(Place).options(*place_relations()).where(Place.id == place_id)
+            return (await session.scalars(statement)).first()
+
+    async def list_places(self, min_price=None, max_price=None, amenity_ids=None,
+                          sort="created_at", limit=None, cursor=None, with_relations=False, fields=None):
+        """Same contract as PlaceRepository.list_places"""
+        statement, limit = listing_statement(
+            place_filters(min_price, max_price, amenity_ids), sort, limit, cursor, with_relations, fields)
+        async with self.sessionmaker() as session:
+            rows = (await session.scalars(statement)).all()
+        return listing_page(rows, sort, limit)
+
+    async def facets(self, min_price=None, max_price=None, amenity_ids=None, bucket_width=DEFAULT_PRICE_BUCKET):
+        """Same contract as PlaceRepository.facets"""
+        summary, amenities, histogram = facet_statements(
+            place_filters(min_price, max_price, amenity_ids), bucket_width)
+        async with self.sessionmaker() as session:
+            total, low, high = (await session.execute(summary)).one()
+            check_bucket_count(low, high, bucket_width)
+            return facet_summary(total, (await session.execute(amenities)).all(),
+                                 (await session.execute(histogram)).all(), bucket_width)
+
+    async def search_bbox(self, min_lat, min_lng, max_lat, max_lng, limit=None):
+        """Return places inside a bounding box (boxes may cross the antimeridian), in geohash order"""
+        statement = bbox_statement(min_lat, min_lng, max_lat, max_lng, limit)
+        async with self.sessionmaker() as session:
+            return (await session.scalars(statement)).all()
+
+    async def search_radius(self, latitude, longitude, radius_km, limit=None):
+        """Return (place, distance_km) pairs within a radius, nearest first"""
+        statement = radius_statement(latitude, longitude, radius_km, limit)
+        async with self.sessionmaker() as session:
+            candidates = (await session.scalars(statement)).all()
+        return nearest_matches(candidates, latitude, longitude, radius_km, limit)
+
+    async def search_text(self, query, min_price=None, max_price=None, amenity_ids=None, limit=None):
+        """Same contract as PlaceRepository.search_text"""
+        async with self.sessionmaker() as session:
+            statement = search_statement(session.bind.dialect.name, query,
+                                         place_filters(min_price, max_price, amenity_ids), clamp_page_size(limit))
+            return [(place, score) for place, score in await session.execute(statement)]
+
+
+class AsyncReviewRepository(AsyncSQLAlchemyRepository):
+    def __init__(self, sessionmaker):
+        super().__init__(Review, sessionmaker)
+
+    async def get_by_user_and_place(self, user_id, place_id):
+        """Find the review a user left on a place"""
+        async with self.sessionmaker() as session:
+            statement = select(Review).where(Review.user_id == user_id, Review.place_id == place_id)
+            return (await session.scalars(statement)).first()
@@ -0,0 +1,171 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from app.persistence.repository import Repository, db
+
+# Seconds an entity stays cached, per model name (0 disables caching)
+DEFAULT_CACHE_TTLS = {
+    "Amenity": 3600,
+    "Place": 60,
+    "User": 60,
+    "Review": 0,
+}
+DEFAULT_CACHE_MAX_ENTRIES = 10_000
+
+
+class InProcessCache:
+    """Thread-safe dict backend with per-key TTL and LRU eviction."""
+
+    def __init__(self, max_entries=DEFAULT_CACHE_MAX_ENTRIES, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisCache:
+    """Backend for Redis or any server speaking its protocol.
+
+    ``client`` only needs ``get``, ``set(key, value, ex=ttl)``, ``delete`` and
+    ``info``, so redis-py clients work as well as local stand-ins such as
+    fakeredis. Size is bounded by the server's ``maxmemory`` LRU policy.
+    """
+
+    def __init__(self, client, prefix="hbnb:"):
+        self.client = client
+        self.prefix = prefix
+
+    @property
+    def evictions(self):
+        return int(self.client.info("stats").get("evicted_keys", 0))
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefix + key, value, ex=ttl)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+
+def make_cache_backend(config):
+    """Builds the cache backend selected by CACHE_BACKEND ("memory", "redis" or None)."""
+    backend = config.get("CACHE_BACKEND", "memory")
+    if not backend:
+        return None
+    if backend == "memory":
+        return InProcessCache(config.get("CACHE_MAX_ENTRIES", DEFAULT_CACHE_MAX_ENTRIES))
+    if backend == "redis":
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND='redis' requires the redis package.")
+        return RedisCache(redis.Redis.from_url(config.get("CACHE_REDIS_URL", "redis://localhost:6379/0")))
+    raise ValueError(f"Unknown CACHE_BACKEND '{backend}'.")
+
+
+class CachedRepository(Repository):
+    """Read-through cache around another repository.
+
+    Entities are stored pickled, so a cached copy never shares state with
+    the session that loaded it; hits are merged back into the current
+    session without a SELECT. ``update`` and ``delete`` invalidate the key.
+    Methods not part of Repository are forwarded to the wrapped repository.
+    """
+
+    def __init__(self, repository, backend, ttl):
+        self.repository = repository
+        self.backend = backend
+        self.ttl = ttl
+        self.namespace = repository.model.__name__
+        self.hits = 0
+        self.misses = 0
+
+    def __getattr__(self, name):
+        return getattr(self.repository, name)
+
+    def _key(self, obj_id):
+        return f"{self.namespace}:{obj_id}"
+
+    def stats(self):
+        """Hit/miss counters for this repository and the backend's evictions."""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.backend.evictions}
+
+    def invalidate(self, obj_id):
+        self.backend.delete(self._key(obj_id))
+
+    def add(self, obj):
+        return self.repository.add(obj)
+
+    def get(self, obj_id):
+        cached = self.backend.get(self._key(obj_id))
+        if cached is not None:
+            self.hits += 1
+            return db.session.merge(pickle.loads(cached), load=False)
+        self.misses += 1
+        obj = self.repository.get(obj_id)
+        if obj is not None:
+            self.backend.set(self._key(obj_id), pickle.dumps(obj), self.ttl)
+        return obj
+
+    def get_all(self):
+        return self.repository.get_all()
+
+    def update(self, obj_id, data):
+        result = self.repository.update(obj_id, data)
+        self.invalidate(obj_id)
+        return result
+
+    def delete(self, obj_id):
+        result = self.repository.delete(obj_id)
+        self.invalidate(obj_id)
+        return result
+
+    def get_by_attribute(self, attr_name, attr_value):
+        return self.repository.get_by_attribute(attr_name, attr_value)
+
+    def add_many(self, objs):
+        return self.repository.add_many(objs)
+
+    def update_many(self, updates):
+        result = self.repository.update_many(updates)
+        for obj_id in updates:
+            self.invalidate(obj_id)
+        return result
+
+    def delete_many(self, obj_ids):
+        obj_ids = list(obj_ids)
+        result = self.repository.delete_many(obj_ids)
+        for obj_id in obj_ids:
+            self.invalidate(obj_id)
+        return result
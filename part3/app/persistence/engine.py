@@ -0,0 +1,137 @@
+"""Engine tuning and connection pool metrics driven by the config classes."""
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import QueuePool
+
+POOL_OPTIONS = ("pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_use_lifo")
+# Upper bounds (seconds) of the checkout wait histogram buckets
+CHECKOUT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class PoolMetrics:
+    """Checkout latency and saturation of one connection pool."""
+
+    def __init__(self, label):
+        self.label = label
+        self.pool = None
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.wait_buckets = [0] * len(CHECKOUT_BUCKETS)
+        self._lock = threading.Lock()
+
+    def observe_checkout(self, seconds, timed_out=False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            for i, bound in enumerate(CHECKOUT_BUCKETS):
+                if seconds <= bound:
+                    self.wait_buckets[i] += 1
+
+    def snapshot(self):
+        """Current counters plus live pool occupancy"""
+        pool = self.pool
+        size = pool.size() if pool is not None else 0
+        in_use = pool.checkedout() if pool is not None else 0
+        capacity = size + max(getattr(pool, "_max_overflow", 0), 0)
+        with self._lock:
+            return {
+                "label": self.label,
+                "size": size,
+                "capacity": capacity,
+                "in_use": in_use,
+                "overflow": pool.overflow() if pool is not None else 0,
+                "saturation": round(in_use / capacity, 3) if capacity else 0.0,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_avg": self.wait_seconds_total / self.checkouts if self.checkouts else 0.0,
+                "wait_seconds_max": self.wait_seconds_max,
+                "wait_seconds_buckets": dict(zip(CHECKOUT_BUCKETS, self.wait_buckets)),
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited for a connection."""
+
+    metrics = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeout:
+            if self.metrics is not None:
+                self.metrics.observe_checkout(time.perf_counter() - start, timed_out=True)
+            raise
+        if self.metrics is not None:
+            self.metrics.observe_checkout(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        if self.metrics is not None:
+            self.metrics.pool = pool
+        return pool
+
+
+def _is_memory_sqlite(url):
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def engine_options(config, uri=None):
+    """SQLALCHEMY_ENGINE_OPTIONS adapted to the database the URI points at"""
+    url = make_url(uri or config["SQLALCHEMY_DATABASE_URI"])
+    options = dict(config.get("SQLALCHEMY_ENGINE_OPTIONS", {}))
+    connect_args = dict(options.get("connect_args", {}))
+    timeout_ms = config.get("DB_STATEMENT_TIMEOUT_MS")
+    backend = url.get_backend_name()
+
+    if _is_memory_sqlite(url):
+        # One shared connection (StaticPool): pool sizing does not apply
+        for name in POOL_OPTIONS + ("pool_pre_ping",):
+            options.pop(name, None)
+    else:
+        options.setdefault("poolclass", InstrumentedQueuePool)
+
+    if timeout_ms:
+        if backend == "sqlite":
+            connect_args.setdefault("timeout", timeout_ms / 1000)  # Wait on locks, not forever
+        elif backend in ("mysql", "mariadb"):
+            connect_args.setdefault("init_command", f"SET SESSION max_execution_time={int(timeout_ms)}")
+        elif backend == "postgresql":
+            connect_args.setdefault("options", f"-c statement_timeout={int(timeout_ms)}")
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+def install_engine_hooks(engine, config, label="primary"):
+    """Apply SQLite pragmas and attach pool metrics to an engine"""
+    if engine.dialect.name == "sqlite":
+        journal_mode = config.get("SQLITE_JOURNAL_MODE")
+        synchronous = config.get("SQLITE_SYNCHRONOUS")
+        memory = _is_memory_sqlite(engine.url)
+
+        @event.listens_for(engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            if journal_mode and not memory:
+                cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+            if synchronous:
+                cursor.execute(f"PRAGMA synchronous={synchronous}")
+            cursor.close()
+
+    metrics = PoolMetrics(label)
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.metrics = metrics
+        metrics.pool = engine.pool
+    return metrics
@@ -0,0 +1,126 @@
+"""Full-text search over place titles, descriptions and review text.
+
+Every place has one search document in ``place_search`` (title, description
+and the text of all its reviews). On SQLite it is an FTS5 virtual table
+ranked with bm25(); on MySQL a table with a FULLTEXT index, matched in
+boolean mode and ranked by InnoDB's relevance score. HBnBFacade refreshes a
+place's document whenever the place or one of its reviews is written.
+"""
+import re
+from sqlalchemy import Column, MetaData, String, Table, Text, delete, func, insert, literal_column, select, text
+from app.models.place import Place
+from app.models.review import Review
+
+SUPPORTED_DIALECTS = ("sqlite", "mysql", "mariadb")
+
+# MySQL's GROUP_CONCAT stops at group_concat_max_len (1024 bytes by default); raised to what the
+# MEDIUMTEXT reviews column holds before any document is built
+GROUP_CONCAT_MAX_LEN = 2 ** 24 - 1
+
+# bm25 column weights: place_id (not indexed), title, description, reviews
+BM25_WEIGHTS = (0.0, 10.0, 4.0, 1.0)
+
+place_search = Table(
+    "place_search",
+    MetaData(),
+    Column("place_id", String(36), primary_key=True),
+    Column("title", String(100)),
+    Column("description", Text),
+    Column("reviews", Text),
+)
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+class FullTextUnavailable(RuntimeError):
+    """The database has no full-text index the app knows how to use."""
+
+
+def supports_fulltext(dialect_name):
+    return dialect_name in SUPPORTED_DIALECTS
+
+
+def search_terms(query):
+    """Words of a user query, stripped of any search syntax"""
+    return _TOKEN.findall(query or "")
+
+
+def create_index(connection):
+    """Create the search table for this database and fill it from the existing rows"""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        connection.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS place_search USING fts5("
+            "place_id UNINDEXED, title, description, reviews, tokenize='unicode61 remove_diacritics 2')"))
+    elif dialect in ("mysql", "mariadb"):
+        connection.execute(text(
+            "CREATE TABLE IF NOT EXISTS place_search ("
+            "place_id VARCHAR(36) PRIMARY KEY, title VARCHAR(100), description TEXT, reviews MEDIUMTEXT, "
+            "FULLTEXT KEY ft_place_search (title, description, reviews)) ENGINE=InnoDB"))
+    else:
+        return  # No full-text support: searches answer FullTextUnavailable
+    connection.execute(delete(place_search))
+    _allow_long_documents(connection, dialect)
+    connection.execute(_documents_insert())
+
+
+def _allow_long_documents(connection, dialect_name):
+    """Let GROUP_CONCAT return every review of a place on MySQL (set per connection)"""
+    if dialect_name in ("mysql", "mariadb"):
+        connection.execute(text(f"SET SESSION group_concat_max_len = {GROUP_CONCAT_MAX_LEN}"))
+
+
+def _documents_insert(place_ids=None):
+    """INSERT ... SELECT building the search documents of place_ids (all places when None)"""
+    documents = (
+        select(
+            Place.id,
+            Place.title,
+            func.coalesce(Place.description, ""),
+            func.coalesce(func.group_concat(Review.text), ""),
+        )
+        .select_from(Place)
+        .outerjoin(Review, Review.place_id == Place.id)
+        .group_by(Place.id, Place.title, Place.description)
+    )
+    if place_ids is not None:
+        documents = documents.where(Place.id.in_(place_ids))
+    return insert(place_search).from_select(["place_id", "title", "description", "reviews"], documents)
+
+
+def refresh_documents(session, place_ids):
+    """Rebuild the search documents of these places (a deleted place just loses its document)"""
+    place_ids = [place_id for place_id in set(place_ids) if place_id is not None]
+    dialect = session.get_bind().dialect.name
+    if not place_ids or not supports_fulltext(dialect):
+        return
+    session.execute(delete(place_search).where(place_search.c.place_id.in_(place_ids)))
+    _allow_long_documents(session, dialect)
+    session.execute(_documents_insert(place_ids))
+
+
+def search_statement(dialect_name, query, filters=(), limit=20):
+    """SELECT (Place, score) matching every word of query, best first; filters are extra WHERE clauses"""
+    terms = search_terms(query)
+    if not terms:
+        raise ValueError("The search query has no words.")
+    if dialect_name == "sqlite":
+        # Each word quoted so user input can never be FTS5 syntax; implicit AND between them
+        match = " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+        rank = func.bm25(literal_column("place_search"), *BM25_WEIGHTS)
+        statement = (select(Place, (-rank).label("score"))
+                     .join(place_search, place_search.c.place_id == Place.id)
+                     .where(literal_column("place_search").op("MATCH")(match))
+                     .order_by(rank))
+    elif dialect_name in ("mysql", "mariadb"):
+        columns = "place_search.title, place_search.description, place_search.reviews"
+        required = " ".join(f"+{term}" for term in terms)
+        score = literal_column(f"MATCH({columns}) AGAINST (:natural IN NATURAL LANGUAGE MODE)")
+        statement = (select(Place, score.label("score"))
+                     .join(place_search, place_search.c.place_id == Place.id)
+                     .where(text(f"MATCH({columns}) AGAINST (:required IN BOOLEAN MODE)"))
+                     .order_by(score.desc())
+                     .params(natural=" ".join(terms), required=required))
+    else:
+        raise FullTextUnavailable(f"Full-text search is not available on {dialect_name}.")
+    return statement.where(*filters).limit(limit)
@@ -0,0 +1,62 @@
+"""Progress of `flask hbnb import` jobs, stored next to the data it describes.
+
+Each batch updates its job's checkpoint and id map in the same transaction
+as the imported rows, so after a crash a job resumes exactly where the
+last committed batch ended.
+"""
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select, update
+
+metadata = MetaData()
+
+import_checkpoints = Table(
+    "import_checkpoints",
+    metadata,
+    Column("job", String(100), primary_key=True),
+    Column("kind", String(20), primary_key=True),
+    Column("records_done", Integer, nullable=False, default=0),  # Records of the source file consumed
+    Column("updated_at", DateTime, nullable=False, default=datetime.utcnow),
+)
+
+# Partner (external) id -> id of the row it became
+import_ids = Table(
+    "import_ids",
+    metadata,
+    Column("job", String(100), primary_key=True),
+    Column("kind", String(20), primary_key=True),
+    Column("external_id", String(255), primary_key=True),
+    Column("internal_id", String(36), nullable=False),
+)
+
+
+def load_checkpoint(connection, job):
+    """{kind: records_done} of a job"""
+    rows = connection.execute(select(import_checkpoints.c.kind, import_checkpoints.c.records_done)
+                              .where(import_checkpoints.c.job == job))
+    return {kind: done for kind, done in rows}
+
+
+def load_id_map(connection, job, kinds):
+    """{kind: {external_id: internal_id}} of a job"""
+    id_map = {kind: {} for kind in kinds}
+    rows = connection.execute(select(import_ids.c.kind, import_ids.c.external_id, import_ids.c.internal_id)
+                              .where(import_ids.c.job == job, import_ids.c.kind.in_(kinds)))
+    for kind, external_id, internal_id in rows:
+        id_map[kind][external_id] = internal_id
+    return id_map
+
+
+def save_progress(connection, job, kind, records_done, new_ids, exists):
+    """Record a committed batch: its checkpoint and the ids it created"""
+    if new_ids:
+        connection.execute(import_ids.insert(), [
+            {"job": job, "kind": kind, "external_id": external_id, "internal_id": str(internal_id)}
+            for external_id, internal_id in new_ids.items()
+        ])
+    values = {"records_done": records_done, "updated_at": datetime.utcnow()}
+    if exists:
+        connection.execute(update(import_checkpoints)
+                           .where(import_checkpoints.c.job == job, import_checkpoints.c.kind == kind)
+                           .values(**values))
+    else:
+        connection.execute(import_checkpoints.insert().values(job=job, kind=kind, **values))
@@ -0,0 +1,108 @@
+"""The background job table read by `flask hbnb worker` (app/services/jobs.py).
+
+A job is claimed by bumping its attempts and marking it running in one
+transaction, so concurrent workers never run the same job twice; a job
+left running longer than the lease (its worker died) is claimed again.
+MySQL and PostgreSQL skip rows other workers are claiming
+(FOR UPDATE SKIP LOCKED); SQLite serializes writers anyway.
+"""
+import json
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import (
+    Column, DateTime, Index, Integer, MetaData, String, Table, Text, and_, func, or_, select, update
+)
+from sqlalchemy.exc import IntegrityError
+
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+
+metadata = MetaData()
+
+jobs = Table(
+    "jobs",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("name", String(100), nullable=False),
+    Column("payload", Text, nullable=False),  # JSON keyword arguments of the handler
+    # Names one unit of work: enqueueing the same key again is a no-op
+    Column("idempotency_key", String(255), nullable=True, unique=True),
+    Column("status", String(20), nullable=False, default=PENDING),
+    Column("attempts", Integer, nullable=False, default=0),
+    Column("max_attempts", Integer, nullable=False),
+    Column("run_at", DateTime, nullable=False),  # Not before; pushed back by each retry
+    Column("locked_by", String(100), nullable=True),
+    Column("locked_at", DateTime, nullable=True),
+    Column("last_error", Text, nullable=True),
+    Column("created_at", DateTime, nullable=False, default=datetime.utcnow),
+    Column("finished_at", DateTime, nullable=True),
+    Index("ix_jobs_status_run_at", "status", "run_at"),  # Claim scans
+)
+
+# Dialects where claiming skips rows locked by other workers
+SKIP_LOCKED_DIALECTS = ("mysql", "mariadb", "postgresql")
+
+
+def insert_job(connection, name, payload, max_attempts, run_at, key=None):
+    """Insert a pending job and return its id, or the id of the job already holding key"""
+    values = {"name": name, "payload": json.dumps(payload), "idempotency_key": key, "status": PENDING,
+              "attempts": 0, "max_attempts": max_attempts, "run_at": run_at, "created_at": datetime.utcnow()}
+    if key is not None:
+        existing = connection.scalar(select(jobs.c.id).where(jobs.c.idempotency_key == key))
+        if existing is not None:
+            return existing
+        try:
+            with connection.begin_nested():  # A concurrent enqueue may win the race for the key
+                return connection.execute(jobs.insert().values(**values)).inserted_primary_key[0]
+        except IntegrityError:
+            return connection.scalar(select(jobs.c.id).where(jobs.c.idempotency_key == key))
+    return connection.execute(jobs.insert().values(**values)).inserted_primary_key[0]
+
+
+def _claimable(now, lease):
+    return or_(
+        and_(jobs.c.status == PENDING, jobs.c.run_at <= now),
+        and_(jobs.c.status == RUNNING, jobs.c.locked_at < now - lease),
+    )
+
+
+def claim_jobs(connection, worker_id, limit, lease_seconds, now=None):
+    """Mark up to limit due jobs as running for worker_id and return them (id, name, payload dict, attempts, max)"""
+    now = now or datetime.utcnow()
+    lease = timedelta(seconds=lease_seconds)
+    candidates = select(jobs.c.id).where(_claimable(now, lease)).order_by(jobs.c.run_at, jobs.c.id).limit(limit)
+    if connection.dialect.name in SKIP_LOCKED_DIALECTS:
+        candidates = candidates.with_for_update(skip_locked=True)
+    ids = list(connection.scalars(candidates))
+    if not ids:
+        return []
+    # The claim condition is checked again, so a job claimed meanwhile is left alone;
+    # the token tells this claim's rows apart from the worker's earlier ones
+    token = f"{worker_id[:80]}:{uuid.uuid4().hex[:12]}"
+    connection.execute(update(jobs).where(jobs.c.id.in_(ids), _claimable(now, lease)).values(
+        status=RUNNING, locked_by=token, locked_at=now, attempts=jobs.c.attempts + 1))
+    rows = connection.execute(
+        select(jobs.c.id, jobs.c.name, jobs.c.payload, jobs.c.attempts, jobs.c.max_attempts)
+        .where(jobs.c.id.in_(ids), jobs.c.locked_by == token)
+        .order_by(jobs.c.run_at, jobs.c.id))
+    return [(job_id, name, json.loads(payload), attempts, max_attempts)
+            for job_id, name, payload, attempts, max_attempts in rows]
+
+
+def finish_job(connection, job_id):
+    connection.execute(update(jobs).where(jobs.c.id == job_id).values(
+        status=DONE, finished_at=datetime.utcnow(), locked_by=None, locked_at=None))
+
+
+def retry_job(connection, job_id, error, retry_at):
+    """Put a failed attempt back in the queue for retry_at, or fail the job for good when retry_at is None"""
+    values = {"last_error": error, "locked_by": None, "locked_at": None}
+    if retry_at is None:
+        values.update(status=FAILED, finished_at=datetime.utcnow())
+    else:
+        values.update(status=PENDING, run_at=retry_at)
+    connection.execute(update(jobs).where(jobs.c.id == job_id).values(**values))
+
+
+def job_counts(connection):
+    """{status: number of jobs}"""
+    return dict(connection.execute(select(jobs.c.status, func.count()).group_by(jobs.c.status)).all())
@@ -0,0 +1,258 @@
+"""In-memory counterparts of the SQL repositories, backed by InMemoryRepository indexes.
+
+Selected with PERSISTENCE_BACKEND = "memory"; they expose the same methods
+as UserRepository, PlaceRepository and ReviewRepository so the facade does
+not care which backend it runs on.
+
+Without a session nothing loads relationships, so the repositories link
+them themselves: adding a place sets its owner, adding a review its place
+and user (the backrefs fill user.places, place.reviews and user.reviews),
+and deletes cascade like the SQL schema's "all, delete" relationships. Wire
+them with link_repositories().
+"""
+from collections import Counter
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.models.amenity import Amenity
+from app.persistence.repository import InMemoryRepository, HashIndex, SortedIndex
+from app.persistence.PlaceRepository import (
+    PLACE_SORT_FIELDS, DEFAULT_PRICE_BUCKET, MAX_SEARCH_RADIUS_KM, check_bucket_count, facet_summary
+)
+from app.persistence.fulltext import BM25_WEIGHTS, search_terms
+from app.utils.pagination import clamp_page_size, encode_cursor, decode_cursor
+from app.utils.geo import split_antimeridian, radius_bounding_box, haversine_km
+
+
+def link_repositories(users, places, reviews):
+    """Let each repository reach the ones its relationships and cascades point to"""
+    users.places, users.reviews = places, reviews
+    places.users, places.reviews = users, reviews
+    reviews.users, reviews.places = users, places
+
+
+def _link(obj, attr, target):
+    """Set a many-to-one relationship unless already set (the backref would append twice)"""
+    if getattr(obj, attr) is not target:
+        setattr(obj, attr, target)
+
+
+class InMemoryUserRepository(InMemoryRepository):
+    def __init__(self):
+        super().__init__(User, indexes=[HashIndex("email")])
+        self.places = self.reviews = None
+
+    def delete(self, obj_id):
+        """Delete a user with their places and reviews"""
+        with self._lock:
+            user = super().delete(obj_id)
+            if user is not None and self.places is not None:
+                for place in list(user.places):
+                    self.places.delete(place.id)
+                for review in list(user.reviews):
+                    self.reviews.delete(review.id)
+            return user
+
+    def get_user_by_email(self, email):
+        """Find a user by email"""
+        return self.get_by_attribute("email", email)
+
+    def is_email_registered(self, email):
+        """Check if an email is already registered (returns True/False)"""
+        return self.get_by_attribute("email", email) is not None
+
+
+class InMemoryPlaceRepository(InMemoryRepository):
+    def __init__(self):
+        super().__init__(Place, indexes=[
+            SortedIndex("price"),
+            SortedIndex("latitude"),
+            HashIndex("owner_id"),
+        ])
+        self.users = self.reviews = None
+
+    def add(self, obj):
+        with self._lock:
+            super().add(obj)
+            if self.users is not None:
+                _link(obj, "owner", self.users.get(obj.owner_id))
+            return obj
+
+    def update(self, obj_id, data):
+        with self._lock:
+            place = super().update(obj_id, data)
+            if place is not None and self.users is not None:
+                _link(place, "owner", self.users.get(place.owner_id))
+            return place
+
+    def delete(self, obj_id):
+        """Delete a place with its reviews"""
+        with self._lock:
+            place = super().delete(obj_id)
+            if place is not None:
+                if self.reviews is not None:
+                    for review in list(place.reviews):
+                        self.reviews.delete(review.id)
+                place.owner = None
+                place.amenities.clear()
+            return place
+
+    def get_with_relations(self, place_id):
+        """Relationships are plain Python lists here, nothing to preload"""
+        return self.get(place_id)
+
+    def _filtered(self, min_price=None, max_price=None, amenity_ids=None):
+        """Places in the price range offering every requested amenity"""
+        # Price range comes straight from the sorted index
+        if min_price is not None or max_price is not None:
+            places = self.find_range("price", min_price, max_price)
+        else:
+            places = self.get_all()
+        if amenity_ids:
+            wanted = set(amenity_ids)
+            places = [p for p in places if wanted <= {a.id for a in p.amenities}]
+        return places
+
+    def list_places(self, min_price=None, max_price=None, amenity_ids=None,
+                    sort="created_at", limit=None, cursor=None, with_relations=False, fields=None):
+        """Same contract as PlaceRepository.list_places (objects are in memory: fields reads nothing less)"""
+        descending = sort.startswith("-")
+        field = sort.lstrip("-")
+        if field not in PLACE_SORT_FIELDS:
+            raise ValueError(f"Cannot sort by '{field}'.")
+        limit = clamp_page_size(limit)
+        places = self._filtered(min_price, max_price, amenity_ids)
+
+        def sort_key(place):
+            return getattr(place, field), place.id
+
+        places.sort(key=sort_key, reverse=descending)
+        if cursor:
+            after = decode_cursor(cursor, sort)
+            places = [p for p in places if (sort_key(p) < after if descending else sort_key(p) > after)]
+
+        page = places[:limit]
+        next_cursor = None
+        if len(places) > limit:
+            next_cursor = encode_cursor(sort, getattr(page[-1], field), page[-1].id)
+        return page, next_cursor
+
+    def facets(self, min_price=None, max_price=None, amenity_ids=None, bucket_width=DEFAULT_PRICE_BUCKET):
+        """Same contract as PlaceRepository.facets, counted over the filtered places"""
+        if bucket_width <= 0:
+            raise ValueError("The price bucket width must be positive.")
+        places = self._filtered(min_price, max_price, amenity_ids)
+        prices = [place.price for place in places]
+        check_bucket_count(min(prices, default=None), max(prices, default=None), bucket_width)
+        amenities, amenity_counts, bucket_counts = {}, Counter(), Counter()
+        for place in places:
+            bucket_counts[int(place.price // bucket_width)] += 1
+            for amenity in place.amenities:
+                amenities[amenity.id] = amenity.name
+                amenity_counts[amenity.id] += 1
+        ranked = sorted(amenity_counts, key=lambda a_id: (-amenity_counts[a_id], amenities[a_id]))
+        return facet_summary(len(places), [(a_id, amenities[a_id], amenity_counts[a_id]) for a_id in ranked],
+                             sorted(bucket_counts.items()), bucket_width)
+
+    def search_bbox(self, min_lat, min_lng, max_lat, max_lng, limit=None):
+        """Latitude range from the sorted index, then the longitude check; geohash order like SQL"""
+        boxes = split_antimeridian(min_lat, min_lng, max_lat, max_lng)
+        matches = [place for place in self.find_range("latitude", min_lat, max_lat)
+                   if any(lng0 <= place.longitude <= lng1 for _, lng0, _, lng1 in boxes)]
+        matches.sort(key=lambda place: (place.geohash, place.id))
+        return matches[:clamp_page_size(limit)]
+
+    def search_radius(self, latitude, longitude, radius_km, limit=None):
+        """(place, distance_km) pairs within a radius, nearest first"""
+        if radius_km > MAX_SEARCH_RADIUS_KM:
+            raise ValueError(f"The search radius cannot exceed {MAX_SEARCH_RADIUS_KM:g} km.")
+        matches = []
+        for place in self.search_bbox(*radius_bounding_box(latitude, longitude, radius_km), limit=len(self._storage)):
+            distance = haversine_km(latitude, longitude, place.latitude, place.longitude)
+            if distance <= radius_km:
+                matches.append((place, distance))
+        matches.sort(key=lambda match: match[1])
+        return matches[:clamp_page_size(limit)]
+
+    def search_text(self, query, min_price=None, max_price=None, amenity_ids=None, limit=None):
+        """(place, score) pairs containing every word of query, scored by weighted term counts"""
+        terms = [term.lower() for term in search_terms(query)]
+        if not terms:
+            raise ValueError("The search query has no words.")
+        places = self._filtered(min_price, max_price, amenity_ids)
+        _, title_weight, description_weight, review_weight = BM25_WEIGHTS
+        matches = []
+        for place in places:
+            fields = [
+                (title_weight, search_terms((place.title or "").lower())),
+                (description_weight, search_terms((place.description or "").lower())),
+                (review_weight, search_terms(" ".join(review.text for review in place.reviews).lower())),
+            ]
+            if not all(any(term in words for _, words in fields) for term in terms):
+                continue
+            score = sum(weight * words.count(term) for weight, words in fields for term in terms)
+            matches.append((place, float(score)))
+        matches.sort(key=lambda match: -match[1])
+        return matches[:clamp_page_size(limit)]
+
+    def refresh_search(self, place_ids):
+        """search_text reads the live objects, there is no index to refresh"""
+
+    def reconcile_ratings(self, fix=True):
+        """Aggregates live on the same objects as the reviews here, so they cannot drift"""
+        return []
+
+
+class InMemoryReviewRepository(InMemoryRepository):
+    def __init__(self):
+        super().__init__(Review, indexes=[
+            HashIndex("user_id", "place_id"),
+            HashIndex("place_id"),
+        ])
+        self.users = self.places = None
+
+    def _link_relations(self, review):
+        if self.users is not None:
+            _link(review, "user", self.users.get(review.user_id))
+            _link(review, "place", self.places.get(review.place_id))
+
+    def add(self, obj):
+        with self._lock:
+            super().add(obj)
+            self._link_relations(obj)
+            return obj
+
+    def update(self, obj_id, data):
+        with self._lock:
+            review = super().update(obj_id, data)
+            if review is not None:
+                self._link_relations(review)
+            return review
+
+    def delete(self, obj_id):
+        with self._lock:
+            review = super().delete(obj_id)
+            if review is not None:
+                review.user = review.place = None
+            return review
+
+    def get_by_user_and_place(self, user_id, place_id):
+        """Find the review a user left on a place"""
+        return next(iter(self.find(user_id=user_id, place_id=place_id)), None)
+
+    def reviewed_place_ids(self, user_id, place_ids):
+        """Return the subset of place_ids the user has already reviewed"""
+        return {place_id for place_id in place_ids if self.find(user_id=user_id, place_id=place_id)}
+
+
+class InMemoryAmenityRepository(InMemoryRepository):
+    def __init__(self):
+        super().__init__(Amenity, indexes=[HashIndex("name")])
+
+    def delete(self, obj_id):
+        """Delete an amenity and its links to places"""
+        with self._lock:
+            amenity = super().delete(obj_id)
+            if amenity is not None:
+                amenity.places.clear()
+            return amenity
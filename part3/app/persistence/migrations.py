@@ -0,0 +1,136 @@
+"""Versioned schema migrations, applied in order with `flask hbnb migrate`.
+
+Each migration runs in its own transaction and records its version in the
+``schema_migrations`` table. Migrations inspect the live schema before
+changing it, so a database created from the current models (which already
+declare every column and index) simply gets its versions stamped.
+"""
+from datetime import datetime
+from sqlalchemy import (
+    Column, DateTime, Index, Integer, MetaData, String, Table, inspect, select, text, update
+)
+from app.models.user import User
+from app.models.place import Place, place_amenity_association
+from app.models.review import Review
+from app.models.amenity import Amenity
+from app.utils.geo import encode_geohash
+from app.persistence.import_state import import_checkpoints, import_ids
+from app.persistence.jobs import jobs
+from app.persistence.versions import collection_versions, seed_rows
+from app.persistence.fulltext import create_index as create_fulltext_index
+
+MIGRATIONS = []
+
+_version_table = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def migration(version, description):
+    """Register fn(connection) as schema migration number `version`"""
+    def register(fn):
+        MIGRATIONS.append((version, description, fn))
+        MIGRATIONS.sort(key=lambda entry: entry[0])
+        return fn
+    return register
+
+
+def _columns(connection, table_name):
+    return {column["name"] for column in inspect(connection).get_columns(table_name)}
+
+
+def _create_index(connection, name, table_name, columns, unique=False):
+    """Create an index unless one with that name already exists"""
+    if name in {index["name"] for index in inspect(connection).get_indexes(table_name)}:
+        return
+    table = Table(table_name, MetaData(), autoload_with=connection)
+    Index(name, *(table.c[column] for column in columns), unique=unique).create(connection)
+
+
+@migration(1, "Create base tables")
+def create_base_tables(connection):
+    for table in (User.__table__, Amenity.__table__, Place.__table__, place_amenity_association, Review.__table__):
+        table.create(connection, checkfirst=True)
+
+
+@migration(2, "Add geohash and rating aggregate columns to places")
+def add_place_columns(connection):
+    existing = _columns(connection, "places")
+    for name in ("review_count", "rating_sum", "rating_count_1", "rating_count_2",
+                 "rating_count_3", "rating_count_4", "rating_count_5"):
+        if name not in existing:
+            connection.execute(text(f"ALTER TABLE places ADD COLUMN {name} INTEGER NOT NULL DEFAULT 0"))
+    if "geohash" not in existing:
+        connection.execute(text("ALTER TABLE places ADD COLUMN geohash VARCHAR(12)"))
+        places = Table("places", MetaData(), autoload_with=connection)
+        rows = connection.execute(select(places.c.id, places.c.latitude, places.c.longitude)).all()
+        for place_id, latitude, longitude in rows:
+            connection.execute(update(places).where(places.c.id == place_id)
+                               .values(geohash=encode_geohash(latitude, longitude)))
+    _create_index(connection, "ix_places_geohash", "places", ["geohash"])
+
+
+@migration(3, "Index hot lookup paths and enforce one review per user and place")
+def index_hot_paths(connection):
+    _create_index(connection, "ix_places_owner_id", "places", ["owner_id"])
+    _create_index(connection, "ix_reviews_place_id", "reviews", ["place_id"])
+    _create_index(connection, "ix_place_amenity_amenity_id", "place_amenity", ["amenity_id"])
+    _create_index(connection, "uq_reviews_user_place", "reviews", ["user_id", "place_id"], unique=True)
+
+
+@migration(4, "Create the collection version stamp table")
+def create_collection_versions(connection):
+    collection_versions.create(connection, checkfirst=True)
+    # Seeded so the first conditional GET of a collection does not have to write its stamp
+    connection.execute(collection_versions.insert(), seed_rows())
+
+
+@migration(5, "Index updated_at for incremental exports")
+def index_updated_at(connection):
+    for table_name in ("places", "reviews", "amenities"):
+        if "updated_at" in _columns(connection, table_name):
+            _create_index(connection, f"ix_{table_name}_updated_at", table_name, ["updated_at"])
+
+
+@migration(6, "Create bulk import checkpoint and id map tables")
+def create_import_state(connection):
+    import_checkpoints.create(connection, checkfirst=True)
+    import_ids.create(connection, checkfirst=True)
+
+
+@migration(7, "Create the full-text search index of places and reviews")
+def create_place_search(connection):
+    create_fulltext_index(connection)
+
+
+@migration(8, "Create the background job queue table")
+def create_jobs(connection):
+    jobs.create(connection, checkfirst=True)
+
+
+def applied_versions(engine):
+    """Versions already recorded in schema_migrations"""
+    with engine.begin() as connection:
+        _version_table.create(connection, checkfirst=True)
+        return {row.version for row in connection.execute(select(_version_table.c.version))}
+
+
+def pending_migrations(engine):
+    applied = applied_versions(engine)
+    return [entry for entry in MIGRATIONS if entry[0] not in applied]
+
+
+def upgrade(engine):
+    """Apply every pending migration, returning the (version, description) pairs applied"""
+    applied = []
+    for version, description, fn in pending_migrations(engine):
+        with engine.begin() as connection:
+            fn(connection)
+            connection.execute(_version_table.insert().values(
+                version=version, description=description, applied_at=datetime.utcnow()))
+        applied.append((version, description))
+    return applied
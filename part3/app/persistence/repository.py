@@ -1,9 +1,15 @@
+import threading
+import uuid
 from abc import ABC, abstractmethod
-from flask_sqlalchemy import SQLAlchemy
-from app import db
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from datetime import datetime
+from operator import itemgetter
+from sqlalchemy import insert, inspect, select
 from app.extensions import db
 
-db = SQLAlchemy()
+# Rows written per transaction by the *_many bulk methods
+BULK_BATCH_SIZE = 1000
 
 class Repository(ABC):
     @abstractmethod
@@ -30,13 +36,113 @@ class Repository(ABC):
     def get_by_attribute(self, attr_name, attr_value):
         pass
 
+    @abstractmethod
+    def add_many(self, objs):
+        pass
+
+    @abstractmethod
+    def update_many(self, updates):
+        pass
+
+    @abstractmethod
+    def delete_many(self, obj_ids):
+        pass
+
+    def invalidate(self, obj_id):
+        """Drop any cached copy of obj_id (no-op for uncached repositories)"""
+        pass
+
+
+class HashIndex:
+    """Equality index on one attribute, or a composite index on several."""
+
+    def __init__(self, *attrs):
+        self.attrs = attrs
+        self._buckets = defaultdict(set)
+
+    def key(self, obj):
+        return tuple(getattr(obj, attr) for attr in self.attrs)
+
+    def add(self, obj):
+        self._buckets[self.key(obj)].add(obj.id)
+
+    def remove(self, obj):
+        key = self.key(obj)
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            bucket.discard(obj.id)
+            if not bucket:
+                del self._buckets[key]
+
+    def lookup(self, values):
+        """IDs whose indexed attributes equal values (a tuple in attrs order)"""
+        return list(self._buckets.get(tuple(values), ()))
+
+
+class SortedIndex:
+    """Ordered index on one attribute, for range lookups."""
+
+    def __init__(self, attr):
+        self.attrs = (attr,)
+        self._entries = []  # sorted (value, id) pairs
+
+    def add(self, obj):
+        value = getattr(obj, self.attrs[0])
+        if value is not None:
+            insort(self._entries, (value, obj.id))
+
+    def remove(self, obj):
+        entry = (getattr(obj, self.attrs[0]), obj.id)
+        position = bisect_left(self._entries, entry)
+        if position < len(self._entries) and self._entries[position] == entry:
+            del self._entries[position]
+
+    def range(self, low=None, high=None):
+        """IDs with low <= value <= high, in value order (None leaves a side open)"""
+        first = 0 if low is None else bisect_left(self._entries, low, key=itemgetter(0))
+        last = len(self._entries) if high is None else bisect_right(self._entries, high, key=itemgetter(0))
+        return [obj_id for _, obj_id in self._entries[first:last]]
+
+    def lookup(self, values):
+        return self.range(values[0], values[0])
+
 
 class InMemoryRepository(Repository):
-    def __init__(self):
+    """Dict-backed repository with declared secondary indexes.
+
+    Every index is kept in sync on add/update/delete, so equality lookups
+    on indexed attributes are O(1) and range lookups on a SortedIndex are
+    O(log n + k) instead of a scan over every stored object.
+    """
+
+    def __init__(self, model=None, indexes=()):
+        self.model = model
         self._storage = {}
+        self._indexes = list(indexes)
+        self._lock = threading.RLock()
+
+    def _index(self, obj):
+        for index in self._indexes:
+            index.add(obj)
+
+    def _unindex(self, obj):
+        for index in self._indexes:
+            index.remove(obj)
 
     def add(self, obj):
-        self._storage[obj.id] = obj
+        with self._lock:
+            # Column defaults only run on a database flush, so apply them here
+            if getattr(obj, "id", None) is None:
+                obj.id = str(uuid.uuid4())
+            for attr in ("created_at", "updated_at"):
+                if hasattr(obj, attr) and getattr(obj, attr) is None:
+                    setattr(obj, attr, datetime.utcnow())
+            previous = self._storage.get(obj.id)
+            if previous is not None:
+                self._unindex(previous)
+            self._storage[obj.id] = obj
+            self._index(obj)
+        return obj
 
     def get(self, obj_id):
         return self._storage.get(obj_id)
@@ -45,17 +151,85 @@ class InMemoryRepository(Repository):
         return list(self._storage.values())
 
     def update(self, obj_id, data):
-        obj = self.get(obj_id)
-        if obj:
-            obj.update(data)
+        with self._lock:
+            obj = self.get(obj_id)
+            if obj:
+                self._unindex(obj)
+                try:
+                    if hasattr(obj, "update"):
+                        obj.update(data)
+                    else:
+                        for key, value in data.items():
+                            setattr(obj, key, value)
+                        if hasattr(obj, "updated_at"):
+                            obj.updated_at = datetime.utcnow()
+                finally:
+                    self._index(obj)
+            return obj
 
     def delete(self, obj_id):
-        if obj_id in self._storage:
-            del self._storage[obj_id]
+        with self._lock:
+            obj = self._storage.pop(obj_id, None)
+            if obj is not None:
+                self._unindex(obj)
+            return obj
+
+    def _best_index(self, attrs):
+        """The index covering the most of attrs, preferring hash indexes"""
+        usable = [index for index in self._indexes if set(index.attrs) <= set(attrs)]
+        return max(usable, key=lambda index: (len(index.attrs), isinstance(index, HashIndex)), default=None)
+
+    def find(self, **criteria):
+        """All objects whose attributes equal the given values"""
+        index = self._best_index(criteria)
+        if index is None:
+            candidates = self._storage.values()
+        else:
+            candidates = [self._storage[obj_id] for obj_id in index.lookup([criteria[a] for a in index.attrs])]
+        return [obj for obj in candidates
+                if all(getattr(obj, attr) == value for attr, value in criteria.items())]
+
+    def find_range(self, attr_name, low=None, high=None):
+        """Objects with low <= attr <= high, ordered by attr"""
+        for index in self._indexes:
+            if isinstance(index, SortedIndex) and index.attrs == (attr_name,):
+                return [self._storage[obj_id] for obj_id in index.range(low, high)]
+        matches = [obj for obj in self._storage.values()
+                   if getattr(obj, attr_name) is not None
+                   and (low is None or getattr(obj, attr_name) >= low)
+                   and (high is None or getattr(obj, attr_name) <= high)]
+        return sorted(matches, key=lambda obj: getattr(obj, attr_name))
 
     def get_by_attribute(self, attr_name, attr_value):
-        return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
-    
+        return next(iter(self.find(**{attr_name: attr_value})), None)
+
+    def get_many(self, values, attr_name="id"):
+        if attr_name == "id":
+            return [self._storage[obj_id] for obj_id in values if obj_id in self._storage]
+        return [obj for value in values for obj in self.find(**{attr_name: value})]
+
+    def add_many(self, objs):
+        for obj in objs:
+            self.add(obj)
+        return len(objs)
+
+    def update_many(self, updates):
+        for obj_id, data in updates.items():
+            self.update(obj_id, data)
+        return len(updates)
+
+    def delete_many(self, obj_ids):
+        for obj_id in obj_ids:
+            self.delete(obj_id)
+        return len(obj_ids)
+
+    def stream_rows(self, columns, updated_since=None, batch_size=BULK_BATCH_SIZE):
+        """Same contract as SQLAlchemyRepository.stream_rows"""
+        objs = [obj for obj in self.get_all() if updated_since is None or obj.updated_at >= updated_since]
+        objs.sort(key=lambda obj: (obj.updated_at, obj.id))
+        for obj in objs:
+            yield tuple(getattr(obj, column) for column in columns)
+
 class SQLAlchemyRepository(Repository):
     def __init__(self, model):
         self.model = model
@@ -63,6 +237,7 @@ class SQLAlchemyRepository(Repository):
     def add(self, obj):
         db.session.add(obj)
         db.session.commit()
+        return obj
 
     def get(self, obj_id):
         return self.model.query.get(obj_id)
@@ -76,12 +251,109 @@ class SQLAlchemyRepository(Repository):
             for key, value in data.items():
                 setattr(obj, key, value)
             db.session.commit()
+        return obj
 
     def delete(self, obj_id):
         obj = self.get(obj_id)
         if obj:
             db.session.delete(obj)
             db.session.commit()
+        return obj
 
     def get_by_attribute(self, attr_name, attr_value):
-        return self.model.query.filter_by(**{attr_name: attr_value}).first()
\ No newline at end of file
+        return self.model.query.filter_by(**{attr_name: attr_value}).first()
+
+    def get_many(self, values, attr_name="id"):
+        """Load the objects whose attr_name is in values, one IN query per batch"""
+        values = list(values)
+        column = getattr(self.model, attr_name)
+        found = []
+        for start in range(0, len(values), BULK_BATCH_SIZE):
+            batch = values[start:start + BULK_BATCH_SIZE]
+            found.extend(db.session.query(self.model).filter(column.in_(batch)).all())
+        return found
+
+    def add_many(self, objs, batch_size=BULK_BATCH_SIZE):
+        """Insert objects as plain rows: one executemany INSERT per table and one commit per batch.
+
+        No ORM unit of work runs, so the objects stay transient; their column
+        defaults (id, timestamps) are filled in here for the caller to read.
+        Rows of many-to-many collections the objects were given (e.g.
+        place.amenities) are inserted the same way.
+        """
+        objs = list(objs)
+        mapper = inspect(self.model)
+        for start in range(0, len(objs), batch_size):
+            batch = objs[start:start + batch_size]
+            rows = [self._row(mapper, obj) for obj in batch]
+            links = list(self._secondary_rows(mapper, batch))
+            db.session.execute(insert(self.model), rows)
+            for table, link_rows in links:
+                db.session.execute(table.insert(), link_rows)
+            db.session.commit()
+        return len(objs)
+
+    @staticmethod
+    def _row(mapper, obj):
+        """Column values of obj, applying Python-side column defaults to obj first"""
+        for attr in mapper.column_attrs:
+            default = attr.columns[0].default
+            if default is not None and getattr(obj, attr.key) is None:
+                setattr(obj, attr.key, default.arg if default.is_scalar else default.arg(None))
+        return {attr.key: getattr(obj, attr.key) for attr in mapper.column_attrs}
+
+    @staticmethod
+    def _secondary_rows(mapper, objs):
+        """(association table, rows) for the many-to-many collections set on objs"""
+        for relationship in mapper.relationships:
+            if relationship.secondary is None:
+                continue
+            rows = []
+            for obj in objs:
+                for target in obj.__dict__.get(relationship.key, ()):  # Only collections that were set
+                    row = {column.key: getattr(obj, mapper.get_property_by_column(local).key)
+                           for local, column in relationship.synchronize_pairs}
+                    row.update({column.key: getattr(target, relationship.mapper.get_property_by_column(remote).key)
+                                for remote, column in relationship.secondary_synchronize_pairs})
+                    rows.append(row)
+                    if relationship.back_populates and inspect(target).persistent:
+                        # Drop the backref append (target.places += obj): obj is not in the session
+                        db.session.expire(target, [relationship.back_populates])
+            if rows:
+                yield relationship.secondary, rows
+
+    def update_many(self, updates, batch_size=BULK_BATCH_SIZE):
+        """Apply {obj_id: data} updates, loading and committing once per batch"""
+        ids = list(updates)
+        updated = 0
+        for start in range(0, len(ids), batch_size):
+            for obj in self.get_many(ids[start:start + batch_size]):
+                for key, value in updates[obj.id].items():
+                    setattr(obj, key, value)  # @validates rules still apply
+                updated += 1
+            db.session.commit()
+        return updated
+
+    def delete_many(self, obj_ids, batch_size=BULK_BATCH_SIZE):
+        """Delete objects by id, committing once per batch (ORM cascades still apply)"""
+        obj_ids = list(obj_ids)
+        deleted = 0
+        for start in range(0, len(obj_ids), batch_size):
+            for obj in self.get_many(obj_ids[start:start + batch_size]):
+                db.session.delete(obj)
+                deleted += 1
+            db.session.commit()
+        return deleted
+
+    def stream_rows(self, columns, updated_since=None, batch_size=BULK_BATCH_SIZE):
+        """Yield column tuples ordered by (updated_at, id), batch_size rows per fetch.
+
+        Plain column rows through a server-side cursor (yield_per) never enter
+        the identity map, so memory stays flat however large the table is.
+        Rows with updated_at >= updated_since only, when given.
+        """
+        statement = select(*(getattr(self.model, column) for column in columns))
+        if updated_since is not None:
+            statement = statement.where(self.model.updated_at >= updated_since)
+        statement = statement.order_by(self.model.updated_at, self.model.id)
+        yield from db.session.execute(statement.execution_options(yield_per=batch_size))
@@ -0,0 +1,165 @@
+"""Read/write splitting: read-only facade calls go to replica engines.
+
+Configure the replicas with SQLALCHEMY_REPLICA_URIS. Facade methods wrapped
+in ``@read_only`` run inside ``reading()``, during which the session sends
+its queries to the next healthy replica (round-robin). Everything else and
+any flush stays on the primary.
+
+Read-your-writes is per client: a request that writes reads from the
+primary for the rest of the request, and its response carries a cookie
+sending that client's reads to the primary for READ_YOUR_WRITES_TTL seconds,
+longer than the replicas are expected to lag.
+"""
+import contextvars
+import functools
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from flask import current_app, g, has_app_context, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import SQLAlchemyError
+
+_reading = contextvars.ContextVar("hbnb_reading", default=False)
+
+# Cookie holding the time (epoch seconds) until which a client that wrote reads from the primary
+PRIMARY_UNTIL_COOKIE = "hbnb_primary_until"
+DEFAULT_READ_YOUR_WRITES_TTL = 10.0
+
+
+class ReplicaSet:
+    """Round-robin over replica engines, skipping the ones failing their health check."""
+
+    def __init__(self, engines, check_interval=5.0, retry_after=30.0, clock=time.monotonic):
+        self.engines = list(engines)
+        self.check_interval = check_interval
+        self.retry_after = retry_after
+        self._clock = clock
+        self._cycle = itertools.cycle(range(len(self.engines)))
+        self._checked_at = [None] * len(self.engines)
+        self._down_until = [0.0] * len(self.engines)
+        self._lock = threading.Lock()
+
+    def _due(self, index):
+        """None when the replica is down, else whether it needs a health check"""
+        now = self._clock()
+        if now < self._down_until[index]:
+            return None
+        checked_at = self._checked_at[index]
+        return checked_at is None or now - checked_at >= self.check_interval
+
+    def _probe(self, index):
+        """Health check of one replica; called without the lock since it may wait on the network"""
+        try:
+            with self.engines[index].connect() as connection:
+                connection.execute(text("SELECT 1"))
+        except SQLAlchemyError:
+            with self._lock:
+                self._down_until[index] = self._clock() + self.retry_after
+            return False
+        with self._lock:
+            self._checked_at[index] = self._clock()
+        return True
+
+    def choose(self):
+        """Next healthy replica engine, or None when they are all down"""
+        for _ in range(len(self.engines)):
+            with self._lock:
+                index = next(self._cycle)
+                due = self._due(index)
+            if due is False or (due and self._probe(index)):
+                return self.engines[index]
+        return None
+
+    def status(self):
+        now = self._clock()
+        return [{"url": engine.url.render_as_string(hide_password=True),
+                 "up": now >= self._down_until[index]}
+                for index, engine in enumerate(self.engines)]
+
+
+def init_replicas(app, install_hooks):
+    """Build the ReplicaSet for SQLALCHEMY_REPLICA_URIS, or None without replicas"""
+    from app.persistence.engine import engine_options
+
+    uris = app.config.get("SQLALCHEMY_REPLICA_URIS") or []
+    if not uris:
+        return None
+    app.after_request(_mark_client)
+    engines = []
+    for index, uri in enumerate(uris):
+        engine = create_engine(uri, **engine_options(app.config, uri))
+        app.extensions["hbnb_pool_metrics"][f"replica{index}"] = install_hooks(engine, app.config, f"replica{index}")
+        engines.append(engine)
+    return ReplicaSet(
+        engines,
+        check_interval=app.config.get("REPLICA_HEALTH_CHECK_INTERVAL", 5.0),
+        retry_after=app.config.get("REPLICA_RETRY_AFTER", 30.0),
+    )
+
+
+@contextmanager
+def reading():
+    """Route the session's queries to a replica inside this block"""
+    token = _reading.set(True)
+    try:
+        yield
+    finally:
+        _reading.reset(token)
+
+
+def read_only(fn):
+    """Mark a facade method as safe to serve from a replica"""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with reading():
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def _primary_until():
+    """Time until which the client's cookie asks for primary reads (0 without a valid cookie)"""
+    try:
+        until = float(request.cookies.get(PRIMARY_UNTIL_COOKIE, 0))
+    except ValueError:
+        return 0.0
+    ttl = current_app.config.get("READ_YOUR_WRITES_TTL", DEFAULT_READ_YOUR_WRITES_TTL)
+    return until if until <= time.time() + ttl else 0.0  # A forged far-future stamp is ignored
+
+
+def has_written():
+    """True once the current request has flushed a write, or its client wrote within READ_YOUR_WRITES_TTL"""
+    if not has_app_context():
+        return False
+    if g.get("hbnb_wrote", False):
+        return True
+    return has_request_context() and _primary_until() > time.time()
+
+
+def _mark_client(response):
+    """after_request hook: a client whose request wrote reads from the primary for a while"""
+    if g.get("hbnb_wrote", False):
+        ttl = current_app.config.get("READ_YOUR_WRITES_TTL", DEFAULT_READ_YOUR_WRITES_TTL)
+        response.set_cookie(PRIMARY_UNTIL_COOKIE, f"{time.time() + ttl:.3f}", max_age=int(ttl) + 1,
+                            httponly=True, samesite="Lax")
+    return response
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session that sends reads to a replica when it is safe."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and _reading.get() and not self._flushing and not has_written():
+            replicas = current_app.extensions.get("hbnb_replicas")
+            engine = replicas.choose() if replicas is not None else None
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _remember_write(session, flush_context):
+    # Read-your-writes: the rest of this request reads from the primary, and so does the client (_mark_client)
+    if has_app_context():
+        g.hbnb_wrote = True
@@ -0,0 +1,65 @@
+"""Collection version stamps kept in the primary database (app/utils/http_cache.py).
+
+A stamp handed out as part of an ETag must change for every process as soon
+as any process writes to the collection, so it cannot live in a
+per-process cache. Without a shared cache backend (Redis) the stamps are
+rows of this table: one primary key lookup per conditional GET, and one
+UPDATE per write. The migration seeds a row per collection, so reads never
+write; a collection without a row reads as MISSING_STAMP until its first
+write.
+"""
+import time
+from sqlalchemy import Column, MetaData, String, Table, select, update
+from sqlalchemy.exc import IntegrityError
+
+metadata = MetaData()
+
+# Collections HBnBFacade bumps (see ``bumps`` in app/services/facade.py), seeded by the migration
+COLLECTIONS = ("users", "places", "reviews", "amenities")
+MISSING_STAMP = "0"
+
+collection_versions = Table(
+    "collection_versions",
+    metadata,
+    Column("name", String(100), primary_key=True),
+    Column("stamp", String(32), nullable=False),
+)
+
+
+def seed_rows():
+    """One row per collection, stamped now (names in CollectionVersions' key format)"""
+    stamp = f"{time.time_ns():x}"
+    return [{"name": f"version:{collection}", "stamp": stamp} for collection in COLLECTIONS]
+
+
+class DatabaseVersionStore:
+    """get/set backend of CollectionVersions over the collection_versions table.
+
+    Runs in the current session outside ``reading()``, so on the primary: a
+    replica could hand out a stamp the primary has already replaced.
+    """
+
+    def __init__(self, session):
+        self.session = session
+
+    def get(self, key):
+        """Stored stamp, or MISSING_STAMP without writing one: a read must not turn into a primary write"""
+        stamp = self.session.scalar(select(collection_versions.c.stamp).where(collection_versions.c.name == key))
+        return MISSING_STAMP if stamp is None else stamp
+
+    def set(self, key, value, ttl=None):
+        """Store value for key and commit; ttl is part of the cache backend interface and ignored"""
+        changed = self.session.execute(update(collection_versions)
+                                       .where(collection_versions.c.name == key).values(stamp=value))
+        if not changed.rowcount:
+            try:
+                with self.session.begin_nested():  # A concurrent first write may create the row
+                    self.session.execute(collection_versions.insert().values(name=key, stamp=value))
+            except IntegrityError:
+                self.session.execute(update(collection_versions)
+                                     .where(collection_versions.c.name == key).values(stamp=value))
+        self.session.commit()
+
+    def delete(self, key):
+        self.session.execute(collection_versions.delete().where(collection_versions.c.name == key))
+        self.session.commit()
@@ -23,10 +23,21 @@ CREATE TABLE places (
     price DECIMAL(10,2) NOT NULL CHECK (price >= 0), -- Ensuring non-negative price
     latitude FLOAT,
     longitude FLOAT,
+    geohash VARCHAR(12) NOT NULL, -- Spatial index key derived from latitude/longitude
     owner_id CHAR(36) NOT NULL,
+    review_count INT NOT NULL DEFAULT 0, -- Rating aggregates maintained on review writes
+    rating_sum INT NOT NULL DEFAULT 0,
+    rating_count_1 INT NOT NULL DEFAULT 0,
+    rating_count_2 INT NOT NULL DEFAULT 0,
+    rating_count_3 INT NOT NULL DEFAULT 0,
+    rating_count_4 INT NOT NULL DEFAULT 0,
+    rating_count_5 INT NOT NULL DEFAULT 0,
     FOREIGN KEY (owner_id) REFERENCES users(id) ON DELETE CASCADE
 );
 
+CREATE INDEX ix_places_geohash ON places (geohash);
+CREATE INDEX ix_places_owner_id ON places (owner_id);
+
 -- Reviews Table (One-to-Many: User → Reviews)
 CREATE TABLE reviews (
     id CHAR(36) PRIMARY KEY,
@@ -39,6 +50,8 @@ CREATE TABLE reviews (
     UNIQUE (user_id, place_id) -- Ensuring a user can only review a place once
 );
 
+CREATE INDEX ix_reviews_place_id ON reviews (place_id);
+
 -- Amenities Table (Independent Entity)
 CREATE TABLE amenities (
     id CHAR(36) PRIMARY KEY,
@@ -54,6 +67,8 @@ CREATE TABLE place_amenities (
     FOREIGN KEY (amenity_id) REFERENCES amenities(id) ON DELETE CASCADE
 );
 
+CREATE INDEX ix_place_amenity_amenity_id ON place_amenities (amenity_id);
+
 -- Insert Administrator User
 INSERT INTO users (id, first_name, last_name, email, password, is_admin)
 VALUES (
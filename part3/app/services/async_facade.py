@@ -0,0 +1,91 @@
+from app.models.user import User
+from app.models.amenity import Amenity
+from app.persistence.PlaceRepository import DEFAULT_PRICE_BUCKET
+from app.persistence.async_repository import (
+    AsyncSQLAlchemyRepository, AsyncPlaceRepository, AsyncReviewRepository,
+    make_async_engine, make_async_sessionmaker,
+)
+
+class AsyncHBnBFacade:
+    """Async read paths of HBnBFacade, served by the ASGI app without holding a thread."""
+
+    def __init__(self):
+        self.engine = None
+
+    def init_app(self, app):
+        """Create the async engine and repositories from the app config"""
+        self.engine = make_async_engine(app.config)
+        sessionmaker = make_async_sessionmaker(self.engine)
+        self.user_repo = AsyncSQLAlchemyRepository(User, sessionmaker)
+        self.place_repo = AsyncPlaceRepository(sessionmaker)
+        self.review_repo = AsyncReviewRepository(sessionmaker)
+        self.amenity_repo = AsyncSQLAlchemyRepository(Amenity, sessionmaker)
+
+    async def dispose(self):
+        """Close the async connection pool"""
+        if self.engine is not None:
+            await self.engine.dispose()
+
+    async def get_user_by_id(self, user_id):
+        """Retrieve user by ID"""
+        return await self.user_repo.get(user_id)
+
+    async def get_user_by_email(self, email):
+        """Retrieve user by email"""
+        return await self.user_repo.get_by_attribute("email", email)
+
+    async def get_place_by_id(self, place_id):
+        """Retrieve place details by ID"""
+        return await self.place_repo.get(place_id)
+
+    async def get_place_details(self, place_id):
+        """Retrieve a place with owner, amenities and reviews loaded in a fixed number of queries"""
+        return await self.place_repo.get_with_relations(place_id)
+
+    async def get_all_places(self, min_price=None, max_price=None, amenity_ids=None,
+                             sort="created_at", limit=None, cursor=None, with_relations=False, fields=None):
+        """Retrieve one page of places matching the filters, plus the next page cursor.
+
+        with_relations is True or the relationships to load, fields the place attributes to read (None: all)
+        """
+        return await self.place_repo.list_places(
+            min_price=min_price,
+            max_price=max_price,
+            amenity_ids=amenity_ids,
+            sort=sort,
+            limit=limit,
+            cursor=cursor,
+            with_relations=with_relations,
+            fields=fields,
+        )
+
+    async def get_place_facets(self, min_price=None, max_price=None, amenity_ids=None,
+                               bucket_width=DEFAULT_PRICE_BUCKET):
+        """Per-amenity counts and price histogram of the places matching the filters"""
+        return await self.place_repo.facets(min_price=min_price, max_price=max_price,
+                                            amenity_ids=amenity_ids, bucket_width=bucket_width)
+
+    async def search_places_in_bbox(self, min_lat, min_lng, max_lat, max_lng, limit=None):
+        """Retrieve places inside a bounding box"""
+        return await self.place_repo.search_bbox(min_lat, min_lng, max_lat, max_lng, limit=limit)
+
+    async def search_places_near(self, latitude, longitude, radius_km, limit=None):
+        """Retrieve (place, distance_km) pairs within a radius, nearest first"""
+        return await self.place_repo.search_radius(latitude, longitude, radius_km, limit=limit)
+
+    async def search_places_text(self, query, min_price=None, max_price=None, amenity_ids=None, limit=None):
+        """Retrieve (place, score) pairs matching the words of query in titles, descriptions or reviews"""
+        return await self.place_repo.search_text(query, min_price=min_price, max_price=max_price,
+                                                 amenity_ids=amenity_ids, limit=limit)
+
+    async def get_review_by_id(self, review_id):
+        """Retrieve a review by ID"""
+        return await self.review_repo.get(review_id)
+
+    async def get_review_by_user_and_place(self, user_id, place_id):
+        """Retrieve the review a user left on a place"""
+        return await self.review_repo.get_by_user_and_place(user_id, place_id)
+
+    async def get_amenity_by_id(self, amenity_id):
+        """Retrieve an amenity by ID"""
+        return await self.amenity_repo.get(amenity_id)
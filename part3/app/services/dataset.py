@@ -0,0 +1,315 @@
+"""Synthetic datasets for benchmarks and load tests (`flask hbnb generate`).
+
+Shapes follow real listings rather than uniform noise:
+
+* places cluster around cities, whose popularity is Zipf-distributed;
+* hosts are skewed (a few own many places) and prices are log-normal,
+  scaled per city;
+* reviews per place follow a Zipf law (most places have a handful, a few
+  have hundreds), ratings lean towards 4 and 5;
+* amenity popularity is Zipf-distributed (Wi-Fi everywhere, saunas rare).
+
+Generation is deterministic for a seed: every chunk of rows draws from its
+own ``Random(f"{seed}:{kind}:{chunk}")`` and ids are uuid5 of the row's
+index, so the output is the same whatever the number of worker processes.
+Chunks are generated in parallel and written in order, either straight into
+the database as bulk rows (DatabaseSink) or as NDJSON files in the format of
+`flask hbnb import` (NdjsonSink).
+"""
+import math
+import os
+import random
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import accumulate
+from sqlalchemy import insert, select
+from app.models.user import User
+from app.models.place import Place, place_amenity_association
+from app.models.review import Review
+from app.models.amenity import Amenity
+from app.persistence.PlaceRepository import RATING_COLUMNS
+from app.persistence.fulltext import create_index as rebuild_search_index
+from app.persistence.repository import db
+from app.utils.security import hash_password
+from app.utils.serialization import ResponseEncoder
+from app.utils.geo import encode_geohash
+
+# Password of every generated user (DatabaseSink stores one shared hash of it)
+DEFAULT_PASSWORD = "password"
+EMAIL = "user{seed}-{index}@example.com"  # Datasets of different seeds can share a database
+ID_NAMESPACE = uuid.UUID("6f1c2f7e-0d6b-4c1e-9a51-2a8d4e5b7c10")
+
+AMENITY_NAMES = (
+    "Wi-Fi", "Kitchen", "Heating", "Washer", "Air conditioning", "Free parking", "TV", "Workspace",
+    "Hair dryer", "Iron", "Dryer", "Crib", "Balcony", "Dishwasher", "Coffee maker", "Elevator",
+    "Pool", "Hot tub", "Gym", "EV charger", "Fireplace", "BBQ grill", "Garden", "Beach access",
+    "Sauna", "Piano", "Game console", "Pool table", "Ski-in/ski-out", "Lake access",
+)
+ADJECTIVES = ("Cozy", "Sunny", "Quiet", "Modern", "Charming", "Spacious", "Rustic", "Bright", "Stylish", "Historic")
+KINDS = ("studio", "loft", "apartment", "cottage", "villa", "cabin", "flat", "house", "bungalow", "room")
+FEATURES = ("a view of the old town", "a private terrace", "fast Wi-Fi", "a quiet courtyard", "a fireplace",
+            "walking distance to the beach", "easy transit access", "a fully equipped kitchen", "a large garden")
+REVIEW_PHRASES = ("Great host", "Very clean", "Perfect location", "Noisy at night", "Would stay again",
+                  "Exactly like the photos", "Comfortable bed", "Check-in was easy", "A bit small", "Lovely stay")
+FIRST_NAMES = ("Alice", "Bruno", "Chloé", "Dmitri", "Elena", "Farid", "Grace", "Hiro", "Inès", "Jonas", "Kofi",
+               "Lena", "Mateo", "Nadia", "Omar", "Priya", "Quentin", "Rosa", "Sven", "Tara", "Uma", "Victor")
+LAST_NAMES = ("Martin", "Bernard", "Dubois", "Silva", "Kowalski", "Nguyen", "Smith", "Müller", "Rossi", "Tanaka",
+              "Okafor", "Haddad", "Johansson", "García", "Novak", "Khan", "Moreau", "Petrov")
+SYLLABLES = ("ba", "ri", "lo", "ma", "ten", "vi", "sa", "no", "ka", "del", "mon", "ar", "es", "tor", "lin", "ve")
+# Share of each rating value 1..5
+RATING_WEIGHTS = (0.04, 0.06, 0.14, 0.34, 0.42)
+# Generated rows span this many days before the generation date
+HISTORY_DAYS = 3 * 365
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Size and shape of a generated dataset."""
+    users: int = 10_000
+    places: int = 20_000
+    amenities: int = 30
+    seed: int = 42
+    cities: int = 300
+    max_reviews_per_place: int = 500
+    review_skew: float = 1.3        # Zipf exponent of reviews per place
+    amenity_skew: float = 1.0       # Zipf exponent of amenity popularity
+    max_amenities_per_place: int = 12
+    chunk_size: int = 5_000
+    now: datetime = datetime(2025, 1, 1)
+
+
+def zipf_cum_weights(count, skew):
+    """Cumulative weights of ranks 0..count-1 with P(rank) proportional to 1 / (rank + 1) ** skew"""
+    return list(accumulate(1.0 / (rank + 1) ** skew for rank in range(count)))
+
+
+def user_id(spec, index):
+    return str(uuid.uuid5(ID_NAMESPACE, f"{spec.seed}:user:{index}"))
+
+
+def place_id(spec, index):
+    return str(uuid.uuid5(ID_NAMESPACE, f"{spec.seed}:place:{index}"))
+
+
+def amenity_names(spec):
+    """Amenity names, most popular first"""
+    names = list(AMENITY_NAMES[:spec.amenities])
+    names += [f"{AMENITY_NAMES[i % len(AMENITY_NAMES)]} {i // len(AMENITY_NAMES) + 1}"
+              for i in range(len(names), spec.amenities)]
+    return names
+
+
+def cities(spec):
+    """(name, latitude, longitude, spread_km, price_factor) per city, most popular first"""
+    rng = random.Random(f"{spec.seed}:cities")
+    result = []
+    for _ in range(spec.cities):
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+        result.append((name, rng.uniform(-45.0, 62.0), rng.uniform(-170.0, 175.0),
+                       rng.uniform(3.0, 30.0), rng.lognormvariate(0.0, 0.35)))
+    return result
+
+
+def _timestamp(rng, spec):
+    return spec.now - timedelta(seconds=rng.uniform(0, HISTORY_DAYS * 86400))
+
+
+def generate_users(spec, chunk):
+    """User records of one chunk: (index, record) pairs"""
+    rng = random.Random(f"{spec.seed}:users:{chunk}")
+    start = chunk * spec.chunk_size
+    rows = []
+    for index in range(start, min(start + spec.chunk_size, spec.users)):
+        created = _timestamp(rng, spec)
+        rows.append({
+            "id": user_id(spec, index),
+            "first_name": rng.choice(FIRST_NAMES),
+            "last_name": rng.choice(LAST_NAMES),
+            "email": EMAIL.format(seed=spec.seed, index=index),
+            "is_admin": False,
+            "created_at": created,
+            "updated_at": created,
+        })
+    return rows
+
+
+def generate_places(spec, chunk, city_list, amenity_ids):
+    """Places of one chunk with their amenity links and reviews.
+
+    Returns (places, links, reviews); places carry their rating aggregates.
+    """
+    rng = random.Random(f"{spec.seed}:places:{chunk}")
+    city_weights = zipf_cum_weights(len(city_list), 1.0)
+    amenity_weights = zipf_cum_weights(len(amenity_ids), spec.amenity_skew)
+    review_weights = zipf_cum_weights(spec.max_reviews_per_place + 1, spec.review_skew)
+    review_counts = range(spec.max_reviews_per_place + 1)
+    places, links, reviews = [], [], []
+    start = chunk * spec.chunk_size
+    for index in range(start, min(start + spec.chunk_size, spec.places)):
+        city, lat0, lng0, spread_km, price_factor = rng.choices(city_list, cum_weights=city_weights)[0]
+        latitude = max(-90.0, min(90.0, lat0 + rng.gauss(0, spread_km / 111.0)))
+        longitude = lng0 + rng.gauss(0, spread_km / (111.0 * max(math.cos(math.radians(latitude)), 0.1)))
+        longitude = (longitude + 180.0) % 360.0 - 180.0
+        # Hosts are skewed: low user indexes own many places
+        owner = int(spec.users * rng.random() ** 3)
+        created = _timestamp(rng, spec)
+        kind = rng.choice(KINDS)
+        place = {
+            "id": place_id(spec, index),
+            "title": f"{rng.choice(ADJECTIVES)} {kind} in {city}",
+            "description": f"A {kind} in {city} with {rng.choice(FEATURES)} and {rng.choice(FEATURES)}.",
+            "price": round(max(10.0, rng.lognormvariate(4.3, 0.55) * price_factor), 2),
+            "latitude": latitude,
+            "longitude": longitude,
+            "geohash": encode_geohash(latitude, longitude),
+            "owner_id": user_id(spec, owner),
+            "owner_index": owner,
+            "amenities": [],
+            "created_at": created,
+            "updated_at": created,
+            **dict.fromkeys(RATING_COLUMNS, 0),
+        }
+        wanted = min(rng.randint(0, spec.max_amenities_per_place), len(amenity_ids))
+        chosen = set()
+        while len(chosen) < wanted:
+            chosen.add(rng.choices(amenity_ids, cum_weights=amenity_weights)[0])
+        place["amenities"] = sorted(chosen)
+        links.extend({"place_id": place["id"], "amenity_id": amenity_id} for amenity_id in place["amenities"])
+
+        count = min(rng.choices(review_counts, cum_weights=review_weights)[0], spec.users - 1)
+        for reviewer in rng.sample(range(spec.users), count + 1):
+            if reviewer == owner or place["review_count"] == count:
+                continue
+            rating = rng.choices(range(1, 6), weights=RATING_WEIGHTS)[0]
+            reviewed = created + (spec.now - created) * rng.random()
+            reviews.append({
+                "text": f"{rng.choice(REVIEW_PHRASES)}. {rng.choice(REVIEW_PHRASES)}.",
+                "rating": rating,
+                "place_id": place["id"],
+                "user_id": user_id(spec, reviewer),
+                "created_at": reviewed,
+                "updated_at": reviewed,
+            })
+            place["review_count"] += 1
+            place["rating_sum"] += rating
+            place[f"rating_count_{rating}"] += 1
+        places.append(place)
+    return places, links, reviews
+
+
+def _chunks(total, spec):
+    return range(math.ceil(total / spec.chunk_size)) if total else range(0)
+
+
+def _ordered(pool, fn, tasks, ahead):
+    """pool.map that keeps at most `ahead` chunks in flight, so a slow sink bounds memory"""
+    pending = []
+    for task in tasks:
+        pending.append(pool.submit(fn, *task))
+        if len(pending) >= ahead:
+            yield pending.pop(0).result()
+    for future in pending:
+        yield future.result()
+
+
+def generate(spec, sink, workers=None, progress=None):
+    """Generate the dataset into sink, returning {kind: rows written}"""
+    workers = workers or os.cpu_count() or 1
+    counts = dict.fromkeys(("users", "amenities", "places", "place_amenity", "reviews"), 0)
+    city_list = cities(spec)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for rows in _ordered(pool, generate_users, ((spec, chunk) for chunk in _chunks(spec.users, spec)),
+                             workers * 2):
+            sink.write_users(rows)
+            counts["users"] += len(rows)
+            if progress:
+                progress("users", counts["users"], spec.users)
+        amenity_ids = sink.write_amenities(amenity_names(spec))
+        counts["amenities"] = len(amenity_ids)
+        tasks = ((spec, chunk, city_list, amenity_ids) for chunk in _chunks(spec.places, spec))
+        for places, links, reviews in _ordered(pool, generate_places, tasks, workers * 2):
+            sink.write_places(places, links, reviews)
+            counts["places"] += len(places)
+            counts["place_amenity"] += len(links)
+            counts["reviews"] += len(reviews)
+            if progress:
+                progress("places", counts["places"], spec.places)
+    sink.close()
+    return counts
+
+
+class DatabaseSink:
+    """Bulk-inserts generated rows, one transaction per chunk (call inside an app context)."""
+
+    def __init__(self, password=DEFAULT_PASSWORD):
+        # bcrypt once: every generated user shares the hash
+        self.password_hash = hash_password(password)
+
+    def write_users(self, rows):
+        for row in rows:
+            row["password"] = self.password_hash
+        db.session.execute(insert(User), rows)
+        db.session.commit()
+
+    def write_amenities(self, names):
+        """Insert the amenities missing from the database, returning the ids of all of them"""
+        existing = dict(db.session.execute(select(Amenity.name, Amenity.id).where(Amenity.name.in_(names))).all())
+        missing = [{"name": name} for name in names if name not in existing]
+        if missing:
+            db.session.execute(insert(Amenity), missing)
+            db.session.commit()
+            existing = dict(db.session.execute(select(Amenity.name, Amenity.id).where(Amenity.name.in_(names))).all())
+        return [existing[name] for name in names]
+
+    def write_places(self, places, links, reviews):
+        db.session.execute(insert(Place), [
+            {key: value for key, value in place.items() if key not in ("amenities", "owner_index")}
+            for place in places
+        ])
+        if links:
+            db.session.execute(place_amenity_association.insert(), links)
+        if reviews:
+            db.session.execute(insert(Review), reviews)
+        db.session.commit()
+
+    def close(self):
+        """Index the new places and reviews for full-text search"""
+        with db.engine.begin() as connection:
+            rebuild_search_index(connection)
+
+
+class NdjsonSink:
+    """Writes users/amenities/places/reviews.ndjson for `flask hbnb import`."""
+
+    def __init__(self, directory, password=DEFAULT_PASSWORD):
+        os.makedirs(directory, exist_ok=True)
+        self.password = password
+        self.encoder = ResponseEncoder()  # orjson when installed: encoding is most of the sink's time
+        self.files = {kind: open(os.path.join(directory, f"{kind}.ndjson"), "wb")
+                      for kind in ("users", "amenities", "places", "reviews")}
+
+    def _write(self, kind, records):
+        self.files[kind].write(b"".join(self.encoder.dumps(record) + b"\n" for record in records))
+
+    def write_users(self, rows):
+        self._write("users", ({"id": row["id"], "first_name": row["first_name"], "last_name": row["last_name"],
+                               "email": row["email"], "password": self.password, "is_admin": row["is_admin"]}
+                              for row in rows))
+
+    def write_amenities(self, names):
+        ids = [f"amenity-{index}" for index in range(len(names))]
+        self._write("amenities", ({"id": amenity_id, "name": name} for amenity_id, name in zip(ids, names)))
+        return ids
+
+    def write_places(self, places, links, reviews):
+        self._write("places", ({key: place[key] for key in ("id", "title", "description", "price", "latitude",
+                                                             "longitude", "owner_id", "amenities")}
+                               for place in places))
+        self._write("reviews", ({key: review[key] for key in ("text", "rating", "user_id", "place_id")}
+                                for review in reviews))
+
+    def close(self):
+        for handle in self.files.values():
+            handle.close()
@@ -1,29 +1,113 @@
+import logging
+from sqlalchemy import inspect
 from app.models.user import User
 from app.models.place import Place
 from app.models.review import Review
 from app.models.amenity import Amenity
-from app.persistence.repository import SQLAlchemyRepository  
-from app.utils.security import hash_password
-from app.persistence import UserRepository 
+from app.persistence.repository import SQLAlchemyRepository, db
+from app.persistence.UserRepository import UserRepository
+from app.persistence.PlaceRepository import PlaceRepository, DEFAULT_PRICE_BUCKET
+from app.persistence.ReviewRepository import ReviewRepository
+from app.persistence.routing import read_only, reading
+from app.utils.http_cache import CollectionVersions, bumps
+from app.persistence.cache import CachedRepository, RedisCache, make_cache_backend, DEFAULT_CACHE_TTLS
+from app.persistence.versions import DatabaseVersionStore
+from app.services.jobs import JobQueue, job_handler
+from app.persistence.memory import (
+    InMemoryUserRepository, InMemoryPlaceRepository, InMemoryReviewRepository, InMemoryAmenityRepository,
+    link_repositories,
+)
+
+# Collections served by the export endpoints, with the repository holding them
+EXPORTS = {
+    "places": "place_repo",
+    "reviews": "review_repo",
+    "amenities": "amenity_repo",
+}
 
 class HBnBFacade:
     def __init__(self):
         """Initialize repositories for each entity"""
-        self.user_repo = UserRepository()  
-        self.place_repo = SQLAlchemyRepository(Place)
-        self.review_repo = SQLAlchemyRepository(Review)
-        self.amenity_repo = SQLAlchemyRepository(Amenity)
+        self.cache = None
+        self.versions = CollectionVersions()
+        self.use_backend("sqlalchemy")
+        self.jobs = JobQueue(self)
+
+    def use_backend(self, backend):
+        """Create fresh repositories for the "sqlalchemy" or "memory" backend"""
+        if backend == "sqlalchemy":
+            self.user_repo = UserRepository()
+            self.place_repo = PlaceRepository()
+            self.review_repo = ReviewRepository()
+            self.amenity_repo = SQLAlchemyRepository(Amenity)
+        elif backend == "memory":
+            self.user_repo = InMemoryUserRepository()
+            self.place_repo = InMemoryPlaceRepository()
+            self.review_repo = InMemoryReviewRepository()
+            self.amenity_repo = InMemoryAmenityRepository()
+            link_repositories(self.user_repo, self.place_repo, self.review_repo)
+        else:
+            raise ValueError(f"Unknown PERSISTENCE_BACKEND '{backend}'.")
+        self.backend = backend
+
+    def init_app(self, app):
+        """Select the persistence backend and repository cache from the app config"""
+        self.use_backend(app.config.get("PERSISTENCE_BACKEND", "sqlalchemy"))
+        # Follow-up work of writes runs inline or in `flask hbnb worker` (JOB_QUEUE_BACKEND)
+        self.jobs.init_app(app)
+        # The in-memory backend is already as fast as the cache would be
+        self.cache = make_cache_backend(app.config) if self.backend == "sqlalchemy" else None
+        # Collection version stamps must be the same in every process: Redis when it is the cache,
+        # else a table of the primary database; in-memory data only exists in this process anyway
+        if self.backend == "memory":
+            self.versions = CollectionVersions()
+        elif isinstance(self.cache, RedisCache):
+            self.versions = CollectionVersions(self.cache)
+        else:
+            self.versions = CollectionVersions(DatabaseVersionStore(db.session))
+        if self.cache is None:
+            return
+        ttls = dict(DEFAULT_CACHE_TTLS, **app.config.get("CACHE_TTLS", {}))
+        for name in ("user_repo", "place_repo", "review_repo", "amenity_repo"):
+            repo = getattr(self, name)
+            ttl = ttls.get(repo.model.__name__, 0)
+            if ttl:
+                setattr(self, name, CachedRepository(repo, self.cache, ttl))
+
+    def export_rows(self, collection, updated_since=None):
+        """Column names and a lazy iterator over every row of an exported collection.
+
+        Rows come oldest update first; pass the last row's updated_at back as
+        updated_since to pull only what changed (rows at that instant repeat).
+        """
+        repo = getattr(self, EXPORTS[collection])
+        columns = [column.key for column in repo.model.__table__.columns]
+        return columns, self._stream_rows(repo, columns, updated_since)
+
+    @staticmethod
+    def _stream_rows(repo, columns, updated_since):
+        with reading():  # A replica serves the export for as long as it streams
+            yield from repo.stream_rows(columns, updated_since)
+
+    def cache_stats(self):
+        """Hit/miss/eviction counters of every cached repository"""
+        return {
+            repo.namespace: repo.stats()
+            for repo in (self.user_repo, self.place_repo, self.review_repo, self.amenity_repo)
+            if isinstance(repo, CachedRepository)
+        }
 
     
+    @bumps("users")
     def create_user(self, user_data):
         """Create a new user, hash password, and store in the database"""
         if self.user_repo.is_email_registered(user_data["email"]):
             return {"error": "Email already registered"}, 400  
         
-        user = User(**user_data)
-        user.password = hash_password(user_data['password'])  
+        user = User(**user_data)  # Hashes the password
         return self.user_repo.add(user)
 
+    @read_only
     def get_user_by_id(self, user_id):
         """Retrieve user by ID"""
         return self.user_repo.get(user_id)
@@ -32,64 +116,330 @@ class HBnBFacade:
         """Retrieve user by email"""
         return self.user_repo.get_user_by_email(email)
 
+    @bumps("users", "places")
     def update_user(self, user_id, user_data):
         """Update user details (excluding password & email for non-admins)"""
         return self.user_repo.update(user_id, user_data)
 
+    @bumps("users", "places", "reviews")
     def delete_user(self, user_id):
-        """Delete a user"""
-        return self.user_repo.delete(user_id)
+        """Delete a user, with their places and reviews (cascade)"""
+        user = self.user_repo.get(user_id)
+        owned = list(user.places) if user else []
+        reviews = list(user.reviews) if user else []
+        reviewed = [review.place_id for review in reviews]
+        # The places they reviewed stay, without these ratings (committed with the delete)
+        for review in reviews:
+            place = self.place_repo.get(review.place_id)
+            if place:
+                place.record_rating(review.rating, -1)
+        # Reviews the cascade removes along with the places
+        reviews += [review for place in owned for review in place.reviews]
+        result = self.user_repo.delete(user_id)
+        self._invalidate_cascade(place_ids=[place.id for place in owned] + reviewed,
+                                 review_ids=[review.id for review in reviews])
+        # Their own places lose their search documents, the ones they reviewed lose their review text
+        self.jobs.enqueue("refresh_search", place_ids=[place.id for place in owned] + reviewed)
+        return result
+
+    def _invalidate_cascade(self, place_ids=(), review_ids=()):
+        """Drop the cached copies of entities a cascading write deleted or changed"""
+        for place_id in place_ids:
+            self.place_repo.invalidate(place_id)
+        for review_id in review_ids:
+            self.review_repo.invalidate(review_id)
 
     
+    @bumps("places")
     def create_place(self, place_data):
         """Create a new place"""
         place = Place(**place_data)
-        return self.place_repo.add(place)
+        result = self.place_repo.add(place)
+        self.jobs.enqueue("refresh_search", place_ids=[place.id])
+        return result
+
+    @bumps("places")
+    def create_places(self, places_data, owner_id):
+        """Validate and create many places in batched transactions.
 
+        Returns the created place IDs and a list of per-item errors.
+        """
+        requested_ids = {a_id for data in places_data for a_id in data.get("amenities") or []}
+        amenities = {amenity.id: amenity for amenity in self.amenity_repo.get_many(requested_ids)}
+        places, errors = [], []
+        for index, data in enumerate(places_data):
+            try:
+                data = dict(data, owner_id=owner_id)
+                amenity_ids = data.pop("amenities", None) or []
+                missing = [a_id for a_id in amenity_ids if a_id not in amenities]
+                if missing:
+                    raise ValueError(f"Unknown amenity ID's: {', '.join(missing)}")
+                place = Place(**data)
+                place.amenities.extend(amenities[a_id] for a_id in amenity_ids)
+            except (TypeError, ValueError) as e:
+                errors.append({"index": index, "error": str(e)})
+                continue
+            places.append(place)
+        self.place_repo.add_many(places)
+        place_ids = [place.id for place in places]
+        self.jobs.enqueue("refresh_search", place_ids=place_ids)
+        return place_ids, errors
+
+    @read_only
     def get_place_by_id(self, place_id):
         """Retrieve place details by ID"""
         return self.place_repo.get(place_id)
 
+    @read_only
+    def get_place_details(self, place_id):
+        """Retrieve a place with owner, amenities and reviews loaded in a fixed number of queries"""
+        return self.place_repo.get_with_relations(place_id)
+
+    @read_only
+    def get_all_places(self, min_price=None, max_price=None, amenity_ids=None,
+                       sort="created_at", limit=None, cursor=None, with_relations=False, fields=None):
+        """Retrieve one page of places matching the filters, plus the next page cursor.
+
+        with_relations is True or the relationships to load, fields the place attributes to read (None: all)
+        """
+        return self.place_repo.list_places(
+            min_price=min_price,
+            max_price=max_price,
+            amenity_ids=amenity_ids,
+            sort=sort,
+            limit=limit,
+            cursor=cursor,
+            with_relations=with_relations,
+            fields=fields,
+        )
+
+    @read_only
+    def get_place_facets(self, min_price=None, max_price=None, amenity_ids=None, bucket_width=DEFAULT_PRICE_BUCKET):
+        """Per-amenity counts and price histogram of the places matching the filters"""
+        return self.place_repo.facets(min_price=min_price, max_price=max_price,
+                                      amenity_ids=amenity_ids, bucket_width=bucket_width)
+
+    @read_only
+    def search_places_in_bbox(self, min_lat, min_lng, max_lat, max_lng, limit=None):
+        """Retrieve places inside a bounding box"""
+        return self.place_repo.search_bbox(min_lat, min_lng, max_lat, max_lng, limit=limit)
+
+    @read_only
+    def search_places_near(self, latitude, longitude, radius_km, limit=None):
+        """Retrieve (place, distance_km) pairs within a radius, nearest first"""
+        return self.place_repo.search_radius(latitude, longitude, radius_km, limit=limit)
+
+    @read_only
+    def search_places_text(self, query, min_price=None, max_price=None, amenity_ids=None, limit=None):
+        """Retrieve (place, score) pairs matching the words of query in titles, descriptions or reviews"""
+        return self.place_repo.search_text(query, min_price=min_price, max_price=max_price,
+                                           amenity_ids=amenity_ids, limit=limit)
+
+    @bumps("places")
     def update_place(self, place_id, place_data):
         """Update place details"""
-        return self.place_repo.update(place_id, place_data)
+        result = self.place_repo.update(place_id, place_data)
+        self.jobs.enqueue("refresh_search", place_ids=[place_id])
+        return result
 
+    @bumps("places", "reviews")
     def delete_place(self, place_id):
-        """Delete a place"""
-        return self.place_repo.delete(place_id)
+        """Delete a place, with its reviews (cascade)"""
+        place = self.place_repo.get(place_id)
+        review_ids = [review.id for review in place.reviews] if place else []
+        result = self.place_repo.delete(place_id)
+        self._invalidate_cascade(review_ids=review_ids)
+        self.jobs.enqueue("refresh_search", place_ids=[place_id])
+        return result
 
     
+    @bumps("reviews", "places")
     def create_review(self, review_data):
-        """Create a new review"""
+        """Create a new review and count it in the place's rating aggregates"""
         review = Review(**review_data)
-        return self.review_repo.add(review)
+        place = self.place_repo.get(review.place_id)
+        if place:
+            place.record_rating(review.rating, 1)
+        # The aggregate update is committed together with the review
+        result = self.review_repo.add(review)
+        self.place_repo.invalidate(review_data["place_id"])
+        # Indexing and notifying the owner happen in the background (JOB_QUEUE_BACKEND)
+        self.jobs.enqueue("refresh_search", place_ids=[review_data["place_id"]])
+        self.enqueue_review_notifications([review])
+        return result
+
+    @bumps("reviews", "places")
+    def create_reviews(self, reviews_data, user_id):
+        """Validate and create many reviews by one user in batched transactions.
 
+        Returns the created review IDs and a list of per-item errors.
+        """
+        place_ids = {data.get("place_id") for data in reviews_data}
+        places = {place.id: place for place in self.place_repo.get_many(place_ids)}
+        reviewed = self.review_repo.reviewed_place_ids(user_id, places)
+        reviews, errors, rating_changes = [], [], {}
+        for index, data in enumerate(reviews_data):
+            try:
+                place = places.get(data.get("place_id"))
+                if not place:
+                    raise ValueError("Place not found.")
+                if place.owner_id == user_id:
+                    raise ValueError("You cannot review your own place.")
+                if place.id in reviewed:
+                    raise ValueError("You have already reviewed this place.")
+                review = Review(**dict(data, user_id=user_id))
+            except (TypeError, ValueError) as e:
+                errors.append({"index": index, "error": str(e)})
+                continue
+            reviewed.add(place.id)
+            changes = rating_changes.setdefault(place.id, {})
+            changes[review.rating] = changes.get(review.rating, 0) + 1
+            reviews.append(review)
+        # One aggregate update per place, committed with the first batch
+        for place_id, changes in rating_changes.items():
+            places[place_id].apply_rating_changes(changes)
+        self.review_repo.add_many(reviews)
+        for place_id in rating_changes:
+            self.place_repo.invalidate(place_id)
+        self.jobs.enqueue("refresh_search", place_ids=list(rating_changes))
+        self.enqueue_review_notifications(reviews)
+        return [review.id for review in reviews], errors
+
+    def enqueue_review_notifications(self, reviews):
+        """Queue one owner notification per new review; the key stops a repeat from notifying twice"""
+        for review in reviews:
+            identity = inspect(review).identity  # Read without reloading the committed review
+            review_id = identity[0] if identity else review.id
+            self.jobs.enqueue("notify_place_owner", key=f"review-notification:{review_id}", review_id=review_id)
+
+    @read_only
+    def get_review_by_user_and_place(self, user_id, place_id):
+        """Retrieve the review a user left on a place"""
+        return self.review_repo.get_by_user_and_place(user_id, place_id)
+
+    @read_only
     def get_review_by_id(self, review_id):
         """Retrieve a review by ID"""
         return self.review_repo.get(review_id)
 
+    @bumps("reviews", "places")
     def update_review(self, review_id, review_data):
-        """Update a review"""
-        return self.review_repo.update(review_id, review_data)
+        """Update a review and move its rating in the place's aggregates"""
+        review = self.review_repo.get(review_id)
+        if review and "rating" in review_data and review_data["rating"] != review.rating:
+            new_rating = review.validate_rating("rating", review_data["rating"])
+            place = self.place_repo.get(review.place_id)
+            if place:
+                place.apply_rating_changes({review.rating: -1, new_rating: 1})
+        result = self.review_repo.update(review_id, review_data)
+        if review:
+            self.place_repo.invalidate(review.place_id)
+            self.jobs.enqueue("refresh_search", place_ids=[review.place_id])
+        return result
 
+    @bumps("reviews", "places")
     def delete_review(self, review_id):
-        """Delete a review"""
-        return self.review_repo.delete(review_id)
+        """Delete a review and remove it from the place's rating aggregates"""
+        review = self.review_repo.get(review_id)
+        if review:
+            place_id = review.place_id
+            place = self.place_repo.get(place_id)
+            if place:
+                place.record_rating(review.rating, -1)
+        result = self.review_repo.delete(review_id)
+        if review:
+            self.place_repo.invalidate(place_id)
+            self.jobs.enqueue("refresh_search", place_ids=[place_id])
+        return result
+
+    @bumps("places")
+    def reconcile_rating_aggregates(self, fix=True):
+        """Recompute every place's rating aggregates from its reviews and report drift"""
+        return self.place_repo.reconcile_ratings(fix=fix)
 
     
+    @bumps("amenities")
     def create_amenity(self, amenity_data):
         """Create a new amenity"""
         amenity = Amenity(**amenity_data)
         return self.amenity_repo.add(amenity)
 
+    @bumps("amenities")
+    def create_amenities(self, amenities_data):
+        """Validate and create many amenities in batched transactions.
+
+        Returns the created amenity IDs and a list of per-item errors.
+        """
+        names = [data.get("name") for data in amenities_data]
+        taken = {amenity.name for amenity in self.amenity_repo.get_many(names, attr_name="name")}
+        amenities, errors = [], []
+        for index, data in enumerate(amenities_data):
+            try:
+                if data.get("name") in taken:
+                    raise ValueError(f"Amenity '{data['name']}' already exists.")
+                amenity = Amenity(**data)
+            except (TypeError, ValueError) as e:
+                errors.append({"index": index, "error": str(e)})
+                continue
+            taken.add(amenity.name)
+            amenities.append(amenity)
+        self.amenity_repo.add_many(amenities)
+        return [amenity.id for amenity in amenities], errors
+
+    @read_only
     def get_amenity_by_id(self, amenity_id):
         """Retrieve an amenity by ID"""
         return self.amenity_repo.get(amenity_id)
 
+    @read_only
+    def get_all_amenities(self):
+        """Retrieve all amenities"""
+        return self.amenity_repo.get_all()
+
+    @bumps("amenities", "places")
     def update_amenity(self, amenity_id, amenity_data):
         """Update an amenity"""
-        return self.amenity_repo.update(amenity_id, amenity_data)
+        result = self.amenity_repo.update(amenity_id, amenity_data)
+        self._invalidate_cascade(place_ids=self._amenity_place_ids(result))
+        return result
 
+    @bumps("amenities", "places")
     def delete_amenity(self, amenity_id):
-        """Delete an amenity"""
-        return self.amenity_repo.delete(amenity_id)
\ No newline at end of file
+        """Delete an amenity (and its links to places)"""
+        place_ids = self._amenity_place_ids(self.amenity_repo.get(amenity_id))
+        result = self.amenity_repo.delete(amenity_id)
+        self._invalidate_cascade(place_ids=place_ids)
+        return result
+
+    @staticmethod
+    def _amenity_place_ids(amenity):
+        """Places offering an amenity: their cached copies may embed it"""
+        return [place.id for place in amenity.places] if amenity is not None else []
+
+
+# Background job handlers (app/services/jobs.py): they may run more than once
+
+notifications = logging.getLogger("hbnb.notifications")
+
+
+@job_handler("refresh_search")
+def refresh_search(facade, place_ids):
+    """Rebuild the full-text documents of places after a write"""
+    facade.place_repo.refresh_search(place_ids)
+
+
+def send_owner_notification(email, message):
+    """Deliver a notification to a place owner (logged; a mail or push sender replaces this)"""
+    notifications.info("To %s: %s", email, message)
+
+
+@job_handler("notify_place_owner")
+def notify_place_owner(facade, review_id):
+    """Tell a place's owner about a new review"""
+    review = facade.review_repo.get(review_id)
+    if review is None:
+        return  # Deleted before the job ran
+    place = facade.place_repo.get(review.place_id)
+    owner = facade.user_repo.get(place.owner_id) if place else None
+    if owner is not None:
+        send_owner_notification(owner.email, f"New {review.rating}-star review on '{place.title}'")
@@ -0,0 +1,309 @@
+"""Bulk import of partner inventories (`flask hbnb import`).
+
+Files are streamed record by record (CSV or NDJSON) in dependency order:
+users, amenities, places, reviews. Every record goes through the model
+constructors, so the ``@validates`` rules apply exactly as they do for the
+API. Records carry the partner's own ids; references between files
+(``owner_id``, ``amenities``, ``user_id``, ``place_id``) are resolved
+through the job's id map, or taken as ids of rows already in the database.
+
+Rows are inserted ``batch_size`` at a time, one transaction per batch. The
+transaction also stores the job's checkpoint and id map
+(app/persistence/import_state.py), so a job that fails half way resumes
+after its last committed batch when run again with the same name.
+"""
+import csv
+import json
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from sqlalchemy import inspect
+from sqlalchemy.exc import IntegrityError
+from app.models.user import User
+from app.models.place import Place, place_amenity_association
+from app.models.review import Review
+from app.models.amenity import Amenity
+from app.persistence.repository import db
+from app.persistence.import_state import load_checkpoint, load_id_map, save_progress
+from app.persistence.fulltext import refresh_documents
+from app.utils.security import hasher
+
+IMPORT_ORDER = ("users", "amenities", "places", "reviews")
+DEFAULT_IMPORT_BATCH_SIZE = 1000
+MODELS = {"users": User, "amenities": Amenity, "places": Place, "reviews": Review}
+# Kinds other files refer to, whose ids are kept in the id map
+REFERENCED = ("users", "amenities", "places")
+# Errors kept in memory for the summary; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".ndjson", ".jsonl", ".json"):
+        return "ndjson"
+    raise ValueError(f"Cannot tell the format of '{path}', use .csv or .ndjson.")
+
+
+def read_records(path, fmt=None):
+    """Yield one dict per CSV row or NDJSON line, without loading the file"""
+    fmt = fmt or detect_format(path)
+    with open(path, newline="", encoding="utf-8") as source:
+        if fmt == "csv":
+            yield from csv.DictReader(source)
+        else:
+            for line in source:
+                if line.strip():
+                    yield json.loads(line)
+
+
+# CSV gives strings; NDJSON may already have the right types
+def _float(value):
+    return float(value) if value not in (None, "") else value
+
+
+def _int(value):
+    return int(value) if value not in (None, "") else value
+
+
+def _bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes")
+    return bool(value)
+
+
+def _list(value):
+    if value in (None, ""):
+        return []
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(";") if item.strip()]
+    return [str(item) for item in value]
+
+
+@dataclass
+class ImportStats:
+    kind: str
+    read: int = 0
+    resumed: int = 0  # Records skipped because an earlier run committed them
+    imported: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+    errors: list = field(default_factory=list)
+
+    @property
+    def rows_per_second(self):
+        return self.imported / self.seconds if self.seconds else 0.0
+
+    def fail(self, line, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+
+class Importer:
+    """Imports one job's files; see the module docstring."""
+
+    def __init__(self, job, batch_size=DEFAULT_IMPORT_BATCH_SIZE):
+        self.job = job
+        self.batch_size = batch_size
+        connection = db.session.connection()
+        self.done = load_checkpoint(connection, job)
+        self.id_map = load_id_map(connection, job, REFERENCED)
+        db.session.commit()
+
+    def run(self, sources):
+        """Import {kind: path} in dependency order, returning one ImportStats per kind"""
+        unknown = set(sources) - set(IMPORT_ORDER)
+        if unknown:
+            raise ValueError(f"Unknown import kinds: {', '.join(sorted(unknown))}")
+        return [self.import_file(kind, sources[kind]) for kind in IMPORT_ORDER if sources.get(kind)]
+
+    def import_file(self, kind, path, fmt=None):
+        stats = ImportStats(kind)
+        started = time.perf_counter()
+        resume_at = self.done.get(kind, 0)
+        batch = []
+        for line, record in enumerate(read_records(path, fmt), start=1):
+            stats.read += 1
+            if line <= resume_at:
+                stats.resumed += 1
+                continue
+            batch.append((line, record))
+            if len(batch) >= self.batch_size:
+                self._import_batch(kind, batch, stats)
+                batch = []
+        if batch:
+            self._import_batch(kind, batch, stats)
+        stats.seconds = time.perf_counter() - started
+        return stats
+
+    # References
+
+    def _resolve(self, kind, external_id, existing):
+        """Database id for a partner id of `kind`, or None"""
+        if external_id in (None, ""):
+            return None
+        external_id = str(external_id)
+        return self.id_map[kind].get(external_id) or (external_id if external_id in existing[kind] else None)
+
+    def _existing_ids(self, kind, batch):
+        """Referenced ids missing from the id map that are rows already in the database"""
+        wanted = defaultdict(set)
+        for _, record in batch:
+            for ref_kind, value in self._references(kind, record):
+                if value not in self.id_map[ref_kind]:
+                    wanted[ref_kind].add(value)
+        existing = defaultdict(set)
+        for ref_kind, values in wanted.items():
+            model = MODELS[ref_kind]
+            rows = db.session.query(model.id).filter(model.id.in_(list(values)))
+            existing[ref_kind] = {str(row_id) for row_id, in rows}
+        return existing
+
+    @staticmethod
+    def _references(kind, record):
+        if kind == "places":
+            yield "users", str(record.get("owner_id", ""))
+            for amenity_id in _list(record.get("amenities")):
+                yield "amenities", amenity_id
+        elif kind == "reviews":
+            yield "users", str(record.get("user_id", ""))
+            yield "places", str(record.get("place_id", ""))
+
+    # Building model objects (constructors run the @validates rules)
+
+    def _build(self, kind, record, existing):
+        """(object, amenity ids to link) for one record; raises ValueError when invalid"""
+        if kind == "users":
+            return User(first_name=record["first_name"], last_name=record["last_name"], email=record["email"],
+                        password=record["password"], is_admin=_bool(record.get("is_admin", False))), []
+        if kind == "amenities":
+            return Amenity(name=record["name"]), []
+        if kind == "places":
+            owner_id = self._resolve("users", record.get("owner_id"), existing)
+            if owner_id is None:
+                raise ValueError(f"Unknown owner '{record.get('owner_id')}'.")
+            amenity_ids = []
+            for external_id in _list(record.get("amenities")):
+                amenity_id = self._resolve("amenities", external_id, existing)
+                if amenity_id is None:
+                    raise ValueError(f"Unknown amenity '{external_id}'.")
+                amenity_ids.append(amenity_id)
+            place = Place(title=record["title"], description=record.get("description"),
+                          price=_float(record["price"]), latitude=_float(record["latitude"]),
+                          longitude=_float(record["longitude"]), owner_id=owner_id)
+            return place, amenity_ids
+        user_id = self._resolve("users", record.get("user_id"), existing)
+        place_id = self._resolve("places", record.get("place_id"), existing)
+        if user_id is None or place_id is None:
+            raise ValueError(f"Unknown user '{record.get('user_id')}' or place '{record.get('place_id')}'.")
+        return Review(text=record["text"], rating=_int(record["rating"]), place_id=place_id, user_id=user_id), []
+
+    def _build_all(self, kind, batch, existing, stats):
+        def build(item):
+            line, record = item
+            try:
+                return line, record, *self._build(kind, record, existing), None
+            except (KeyError, TypeError, ValueError) as e:
+                message = f"Missing field {e}" if isinstance(e, KeyError) else str(e)
+                return line, record, None, None, message
+
+        if kind == "users":
+            # bcrypt releases the GIL: hash the batch on the hasher's worker count
+            with ThreadPoolExecutor(max_workers=hasher.max_workers) as pool:
+                results = list(pool.map(build, batch))
+        else:
+            results = [build(item) for item in batch]
+        built = []
+        for line, record, obj, links, error in results:
+            if error:
+                stats.fail(line, error)
+            else:
+                built.append((line, record, obj, links))
+        return built
+
+    # Writing
+
+    def _drop_duplicate_ids(self, kind, batch, stats):
+        """Records reusing a partner id already imported by this job are errors"""
+        seen, unique = set(), []
+        for line, record in batch:
+            external_id = record.get("id")
+            if external_id not in (None, ""):
+                external_id = str(external_id)
+                if external_id in seen or external_id in self.id_map[kind]:
+                    stats.fail(line, f"Duplicate id '{external_id}'.")
+                    continue
+                seen.add(external_id)
+            unique.append((line, record))
+        return unique
+
+    def _import_batch(self, kind, batch, stats):
+        last_line = batch[-1][0]
+        if kind in REFERENCED:
+            batch = self._drop_duplicate_ids(kind, batch, stats)
+        existing = self._existing_ids(kind, batch)
+        built = self._build_all(kind, batch, existing, stats)
+        try:
+            imported, new_ids = self._write(kind, built, last_line, savepoints=False)
+        except IntegrityError:
+            # Some row breaks a constraint (e.g. duplicate email): redo the batch row by row
+            db.session.rollback()
+            built = self._build_all(kind, batch, existing, ImportStats(kind))
+            imported, new_ids = self._write(kind, built, last_line, savepoints=True, stats=stats)
+        stats.imported += imported
+        if kind in REFERENCED:
+            self.id_map[kind].update(new_ids)
+        self.done[kind] = last_line
+        db.session.expunge_all()  # Keep memory flat across batches
+
+    def _write(self, kind, built, last_line, savepoints, stats=None):
+        """Insert the batch with its checkpoint in one transaction.
+
+        Returns the number of rows inserted and {external id: new id}.
+        """
+        written = []
+        for line, record, obj, amenity_ids in built:
+            if not savepoints:
+                db.session.add(obj)
+                written.append((record, obj, amenity_ids))
+                continue
+            try:
+                with db.session.begin_nested():
+                    db.session.add(obj)
+                    db.session.flush()
+            except IntegrityError as e:
+                stats.fail(line, f"Conflicts with an existing row: {e.orig}")
+                continue
+            written.append((record, obj, amenity_ids))
+        db.session.flush()
+
+        new_ids = {}
+        links = []
+        rating_changes = defaultdict(lambda: defaultdict(int))
+        for record, obj, amenity_ids in written:
+            object_id = inspect(obj).identity[0]
+            if record.get("id") not in (None, ""):
+                new_ids[str(record["id"])] = object_id
+            links.extend({"place_id": object_id, "amenity_id": amenity_id} for amenity_id in amenity_ids)
+            if kind == "reviews":
+                rating_changes[obj.place_id][obj.rating] += 1
+        if links:
+            db.session.execute(place_amenity_association.insert(), links)
+        # Imported reviews count in their places' rating aggregates like any other review
+        if rating_changes:
+            for place in db.session.query(Place).filter(Place.id.in_(list(rating_changes))):
+                place.apply_rating_changes(dict(rating_changes[place.id]))
+        # New places and reviews are searchable as soon as their batch commits
+        if kind == "places":
+            refresh_documents(db.session, [inspect(obj).identity[0] for _, obj, _ in written])
+        elif kind == "reviews":
+            refresh_documents(db.session, rating_changes)
+
+        save_progress(db.session.connection(), self.job, kind, last_line,
+                      new_ids if kind in REFERENCED else {}, exists=kind in self.done)
+        db.session.commit()
+        return len(written), new_ids
@@ -0,0 +1,133 @@
+"""Background jobs for the follow-up work of writes (search index refresh, notifications).
+
+HBnBFacade write methods call ``facade.jobs.enqueue(name, **payload)``
+once their own transaction is committed. With JOB_QUEUE_BACKEND
+"database" (the default) the job is a row of the jobs table
+(app/persistence/jobs.py) and the request returns right away; `flask hbnb
+worker` processes run it, retrying failures with exponential backoff up to
+JOB_MAX_ATTEMPTS times. With "inline" (the tests, and always with the
+in-memory persistence backend, which a worker process could not see) the
+handler runs on the spot.
+
+Jobs run at least once: a worker that dies mid-job leaves it to be claimed
+again after JOB_LEASE_SECONDS, so handlers must be safe to repeat. An
+idempotency key makes enqueueing safe to repeat: a second job with the
+same key is never created.
+"""
+import logging
+import os
+import random
+import socket
+import time
+import traceback
+from datetime import datetime, timedelta
+from app.persistence.repository import db
+from app.persistence.jobs import claim_jobs, finish_job, insert_job, retry_job
+
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_BACKOFF_SECONDS = 2.0   # Delay before the first retry, doubled for each later one
+DEFAULT_BACKOFF_MAX_SECONDS = 600.0
+DEFAULT_LEASE_SECONDS = 300
+DEFAULT_WORKER_BATCH = 20
+
+# Job name -> fn(facade, **payload)
+HANDLERS = {}
+
+log = logging.getLogger("hbnb.jobs")
+
+
+def job_handler(name):
+    """Register fn(facade, **payload) as the handler of the jobs called name"""
+    def register(fn):
+        HANDLERS[name] = fn
+        return fn
+    return register
+
+
+def backoff_seconds(attempt, base=DEFAULT_BACKOFF_SECONDS, cap=DEFAULT_BACKOFF_MAX_SECONDS, rng=random):
+    """Delay before retrying after failed attempt number `attempt` (1-based), with jitter"""
+    delay = min(base * 2 ** (attempt - 1), cap)
+    return delay * rng.uniform(0.5, 1.0)  # Spread out the retries of jobs that failed together
+
+
+class JobQueue:
+    """Runs or stores the jobs enqueued by HBnBFacade."""
+
+    def __init__(self, facade):
+        self.facade = facade
+        self.backend = "inline"
+        self.max_attempts = DEFAULT_MAX_ATTEMPTS
+        self.backoff = DEFAULT_BACKOFF_SECONDS
+        self.backoff_max = DEFAULT_BACKOFF_MAX_SECONDS
+        self.lease = DEFAULT_LEASE_SECONDS
+
+    def init_app(self, app):
+        """Apply JOB_* from the app config"""
+        backend = app.config.get("JOB_QUEUE_BACKEND", "database")
+        if backend not in ("inline", "database"):
+            raise ValueError(f"Unknown JOB_QUEUE_BACKEND '{backend}'.")
+        self.backend = "inline" if self.facade.backend == "memory" else backend
+        self.max_attempts = app.config.get("JOB_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS)
+        self.backoff = app.config.get("JOB_BACKOFF_SECONDS", DEFAULT_BACKOFF_SECONDS)
+        self.backoff_max = app.config.get("JOB_BACKOFF_MAX_SECONDS", DEFAULT_BACKOFF_MAX_SECONDS)
+        self.lease = app.config.get("JOB_LEASE_SECONDS", DEFAULT_LEASE_SECONDS)
+
+    def enqueue(self, name, key=None, delay=0, **payload):
+        """Queue handler `name` with payload (JSON-serializable keyword arguments).
+
+        Returns the job id (None when run inline). key: idempotency key,
+        delay: seconds before the job may run.
+        """
+        if name not in HANDLERS:
+            raise ValueError(f"No handler for job '{name}'.")
+        if self.backend == "inline":
+            HANDLERS[name](self.facade, **payload)
+            return None
+        run_at = datetime.utcnow() + timedelta(seconds=delay)
+        job_id = insert_job(db.session.connection(), name, payload, self.max_attempts, run_at, key)
+        db.session.commit()
+        return job_id
+
+    def run_pending(self, worker_id=None, limit=DEFAULT_WORKER_BATCH):
+        """Claim and run one batch of due jobs; returns (succeeded, failed) counts"""
+        worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        with db.engine.begin() as connection:
+            claimed = claim_jobs(connection, worker_id, limit, self.lease)
+        succeeded = failed = 0
+        for job_id, name, payload, attempts, max_attempts in claimed:
+            try:
+                handler = HANDLERS.get(name)
+                if handler is None:
+                    raise LookupError(f"No handler for job '{name}'.")
+                handler(self.facade, **payload)
+            except Exception:
+                db.session.rollback()
+                failed += 1
+                error = traceback.format_exc(limit=5)
+                retry_at = None
+                if attempts < max_attempts:
+                    retry_at = datetime.utcnow() + timedelta(
+                        seconds=backoff_seconds(attempts, self.backoff, self.backoff_max))
+                log.warning("Job %s (%s) attempt %d/%d failed%s:\n%s", job_id, name, attempts, max_attempts,
+                            f", retrying at {retry_at:%H:%M:%S}" if retry_at else ", giving up", error)
+                with db.engine.begin() as connection:
+                    retry_job(connection, job_id, error, retry_at)
+            else:
+                succeeded += 1
+                with db.engine.begin() as connection:
+                    finish_job(connection, job_id)
+            finally:
+                db.session.remove()  # Each job starts from a clean session
+        return succeeded, failed
+
+    def work(self, worker_id=None, poll_interval=1.0, limit=DEFAULT_WORKER_BATCH, once=False):
+        """Run due jobs until interrupted (or until the queue is empty when once)"""
+        total = [0, 0]
+        while True:
+            succeeded, failed = self.run_pending(worker_id, limit)
+            total[0] += succeeded
+            total[1] += failed
+            if not succeeded and not failed:
+                if once:
+                    return tuple(total)
+                time.sleep(poll_interval)
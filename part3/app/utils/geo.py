@@ -0,0 +1,110 @@
+import math
+
+GEOHASH_PRECISION = 9  # ~5m x 5m cells, stored on every place
+EARTH_RADIUS_KM = 6371.0088
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Upper bound on the number of geohash cells used to cover a search box.
+# More cells means tighter ranges but more index seeks per query.
+MAX_COVER_CELLS = 16
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Encodes a coordinate pair into a geohash string."""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bit, ch, even = 0, 0, True
+    while len(chars) < precision:
+        rng, value = (lng_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            ch = (ch << 1) | 1
+            rng[0] = mid
+        else:
+            ch = ch << 1
+            rng[1] = mid
+        even = not even
+        bit += 1
+        if bit == 5:
+            chars.append(_BASE32[ch])
+            bit, ch = 0, 0
+    return "".join(chars)
+
+
+def cell_size(precision: int):
+    """Returns the (height, width) in degrees of a geohash cell."""
+    bits = 5 * precision
+    lng_bits = (bits + 1) // 2
+    lat_bits = bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lng_bits)
+
+
+def _cells_for_box(min_lat, min_lng, max_lat, max_lng, precision):
+    """Lists the geohash cells of the given precision overlapping a box."""
+    height, width = cell_size(precision)
+    first_row = math.floor((min_lat + 90.0) / height)
+    last_row = math.floor((min(max_lat, 90.0 - 1e-9) + 90.0) / height)
+    first_col = math.floor((min_lng + 180.0) / width)
+    last_col = math.floor((min(max_lng, 180.0 - 1e-9) + 180.0) / width)
+    cells = set()
+    for row in range(first_row, last_row + 1):
+        for col in range(first_col, last_col + 1):
+            lat = row * height - 90.0 + height / 2
+            lng = col * width - 180.0 + width / 2
+            cells.add(encode_geohash(lat, lng, precision))
+    return cells
+
+
+def _count_cells(min_lat, min_lng, max_lat, max_lng, precision):
+    height, width = cell_size(precision)
+    rows = math.floor((min(max_lat, 90.0 - 1e-9) + 90.0) / height) - math.floor((min_lat + 90.0) / height) + 1
+    cols = math.floor((min(max_lng, 180.0 - 1e-9) + 180.0) / width) - math.floor((min_lng + 180.0) / width) + 1
+    return rows * cols
+
+
+def split_antimeridian(min_lat, min_lng, max_lat, max_lng):
+    """Splits a box crossing the 180th meridian into two boxes."""
+    if min_lng <= max_lng:
+        return [(min_lat, min_lng, max_lat, max_lng)]
+    return [(min_lat, min_lng, max_lat, 180.0), (min_lat, -180.0, max_lat, max_lng)]
+
+
+def geohash_cover(min_lat, min_lng, max_lat, max_lng, max_cells: int = MAX_COVER_CELLS):
+    """Returns the geohash prefixes whose cells cover the given bounding box.
+
+    The finest precision that needs at most ``max_cells`` cells is used, so
+    each prefix becomes one range seek on the geohash index.
+    """
+    cover = set()
+    for box in split_antimeridian(min_lat, min_lng, max_lat, max_lng):
+        precision = 1
+        while precision < GEOHASH_PRECISION and _count_cells(*box, precision + 1) <= max_cells:
+            precision += 1
+        cover |= _cells_for_box(*box, precision)
+    return sorted(cover)
+
+
+def haversine_km(lat1, lng1, lat2, lng2) -> float:
+    """Great-circle distance between two points in kilometers."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def radius_bounding_box(latitude, longitude, radius_km):
+    """Returns the (min_lat, min_lng, max_lat, max_lng) box enclosing a circle."""
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = latitude - d_lat, latitude + d_lat
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        # The circle contains a pole: every longitude is in range
+        return max(min_lat, -90.0), -180.0, min(max_lat, 90.0), 180.0
+    d_lng = math.degrees(math.asin(min(1.0, math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(latitude)))))
+    min_lng, max_lng = longitude - d_lng, longitude + d_lng
+    if min_lng < -180.0:
+        min_lng += 360.0
+    if max_lng > 180.0:
+        max_lng -= 360.0
+    return min_lat, min_lng, max_lat, max_lng
@@ -0,0 +1,131 @@
+"""Conditional GET support: ETag / Last-Modified validators and collection version stamps.
+
+Single resources are validated from the (type, id, updated_at) of every
+entity their body is built from, so a 304 never needs the body. Collections
+carry a version stamp per collection name that HBnBFacade bumps on each
+write (see ``bumps``). HBnBFacade keeps the stamps where every process
+sees them: Redis when it is the repository cache, otherwise the
+collection_versions table (app/persistence/versions.py). A per-process
+store is only used with the in-memory persistence backend, whose data is
+per-process too.
+"""
+import functools
+import hashlib
+import time
+from datetime import datetime, timezone
+from flask import Response, request
+from werkzeug.http import http_date, quote_etag
+from app.persistence.cache import InProcessCache
+
+# Stamps never expire on their own; a lost stamp only costs one full response
+VERSION_TTL = 30 * 24 * 3600
+
+CACHE_CONTROL = "no-cache"  # Clients and CDNs may store responses but must revalidate them
+
+
+def _utc(moment):
+    if moment is None:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.replace(microsecond=0)
+
+
+def entity_validators(*entities):
+    """Strong ETag and Last-Modified for a body built from these entities"""
+    entities = [entity for entity in entities if entity is not None]
+    digest = hashlib.sha1()
+    for entity in entities:
+        updated_at = getattr(entity, "updated_at", None)
+        digest.update(f"{type(entity).__name__}:{entity.id}:{updated_at and updated_at.isoformat()};".encode())
+    stamps = [_utc(entity.updated_at) for entity in entities if getattr(entity, "updated_at", None)]
+    return digest.hexdigest()[:32], max(stamps, default=None)
+
+
+class CollectionVersions:
+    """Version stamp per collection, bumped on every write to it.
+
+    store: any cache backend (get / set(key, value, ttl)) shared by every
+    process serving the data; a private InProcessCache by default.
+    """
+
+    def __init__(self, store=None):
+        self.store = store if store is not None else InProcessCache()
+
+    def _key(self, collection):
+        return f"version:{collection}"
+
+    def get(self, collection):
+        """Current stamp (hex nanoseconds since the epoch) of a collection"""
+        stamp = self.store.get(self._key(collection))
+        if stamp is None:
+            return self.bump(collection)
+        return stamp.decode() if isinstance(stamp, bytes) else stamp
+
+    def bump(self, *collections):
+        stamp = f"{time.time_ns():x}"
+        for collection in collections:
+            self.store.set(self._key(collection), stamp, VERSION_TTL)
+        return stamp
+
+    def validators(self, collection, *variant):
+        """ETag and Last-Modified of a collection response; variant separates e.g. query strings"""
+        stamp = self.get(collection)
+        etag = hashlib.sha1(f"{collection}:{stamp}:{variant}".encode()).hexdigest()[:32]
+        return etag, _utc(datetime.fromtimestamp(int(stamp, 16) / 1e9, timezone.utc))
+
+
+def bumps(*collections):
+    """Mark an HBnBFacade method as a write to these collections"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            result = fn(self, *args, **kwargs)
+            self.versions.bump(*collections)
+            return result
+        return wrapper
+    return decorate
+
+
+def not_modified(etag, last_modified):
+    """True when the request's If-None-Match / If-Modified-Since still match"""
+    if request.if_none_match:
+        # Weak comparison: compressed responses carry the ETag weak (app/utils/compression.py).
+        # If-Modified-Since is ignored when both are sent.
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def _validator_headers(etag, last_modified):
+    headers = {"ETag": quote_etag(etag), "Cache-Control": CACHE_CONTROL}
+    if last_modified:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def _with_headers(response, headers):
+    body, status = response
+    if status != 200:
+        return body, status
+    return body, status, headers
+
+
+def conditional(etag, last_modified, build):
+    """304 when the client's copy is current, else build() with the validators as headers.
+
+    build returns the usual (body, status) pair and is only called on a miss.
+    """
+    headers = _validator_headers(etag, last_modified)
+    if not_modified(etag, last_modified):
+        return Response(status=304, headers=headers)
+    return _with_headers(build(), headers)
+
+
+async def conditional_async(etag, last_modified, build):
+    """conditional() for a coroutine build (the ASGI handlers)"""
+    headers = _validator_headers(etag, last_modified)
+    if not_modified(etag, last_modified):
+        return Response(status=304, headers=headers)
+    return _with_headers(await build(), headers)
@@ -0,0 +1,238 @@
+"""Request, SQL and bcrypt instrumentation, exposed in the Prometheus text format at /metrics.
+
+The API blueprint times every request and splits its latency into SQL,
+bcrypt, serialization and the rest (auth, facade and handler code). SQL
+time comes from cursor execute events on every engine, bcrypt time from
+PasswordHasher. Per-request totals live on ``flask.g``, so work done
+outside a request (CLI commands, background threads) only reaches the
+global counters.
+
+Metrics are kept per process: with several workers, scrape each one or
+run them behind a multiprocess-aware collector.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Upper bounds of the statements-per-request histogram buckets
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+# Request time split reported by hbnb_request_phase_seconds
+PHASES = ("sql", "bcrypt", "serialization", "other")
+# Statements kept per request (the first ones run) for the slow request log
+MAX_LOGGED_STATEMENTS = 20
+
+slow_log = logging.getLogger("hbnb.slow_requests")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in (*zip(names, values), *extra)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        self.name, self.help, self.labelnames = name, help, labels
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help, buckets, labels=()):
+        self.name, self.help, self.labelnames = name, help, labels
+        self.buckets = tuple(buckets)
+        self.series = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        with self._lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, series in sorted(self.series.items()):
+                for bound, count in zip(self.buckets, series):
+                    le = _labels(self.labelnames, labels, [("le", _number(bound))])
+                    lines.append(f"{self.name}_bucket{le} {count}")
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, [('le', '+Inf')])} {series[-1]}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(series[-2])}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {series[-1]}")
+        return lines
+
+
+class Metrics:
+    """The process-wide metrics and the hooks that feed them."""
+
+    def __init__(self):
+        self.requests = Counter("hbnb_requests_total", "HTTP requests served", ("method", "route", "status"))
+        self.latency = Histogram("hbnb_request_duration_seconds", "Request latency",
+                                 LATENCY_BUCKETS, ("method", "route"))
+        self.phases = Histogram("hbnb_request_phase_seconds", "Request time by phase",
+                                LATENCY_BUCKETS, ("route", "phase"))
+        self.request_statements = Histogram("hbnb_request_sql_statements", "SQL statements per request",
+                                            STATEMENT_BUCKETS, ("route",))
+        self.sql_statements = Counter("hbnb_sql_statements_total", "SQL statements executed", ("engine",))
+        self.sql_seconds = Histogram("hbnb_sql_duration_seconds", "SQL statement latency",
+                                     LATENCY_BUCKETS, ("engine",))
+        self.bcrypt_seconds = Histogram("hbnb_bcrypt_duration_seconds", "bcrypt hash and verify time",
+                                        LATENCY_BUCKETS, ("operation",))
+        self.slow_requests = Counter("hbnb_slow_requests_total", "Requests slower than SLOW_REQUEST_MS", ("route",))
+        self.collectors = []  # fn() -> list of exposition lines, called on every scrape
+
+    # Per-request accounting
+
+    def start_request(self):
+        if not current_app.config.get("METRICS_ENABLED", True):
+            return
+        g.hbnb_started = time.perf_counter()
+        g.hbnb_sql_count = 0
+        g.hbnb_sql_seconds = 0.0
+        g.hbnb_bcrypt_seconds = 0.0
+        g.hbnb_serialization_seconds = 0.0
+        g.hbnb_statements = [] if current_app.config.get("SLOW_REQUEST_MS") else None
+
+    def finish_request(self, status):
+        started = g.pop("hbnb_started", None)
+        if started is None:
+            return
+        seconds = time.perf_counter() - started
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        method = request.method
+        self.requests.inc(method, route, str(status))
+        self.latency.observe(seconds, method, route)
+        self.request_statements.observe(g.hbnb_sql_count, route)
+        split = {
+            "sql": g.hbnb_sql_seconds,
+            "bcrypt": g.hbnb_bcrypt_seconds,
+            "serialization": g.hbnb_serialization_seconds,
+        }
+        split["other"] = max(seconds - sum(split.values()), 0.0)
+        for phase in PHASES:
+            self.phases.observe(split[phase], route, phase)
+
+        threshold = current_app.config.get("SLOW_REQUEST_MS")
+        if threshold and seconds * 1000 >= threshold:
+            self.slow_requests.inc(route)
+            statements = sorted(g.hbnb_statements or [], key=lambda item: -item[1])
+            slow_log.warning(
+                "%s %s took %.1f ms (%d SQL statements, %.1f ms SQL, %.1f ms bcrypt)%s",
+                method, request.full_path.rstrip("?"), seconds * 1000, g.hbnb_sql_count,
+                split["sql"] * 1000, split["bcrypt"] * 1000,
+                "".join(f"\n  {spent * 1000:8.1f} ms  {statement}" for statement, spent in statements),
+            )
+
+    @contextmanager
+    def timed(self, phase):
+        """Add the block's duration to the current request's time for phase ("serialization")"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            if has_request_context() and "hbnb_started" in g:
+                attribute = f"hbnb_{phase}_seconds"
+                setattr(g, attribute, getattr(g, attribute) + time.perf_counter() - started)
+
+    # Hooks
+
+    def instrument_engine(self, engine, label="primary"):
+        """Count and time every statement the engine sends"""
+        @event.listens_for(engine, "before_cursor_execute")
+        def before(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("hbnb_query_started", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after(conn, cursor, statement, parameters, context, executemany):
+            seconds = time.perf_counter() - conn.info["hbnb_query_started"].pop()
+            self.sql_statements.inc(label)
+            self.sql_seconds.observe(seconds, label)
+            if has_request_context() and "hbnb_started" in g:
+                g.hbnb_sql_count += 1
+                g.hbnb_sql_seconds += seconds
+                if g.hbnb_statements is not None and len(g.hbnb_statements) < MAX_LOGGED_STATEMENTS:
+                    g.hbnb_statements.append((" ".join(statement.split()), seconds))
+
+    def observe_bcrypt(self, operation, seconds):
+        self.bcrypt_seconds.observe(seconds, operation)
+        if has_request_context() and "hbnb_started" in g:
+            g.hbnb_bcrypt_seconds += seconds
+
+    # Exposition
+
+    def render(self):
+        """Every metric in the Prometheus text exposition format"""
+        lines = []
+        for metric in (self.requests, self.latency, self.phases, self.request_statements,
+                       self.sql_statements, self.sql_seconds, self.bcrypt_seconds, self.slow_requests):
+            lines.extend(metric.render())
+        for collect in self.collectors:
+            lines.extend(collect())
+        return "\n".join(lines) + "\n"
+
+
+def pool_collector(pool_metrics):
+    """Collector exposing the connection pool metrics (app/persistence/engine.py) as gauges and counters"""
+    def collect():
+        snapshots = [pool.snapshot() for pool in pool_metrics.values()]
+        lines = []
+        for name, key, kind, help in (
+            ("hbnb_pool_in_use", "in_use", "gauge", "Connections checked out"),
+            ("hbnb_pool_capacity", "capacity", "gauge", "Pool size plus overflow"),
+            ("hbnb_pool_checkouts_total", "checkouts", "counter", "Connection checkouts"),
+            ("hbnb_pool_timeouts_total", "timeouts", "counter", "Checkouts that timed out"),
+            ("hbnb_pool_wait_seconds_max", "wait_seconds_max", "gauge", "Longest checkout wait"),
+        ):
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+            lines += [f'{name}{{pool="{_escape(s["label"])}"}} {_number(s[key])}' for s in snapshots]
+        return lines
+    return collect
+
+
+def metrics_view():
+    """GET /metrics"""
+    return current_app.response_class(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+def init_metrics(app, engine):
+    """Hook the primary and replica engines and serve /metrics (the API blueprint times requests)"""
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+    metrics.instrument_engine(engine, "primary")
+    replicas = app.extensions.get("hbnb_replicas")
+    for index, replica in enumerate(replicas.engines if replicas is not None else []):
+        metrics.instrument_engine(replica, f"replica{index}")
+    metrics.collectors = [pool_collector(app.extensions.get("hbnb_pool_metrics", {}))]
+    app.add_url_rule(app.config.get("METRICS_PATH", "/metrics"), "hbnb_metrics", metrics_view)
+
+
+metrics = Metrics()
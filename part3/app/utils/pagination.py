@@ -0,0 +1,42 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded or does not match the query."""
+
+
+def clamp_page_size(limit) -> int:
+    """Clamp a requested page size to the 1..MAX_PAGE_SIZE range."""
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(int(limit), MAX_PAGE_SIZE))
+
+
+def encode_cursor(sort: str, value, last_id: str) -> str:
+    """Build an opaque cursor token from the last row of a page."""
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    payload = json.dumps({"s": sort, "v": value, "id": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, sort: str):
+    """Decode a cursor token into the (sort value, id) pair it points after."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        value, last_id = payload["v"], payload["id"]
+        cursor_sort = payload["s"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise InvalidCursor("Malformed cursor.")
+    if cursor_sort != sort:
+        raise InvalidCursor("Cursor does not match the requested sort order.")
+    if isinstance(value, dict) and "dt" in value:
+        value = datetime.fromisoformat(value["dt"])
+    return value, last_id
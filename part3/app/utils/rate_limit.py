@@ -0,0 +1,228 @@
+"""Per-client rate limiting and load shedding for the API.
+
+Every API request first takes a token from its client's bucket for the
+route's namespace (429 Too Many Requests when the bucket is empty), then a
+slot from the process-wide admission control (503 Service Unavailable when
+every slot stays busy for ADMISSION_QUEUE_TIMEOUT). Slots default to the
+primary pool's capacity, so a burst is shed at the door instead of piling
+up on pool checkouts for pool_timeout seconds.
+
+Clients are identified by their JWT identity when the request carries a
+valid token, by their IP address otherwise (behind a proxy, apply
+werkzeug's ProxyFix so remote_addr is the client's). Buckets live in
+process memory or, for limits shared by every worker, in Redis.
+"""
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, g, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+WRITE_METHODS = frozenset(("POST", "PUT", "PATCH", "DELETE"))
+# (requests per second, burst) per client when RATE_LIMITS has no rule for a namespace
+DEFAULT_RATE_LIMIT = (20, 50)
+DEFAULT_MAX_BUCKETS = 100_000
+# Seconds a shed request is told to wait before retrying
+OVERLOAD_RETRY_AFTER = 1
+
+log = logging.getLogger(__name__)
+
+
+class MemoryTokenBuckets:
+    """Token buckets in a thread-safe dict, least recently used evicted past max_buckets."""
+
+    def __init__(self, max_buckets=DEFAULT_MAX_BUCKETS, clock=time.monotonic):
+        self.max_buckets = max_buckets
+        self._clock = clock
+        self._buckets = OrderedDict()  # key -> (tokens, refilled_at)
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, burst, cost=1):
+        """(allowed, tokens left) after taking cost tokens from the bucket of key"""
+        now = self._clock()
+        with self._lock:
+            tokens, refilled_at = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - refilled_at) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)  # A forgotten bucket comes back full
+        return allowed, tokens
+
+
+# Refill and take atomically on the server, with the server's clock
+TAKE_SCRIPT = """
+local rate, burst, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'at')
+local tokens = tonumber(state[1]) or burst
+tokens = math.min(burst, tokens + math.max(0, now - (tonumber(state[2]) or now)) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'at', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisTokenBuckets:
+    """Token buckets shared by every process, for Redis or any server running its Lua scripts.
+
+    ``client`` only needs ``register_script`` (redis-py, fakeredis). Keys
+    expire once their bucket would be full again. When the server cannot be
+    reached requests are let through: rate limiting is not worth an outage.
+    """
+
+    def __init__(self, client, prefix="hbnb:"):
+        self.prefix = prefix
+        self._take = client.register_script(TAKE_SCRIPT)
+
+    def take(self, key, rate, burst, cost=1):
+        try:
+            allowed, tokens = self._take(keys=[self.prefix + key], args=[rate, burst, cost])
+        except Exception as e:  # Connection errors, timeouts
+            log.warning("Rate limiting skipped, Redis unavailable: %s", e)
+            return True, burst
+        return bool(allowed), float(tokens)
+
+
+def make_bucket_backend(config):
+    """Builds the bucket store selected by RATE_LIMIT_BACKEND ("memory" or "redis")."""
+    backend = config.get("RATE_LIMIT_BACKEND", "memory")
+    if backend == "memory":
+        return MemoryTokenBuckets(config.get("RATE_LIMIT_MAX_BUCKETS", DEFAULT_MAX_BUCKETS))
+    if backend == "redis":
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_BACKEND='redis' requires the redis package.")
+        url = config.get("RATE_LIMIT_REDIS_URL") or config.get("CACHE_REDIS_URL", "redis://localhost:6379/0")
+        return RedisTokenBuckets(redis.Redis.from_url(url))
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND '{backend}'.")
+
+
+class AdmissionControl:
+    """Caps the API requests in progress in this process."""
+
+    def __init__(self, max_in_flight, queue_timeout=0.0):
+        self.max_in_flight = max_in_flight
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.shed = 0
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+
+    def enter(self, wait=True):
+        """Take a slot, waiting up to queue_timeout for one when wait; False when the request must be shed"""
+        if wait and self.queue_timeout:
+            acquired = self._slots.acquire(timeout=self.queue_timeout)
+        else:
+            acquired = self._slots.acquire(blocking=False)
+        if not acquired:
+            with self._lock:
+                self.shed += 1
+            return False
+        with self._lock:
+            self.in_flight += 1
+        return True
+
+    def leave(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+
+def _pool_capacity(app):
+    """Connections the primary pool can hand out (pool_size + max_overflow)"""
+    pool = app.extensions.get("hbnb_pool_metrics", {}).get("primary")
+    capacity = pool.snapshot()["capacity"] if pool is not None else 0
+    return capacity or None
+
+
+class RateLimiter:
+    """Token buckets per client and namespace, plus admission control, for the API blueprint."""
+
+    def __init__(self):
+        self.enabled = False
+        self.rules = {"default": DEFAULT_RATE_LIMIT}
+        self.buckets = MemoryTokenBuckets()
+        self.admission = None
+
+    def init_app(self, app):
+        """Apply RATE_LIMIT_* and ADMISSION_* from the app config"""
+        config = app.config
+        self.enabled = config.get("RATE_LIMIT_ENABLED", True)
+        self.rules = dict({"default": DEFAULT_RATE_LIMIT}, **config.get("RATE_LIMITS", {}))
+        self.buckets = make_bucket_backend(config) if self.enabled else MemoryTokenBuckets()
+        max_in_flight = config.get("ADMISSION_MAX_IN_FLIGHT") or _pool_capacity(app)
+        self.admission = AdmissionControl(max_in_flight, config.get("ADMISSION_QUEUE_TIMEOUT", 0.1)) \
+            if config.get("ADMISSION_CONTROL_ENABLED", True) and max_in_flight else None
+
+    def rule(self, namespace, method):
+        """(rule name, (rate, burst) or None) applying to a namespace and method"""
+        names = [namespace, "default"]
+        if method in WRITE_METHODS:
+            names = [f"{namespace}:write", namespace, "default:write", "default"]
+        for name in names:
+            if name in self.rules:
+                return name, self.rules[name]
+        return "default", None
+
+    @staticmethod
+    def client_key():
+        """JWT identity of the caller, or its IP address"""
+        try:
+            verify_jwt_in_request(optional=True)
+            identity = get_jwt_identity()
+        except Exception:  # Expired or invalid tokens are rejected by the route itself
+            identity = None
+        return f"user:{identity}" if identity is not None else f"ip:{request.remote_addr}"
+
+    def admit(self, wait=True):
+        """Error response when the current request must be refused, None once it is admitted.
+
+        Call release() when an admitted request is done.
+        """
+        parts = request.path.strip("/").split("/")
+        namespace = parts[2] if len(parts) > 2 else ""  # /api/v1/<namespace>/...
+        if self.enabled:
+            name, limit = self.rule(namespace, request.method)
+            if limit is not None:
+                rate, burst = limit
+                allowed, tokens = self.buckets.take(f"ratelimit:{name}:{namespace}:{self.client_key()}", rate, burst)
+                g.hbnb_rate_limit = (burst, int(tokens))
+                if not allowed:
+                    retry_after = math.ceil((1 - tokens) / rate)
+                    return ({"error": f"Rate limit exceeded, retry in {retry_after}s"}, 429,
+                            self.headers({"Retry-After": str(retry_after)}))
+        if self.admission is not None:
+            if not self.admission.enter(wait):
+                return ({"error": "Server busy, retry shortly"}, 503,
+                        self.headers({"Retry-After": str(OVERLOAD_RETRY_AFTER)}))
+            g.hbnb_admitted = True
+        return None
+
+    def release(self, error=None):
+        if g.pop("hbnb_admitted", False):
+            self.admission.leave()
+
+    @staticmethod
+    def headers(headers=None):
+        """headers plus the X-RateLimit-* headers of the current request"""
+        headers = dict(headers or {})
+        if "hbnb_rate_limit" in g:
+            burst, remaining = g.hbnb_rate_limit
+            headers.update({"X-RateLimit-Limit": str(burst), "X-RateLimit-Remaining": str(remaining)})
+        return headers
+
+
+limiter = RateLimiter()
@@ -1,5 +1,95 @@
-from werkzeug.security import generate_password_hash
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+import bcrypt
+from app.utils.metrics import metrics
+
+DEFAULT_BCRYPT_ROUNDS = 12
+# Seconds a client is told to wait when the hashing pool sheds its request
+HASHER_RETRY_AFTER = 1
+
+
+class HasherBusy(RuntimeError):
+    """Raised when too many password hashes are already waiting for a worker, or one took too long."""
+
+
+class PasswordHasher:
+    """Runs bcrypt on a bounded worker pool.
+
+    bcrypt releases the GIL, so the pool hashes in parallel on up to
+    ``max_workers`` cores while request threads only wait on a future.
+    Once ``max_pending`` hashes are queued or running, new ones fail fast
+    with HasherBusy instead of pinning yet another request thread for
+    seconds. A caller that waits longer than ``timeout`` gets HasherBusy
+    too, but its hash keeps its slot until bcrypt is done with it.
+    """
+
+    def __init__(self, rounds=DEFAULT_BCRYPT_ROUNDS, max_workers=None, max_pending=None, timeout=30):
+        self.configure(rounds, max_workers, max_pending, timeout)
+
+    def configure(self, rounds=DEFAULT_BCRYPT_ROUNDS, max_workers=None, max_pending=None, timeout=30):
+        self.rounds = rounds
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_workers * 4
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+
+    def init_app(self, app):
+        """Read the work factor and pool sizes from the app config"""
+        old_pool = self._pool
+        self.configure(
+            rounds=app.config.get("BCRYPT_LOG_ROUNDS", DEFAULT_BCRYPT_ROUNDS),
+            max_workers=app.config.get("BCRYPT_MAX_WORKERS"),
+            max_pending=app.config.get("BCRYPT_MAX_PENDING"),
+            timeout=app.config.get("BCRYPT_TIMEOUT", 30),
+        )
+        old_pool.shutdown(wait=False)
+
+    def _run(self, operation, fn, *args):
+        slots = self._slots  # init_app may swap them while this task runs
+        if not slots.acquire(blocking=False):
+            raise HasherBusy("Too many password operations in progress.")
+        started = time.perf_counter()
+        try:
+            future = self._pool.submit(fn, *args)
+        except BaseException:
+            slots.release()
+            raise
+        # Released when bcrypt is done (or the queued task is cancelled), not when the caller stops waiting
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            future.cancel()  # Only succeeds while it still waits for a worker
+            raise HasherBusy("Password operation timed out.") from None
+        finally:
+            metrics.observe_bcrypt(operation, time.perf_counter() - started)  # Includes the wait for a worker
+
+    def hash(self, password: str) -> str:
+        """Hashes a password with the configured bcrypt cost."""
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return self._run("hash", bcrypt.hashpw, password.encode("utf-8"), salt).decode("utf-8")
+
+    def verify(self, hashed: str, password: str) -> bool:
+        """Checks a password against a bcrypt hash."""
+        try:
+            return self._run("verify", bcrypt.checkpw, password.encode("utf-8"), hashed.encode("utf-8"))
+        except ValueError:  # Not a bcrypt hash
+            return False
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """True when the hash was made with a different cost than the configured one."""
+        try:
+            return int(hashed.split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+
+hasher = PasswordHasher()
+
 
 def hash_password(password: str) -> str:
     """Hashes a password using a secure hashing algorithm."""
-    return generate_password_hash(password)
\ No newline at end of file
+    return hasher.hash(password)
@@ -0,0 +1,175 @@
+"""Response encoding: compiled per-model serializers and a pluggable JSON encoder.
+
+``compile_model`` turns a flask_restx model into one generated function that
+reads attributes straight off ORM objects (or SQLAlchemy ``Row`` objects,
+which expose columns as attributes) and builds the response dict in a
+single expression, instead of marshalling field by field. Datetimes are
+left as they are for the encoder to write.
+
+The encoder is picked with JSON_ENCODER: "orjson", "msgspec", "json"
+(stdlib) or "auto" (the fastest one installed).
+"""
+import json
+import re
+from datetime import date, datetime
+from decimal import Decimal
+from flask import current_app
+from flask_restx import fields
+
+_CONVERTERS = {
+    fields.String: str,
+    fields.Float: float,
+    fields.Integer: int,
+    fields.Boolean: bool,
+}
+
+
+def _field_spec(field):
+    """(kind, argument) of compile_serializer for a flask_restx field instance"""
+    if isinstance(field, fields.Nested):
+        return "one", compile_model(field.nested)
+    if isinstance(field, fields.List):
+        item = field.container
+        if isinstance(item, fields.Nested):
+            return "many", compile_model(item.nested)
+        converter = next((fn for cls, fn in _CONVERTERS.items() if isinstance(item, cls)), None)
+        return ("many_convert", converter) if converter else ("many_raw", None)
+    for cls, converter in _CONVERTERS.items():
+        if isinstance(field, cls):
+            return "convert", converter
+    return "raw", None
+
+
+def compile_serializer(name, spec):
+    """Generate fn(obj) -> dict from {key: (attribute, kind, argument)}.
+
+    kind is "raw" (value as is), "convert" (argument(value) unless None),
+    "one"/"many" (nested serializer for an object / a list of objects) and
+    "many_convert"/"many_raw" for lists of scalars.
+    """
+    name = re.sub(r"\W", "_", name)
+    helpers, lines = {}, []
+    for index, (key, (attribute, kind, argument)) in enumerate(spec.items()):
+        getter = f"o.{attribute}" if attribute.isidentifier() else f"getattr(o, {attribute!r})"
+        helper = f"_f{index}"
+        helpers[helper] = argument
+        if kind == "raw":
+            expression = getter
+        elif kind == "convert" or kind == "one":
+            expression = f"None if (v := {getter}) is None else {helper}(v)"
+        elif kind == "many" or kind == "many_convert":
+            expression = f"None if (v := {getter}) is None else [{helper}(x) for x in v]"
+        elif kind == "many_raw":
+            expression = f"None if (v := {getter}) is None else list(v)"
+        else:
+            raise ValueError(f"Unknown field kind '{kind}'.")
+        lines.append(f"        {key!r}: {expression},")
+    source = f"def serialize_{name}(o):\n    return {{\n" + "\n".join(lines) + "\n    }\n"
+    namespace = dict(helpers)
+    exec(compile(source, f"<serializer {name}>", "exec"), namespace)
+    serializer = namespace[f"serialize_{name}"]
+    serializer.source = source
+    return serializer
+
+
+def compile_model(model, keys=None):
+    """Compiled serializer giving the same dict as flask_restx marshal(obj, model), limited to keys if given"""
+    spec = {}
+    for key, field in model.items():
+        if keys is not None and key not in keys:
+            continue
+        if isinstance(field, type):
+            field = field()
+        kind, argument = _field_spec(field)
+        spec[key] = (field.attribute or key, kind, argument)
+    return compile_serializer(model.name, spec)
+
+
+def compile_columns(name, columns):
+    """Compiled serializer copying columns as they are (what the models' to_dict build by hand)"""
+    return compile_serializer(name, {column: (column, "raw", None) for column in columns})
+
+
+def compile_tuple(name, keys):
+    """fn(row) -> dict for plain column tuples, by position"""
+    name = re.sub(r"\W", "_", name)
+    source = (f"def serialize_{name}(t):\n    return {{"
+              + ", ".join(f"{key!r}: t[{i}]" for i, key in enumerate(keys)) + "}\n")
+    namespace = {}
+    exec(compile(source, f"<serializer {name}>", "exec"), namespace)
+    return namespace[f"serialize_{name}"]
+
+
+def _default(obj):
+    """Types the encoders do not know natively"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if hasattr(obj, "to_dict"):  # Model objects some handlers return as they are
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _stdlib_dumps():
+    encoder = json.JSONEncoder(default=_default, separators=(",", ":"), ensure_ascii=False)
+    return lambda obj: encoder.encode(obj).encode()
+
+
+def _orjson_dumps():
+    import orjson
+    # Naive datetimes are written without an offset, like isoformat()
+    return lambda obj: orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _msgspec_dumps():
+    import msgspec
+    return msgspec.json.Encoder(enc_hook=_default).encode
+
+
+ENCODERS = {
+    "orjson": _orjson_dumps,
+    "msgspec": _msgspec_dumps,
+    "json": _stdlib_dumps,
+}
+
+
+class ResponseEncoder:
+    """Encodes API responses to JSON bytes with the configured backend."""
+
+    def __init__(self, backend="auto"):
+        self.configure(backend)
+
+    def configure(self, backend):
+        if backend == "auto":
+            for name in ("orjson", "msgspec"):
+                try:
+                    self._dumps = ENCODERS[name]()
+                except ImportError:
+                    continue
+                self.name = name
+                return
+            backend = "json"
+        if backend not in ENCODERS:
+            raise ValueError(f"Unknown JSON_ENCODER '{backend}'.")
+        try:
+            self._dumps = ENCODERS[backend]()
+        except ImportError:
+            raise RuntimeError(f"JSON_ENCODER='{backend}' requires the {backend} package.")
+        self.name = backend
+
+    def init_app(self, app):
+        """Apply JSON_ENCODER from the app config"""
+        self.configure(app.config.get("JSON_ENCODER", "auto"))
+
+    def dumps(self, obj):
+        return self._dumps(obj)
+
+    def make_response(self, data, code, headers=None):
+        """flask_restx representation for application/json"""
+        response = current_app.response_class(self.dumps(data), status=code, mimetype="application/json")
+        response.headers.extend(headers or {})
+        return response
+
+
+encoder = ResponseEncoder()
@@ -0,0 +1,11 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from app.asgi import create_asgi_app
+from app.persistence.repository import db
+from app.persistence.migrations import upgrade
+
+# ASGI entry point: uvicorn asgi:application --workers 1
+application = create_asgi_app(os.getenv('HBNB_CONFIG', 'config.DevelopmentConfig'))
+with application.flask_app.app_context():
+    upgrade(db.engine)  # Bring the schema up to date (same as `flask hbnb migrate`)
@@ -0,0 +1,126 @@
+"""Concurrent-connection throughput: WSGI (run.py's threaded server) vs ASGI (uvicorn asgi:application).
+
+Seeds a SQLite file with places, starts each server in a subprocess and
+drives GET /api/v1/places/?limit=20 from N keep-alive connections per
+concurrency level, printing throughput and latency percentiles.
+
+    python benchmarks/bench_asgi.py --places 2000 --seconds 10 16 64 256
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(ROOT)
+
+from app import create_app
+from app.models.user import User
+from app.models.place import Place
+from app.persistence.repository import db
+from app.persistence.migrations import upgrade
+
+PATH = "/api/v1/places/?limit=20"
+SERVERS = {
+    "wsgi": [sys.executable, "-c",
+             "import sys; from app import create_app; "
+             "create_app('config.TestingConfig').run(port=int(sys.argv[1]), threaded=True)"],
+    "asgi": [sys.executable, "-m", "uvicorn", "asgi:application", "--log-level", "warning", "--port"],
+}
+
+
+def seed(count):
+    app = create_app("config.TestingConfig")
+    with app.app_context():
+        upgrade(db.engine)
+        owner = User(first_name="Bench", last_name="Owner", email="owner@example.com", password="pw")
+        db.session.add(owner)
+        db.session.flush()
+        db.session.add_all([
+            Place(title=f"Place {i}", description="Bench", price=10.0 + i % 500,
+                  latitude=(i % 180) - 89.5, longitude=(i % 360) - 179.5, owner_id=owner.id)
+            for i in range(count)
+        ])
+        db.session.commit()
+
+
+def wait_until_up(port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}{PATH}", timeout=1).read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+async def _client(port, deadline, latencies, statuses):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    request = f"GET {PATH} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: keep-alive\r\n\r\n".encode()
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(request)
+            status_line = await reader.readline()
+            length, close = 0, False
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+                elif name.lower() == "connection" and value.strip().lower() == "close":
+                    close = True
+            await reader.readexactly(length)
+            latencies.append((time.perf_counter() - start) * 1000)
+            status = int(status_line.split()[1])
+            statuses[status] = statuses.get(status, 0) + 1
+            if close:  # HTTP/1.0 style server, reconnect
+                writer.close()
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    except (ConnectionError, asyncio.IncompleteReadError):
+        statuses["errors"] = statuses.get("errors", 0) + 1
+    finally:
+        writer.close()
+
+
+async def run_level(name, port, concurrency, seconds):
+    latencies, statuses = [], {}
+    deadline = time.perf_counter() + seconds
+    await asyncio.gather(*(_client(port, deadline, latencies, statuses) for _ in range(concurrency)))
+    ok = statuses.get(200, 0)
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else (latencies or [0.0]) * 99
+    print(f"{name:>5} {concurrency:>6} {ok / seconds:>10.1f} {quantiles[49]:>9.1f} {quantiles[94]:>9.1f} "
+          f"{quantiles[98]:>9.1f} {statuses.get('errors', 0):>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("levels", nargs="*", type=int, default=[16, 64, 256])
+    parser.add_argument("--places", type=int, default=2000)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=5055)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'asgi_bench.sqlite3')}"
+    os.environ["HBNB_CONFIG"] = "config.TestingConfig"
+    seed(args.places)
+
+    print(f"{'mode':>5} {'conc':>6} {'ok req/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for name, command in SERVERS.items():
+        server = subprocess.Popen(command + [str(args.port)], cwd=ROOT, env=os.environ.copy())
+        try:
+            wait_until_up(args.port)
+            for level in args.levels:
+                asyncio.run(run_level(name, args.port, level, args.seconds))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
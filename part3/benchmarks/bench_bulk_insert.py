@@ -0,0 +1,60 @@
+"""Benchmark batched repository writes against the per-row path.
+
+Inserts the same places once through ``place_repo.add`` (one commit per
+row) and once through ``place_repo.add_many`` (one commit per batch) and
+prints rows/sec for each.
+
+    python benchmarks/bench_bulk_insert.py 20000
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app import create_app
+from app.models.place import Place
+from app.persistence.repository import db
+from app.persistence.PlaceRepository import PlaceRepository
+
+
+def _places(count, rng):
+    owner_id = str(uuid.uuid4())
+    return [
+        Place(title=f"Place {i}", description="Benchmark place", price=rng.uniform(10, 500),
+              latitude=rng.uniform(-60, 70), longitude=rng.uniform(-180, 180), owner_id=owner_id)
+        for i in range(count)
+    ]
+
+
+def _rate(label, count, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {count:>8} rows {elapsed:>8.2f}s {count / elapsed:>12.0f} rows/sec")
+
+
+def main(count):
+    rng = random.Random(42)
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bulk_bench.sqlite3')}"
+    app = create_app("config.TestingConfig")
+    repo = PlaceRepository()
+    with app.app_context():
+        db.create_all()
+
+        per_row = _places(count, rng)
+        _rate("add (per row)", count, lambda: [repo.add(place) for place in per_row])
+
+        batched = _places(count, rng)
+        _rate("add_many (batched)", count, lambda: repo.add_many(batched))
+
+        ids = [place.id for place in batched]
+        _rate("update_many (batched)", count, lambda: repo.update_many({i: {"price": 99.0} for i in ids}))
+        _rate("delete_many (batched)", count, lambda: repo.delete_many(ids))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,120 @@
+"""Benchmark full-text place search against a LIKE scan.
+
+Grows the places table to each size given on the command line (titles and
+descriptions drawn from a Zipf-distributed vocabulary, like real listings),
+rebuilds the search index and times one- and two-word queries through
+PlaceRepository.search_text, with and without a price filter, next to the
+same words matched with LIKE over the title and description columns.
+
+    python benchmarks/bench_fulltext.py 10000 100000 1000000
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from sqlalchemy import and_, insert, or_
+from app import create_app
+from app.models.place import Place
+from app.persistence.repository import db
+from app.persistence.PlaceRepository import PlaceRepository
+from app.persistence.fulltext import create_index
+from app.utils.geo import encode_geohash
+
+QUERIES = 200
+SCAN_QUERIES = 20  # A LIKE scan of 1M rows takes seconds
+BATCH = 10_000
+VOCABULARY = 5_000
+TITLE_WORDS = 4
+DESCRIPTION_WORDS = 40
+# Words rarer than the top ones, so two-word queries still match something
+QUERY_RANKS = range(20, 500)
+
+
+def _words(rng, count):
+    # Zipf-ish: word i is drawn with weight 1 / (i + 1)
+    return " ".join(f"w{min(int(rng.paretovariate(1.0)) - 1, VOCABULARY - 1)}" for _ in range(count))
+
+
+def _rows(count, rng):
+    owner_id = str(uuid.uuid4())
+    for _ in range(count):
+        lat, lng = rng.uniform(-60, 70), rng.uniform(-180, 180)
+        yield {
+            "id": str(uuid.uuid4()),
+            "title": _words(rng, TITLE_WORDS),
+            "description": _words(rng, DESCRIPTION_WORDS),
+            "price": rng.uniform(10, 500),
+            "latitude": lat,
+            "longitude": lng,
+            "geohash": encode_geohash(lat, lng),
+            "owner_id": owner_id,
+        }
+
+
+def _grow(target, current, rng):
+    rows = _rows(target - current, rng)
+    while True:
+        batch = [row for _, row in zip(range(BATCH), rows)]
+        if not batch:
+            break
+        db.session.execute(insert(Place), batch)
+        db.session.commit()
+
+
+def _query(rng, words):
+    return " ".join(f"w{rng.choice(QUERY_RANKS)}" for _ in range(words))
+
+
+def _time(fn, rng, words, queries=QUERIES):
+    samples = []
+    for _ in range(queries):
+        query = _query(rng, words)
+        start = time.perf_counter()
+        fn(query)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main(sizes):
+    rng = random.Random(42)
+    path = os.path.join(tempfile.mkdtemp(), "fulltext_bench.sqlite3")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    app = create_app("config.TestingConfig")
+    repo = PlaceRepository()
+
+    def like(query):
+        # Padded with spaces so "w12" does not match "w123"
+        clauses = [or_((" " + Place.title + " ").like(f"% {word} %"),
+                       (" " + Place.description + " ").like(f"% {word} %")) for word in query.split()]
+        db.session.query(Place).filter(and_(*clauses)).limit(20).all()
+
+    def fulltext(query):
+        repo.search_text(query)
+
+    def fulltext_priced(query):
+        repo.search_text(query, min_price=50, max_price=150)
+
+    with app.app_context():
+        db.create_all()
+        print(f"{'docs':>10} {'index s':>8} {'words':>6} {'LIKE p50 ms':>12} {'FTS p50 ms':>11} {'FTS+price p50 ms':>17}")
+        current = 0
+        for size in sorted(sizes):
+            _grow(size, current, rng)
+            current = size
+            start = time.perf_counter()
+            with db.engine.begin() as connection:
+                create_index(connection)
+            built = time.perf_counter() - start
+            for words in (1, 2):
+                print(f"{size:>10} {built:>8.1f} {words:>6} {_time(like, rng, words, SCAN_QUERIES):>12.3f} "
+                      f"{_time(fulltext, rng, words):>11.3f} {_time(fulltext_priced, rng, words):>17.3f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,97 @@
+"""Benchmark geohash-indexed place search against a full table scan.
+
+Grows the places table to each size given on the command line and times
+bounding-box and radius queries through PlaceRepository, next to the same
+box filter on the unindexed latitude/longitude columns.
+
+    python benchmarks/bench_geo_search.py 10000 100000 1000000
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from sqlalchemy import insert
+from app import create_app
+from app.models.place import Place
+from app.persistence.repository import db
+from app.persistence.PlaceRepository import PlaceRepository
+from app.utils.geo import encode_geohash
+
+QUERIES = 200
+BATCH = 10_000
+BOX_DEGREES = 0.1  # ~11km boxes
+RADIUS_KM = 5.0
+
+
+def _rows(count, rng):
+    owner_id = str(uuid.uuid4())
+    for _ in range(count):
+        lat, lng = rng.uniform(-60, 70), rng.uniform(-180, 180)
+        yield {
+            "id": str(uuid.uuid4()),
+            "title": "Bench place",
+            "price": rng.uniform(10, 500),
+            "latitude": lat,
+            "longitude": lng,
+            "geohash": encode_geohash(lat, lng),
+            "owner_id": owner_id,
+        }
+
+
+def _grow(target, current, rng):
+    rows = _rows(target - current, rng)
+    while True:
+        batch = [row for _, row in zip(range(BATCH), rows)]
+        if not batch:
+            break
+        db.session.execute(insert(Place), batch)
+        db.session.commit()
+
+
+def _time(fn, rng):
+    samples = []
+    for _ in range(QUERIES):
+        lat, lng = rng.uniform(-60, 70), rng.uniform(-180, 180)
+        start = time.perf_counter()
+        fn(lat, lng)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main(sizes):
+    rng = random.Random(42)
+    path = os.path.join(tempfile.mkdtemp(), "geo_bench.sqlite3")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    app = create_app("config.TestingConfig")
+    repo = PlaceRepository()
+
+    def scan(lat, lng):
+        db.session.query(Place).filter(
+            Place.latitude.between(lat, lat + BOX_DEGREES),
+            Place.longitude.between(lng, lng + BOX_DEGREES),
+        ).all()
+
+    def bbox(lat, lng):
+        repo.search_bbox(lat, lng, lat + BOX_DEGREES, lng + BOX_DEGREES)
+
+    def radius(lat, lng):
+        repo.search_radius(lat, lng, RADIUS_KM)
+
+    with app.app_context():
+        db.create_all()
+        print(f"{'rows':>10} {'scan p50 ms':>12} {'bbox p50 ms':>12} {'radius p50 ms':>14}")
+        current = 0
+        for size in sorted(sizes):
+            _grow(size, current, rng)
+            current = size
+            print(f"{size:>10} {_time(scan, rng):>12.3f} {_time(bbox, rng):>12.3f} {_time(radius, rng):>14.3f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
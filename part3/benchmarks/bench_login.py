@@ -0,0 +1,76 @@
+"""Load benchmark for POST /api/v1/auth/login.
+
+Creates one user, then hammers the login endpoint from N client threads
+for each concurrency level and prints throughput, latency percentiles
+and how many requests were shed with 503.
+
+    python benchmarks/bench_login.py --rounds 12 --seconds 10 1 4 16 64
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app import create_app
+from app.models.user import User
+from app.persistence.repository import db
+
+EMAIL = "bench@example.com"
+PASSWORD = "bench-password"
+
+
+def _worker(client, deadline, latencies, statuses, lock):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = client.post("/api/v1/auth/login", json={"email": EMAIL, "password": PASSWORD})
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(elapsed)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+
+def run_level(app, concurrency, seconds):
+    latencies, statuses, lock = [], {}, threading.Lock()
+    deadline = time.perf_counter() + seconds
+    threads = [
+        threading.Thread(target=_worker, args=(app.test_client(), deadline, latencies, statuses, lock))
+        for _ in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    ok = statuses.get(200, 0)
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    print(f"{concurrency:>6} {ok / seconds:>10.1f} {quantiles[49]:>9.1f} {quantiles[94]:>9.1f} "
+          f"{quantiles[98]:>9.1f} {statuses.get(503, 0):>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("levels", nargs="*", type=int, default=[1, 4, 16, 64])
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost (BCRYPT_LOG_ROUNDS)")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'login_bench.sqlite3')}"
+    os.environ["BCRYPT_LOG_ROUNDS"] = str(args.rounds)
+    app = create_app("config.TestingConfig")
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(first_name="Bench", last_name="User", email=EMAIL, password=PASSWORD))
+        db.session.commit()
+
+    print(f"bcrypt rounds={args.rounds}")
+    print(f"{'conc':>6} {'ok req/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'503s':>6}")
+    for level in args.levels:
+        run_level(app, level, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
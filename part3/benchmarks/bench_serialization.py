@@ -0,0 +1,79 @@
+"""Microbenchmark: serializing places with nested owner and amenities.
+
+Builds N transient places (no database), each with an owner and 3
+amenities, then times flask_restx marshal + stdlib json against the
+compiled serializer with every installed encoder.
+
+    python benchmarks/bench_serialization.py --places 10000 --repeat 5
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from flask_restx import marshal
+from app.api.v1.places import place_detail_model, serialize_place_detail
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.utils.serialization import ENCODERS
+
+
+def build_places(count):
+    owner = User(first_name="Bench", last_name="Owner", email="owner@example.com", password="pw")
+    owner.id = "owner-1"
+    amenities = []
+    for i in range(3):
+        amenity = Amenity(name=f"Amenity {i}")
+        amenity.id = i + 1
+        amenities.append(amenity)
+    places = []
+    for i in range(count):
+        place = Place(title=f"Place {i}", description="A nice place to stay", price=10.0 + i % 500,
+                      latitude=(i % 180) - 89.5, longitude=(i % 360) - 179.5, owner_id=owner.id)
+        place.id = f"place-{i}"
+        place.owner = owner
+        place.amenities.extend(amenities)
+        places.append(place)
+    return places
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--places", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    places = build_places(args.places)
+    cases = {"marshal + json": lambda: json.dumps({"places": marshal(places, place_detail_model)}).encode()}
+    for name, factory in ENCODERS.items():
+        try:
+            dumps = factory()
+        except ImportError:
+            print(f"({name} not installed, skipped)")
+            continue
+        cases[f"compiled + {name}"] = lambda dumps=dumps: dumps({"places": [serialize_place_detail(p) for p in places]})
+
+    baseline = None
+    print(f"{args.places} places, best of {args.repeat}")
+    print(f"{'pipeline':<22} {'ms':>9} {'places/s':>12} {'speedup':>8}")
+    for name, fn in cases.items():
+        seconds = best_of(args.repeat, fn)
+        baseline = baseline or seconds
+        print(f"{name:<22} {seconds * 1000:>9.1f} {args.places / seconds:>12.0f} {baseline / seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ from flask import Flask
 from flask_restx import Api
 from flask_cors import CORS
 from app.persistence.repository import db
+from app.persistence.migrations import upgrade
 
 # Importing API namespaces
 from app.api.v1.places import api as places_ns
@@ -19,7 +20,7 @@ CORS(app)
 
 app = create_app()
 with app.app_context():
-    db.create_all()
+    upgrade(db.engine)  # Bring the schema up to date (same as `flask hbnb migrate`)
 
 api.add_namespace(places_ns, path='/api/v1/places')
 
@@ -0,0 +1,41 @@
+import sys
+import os
+import pytest
+from sqlalchemy import event
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app import create_app
+from app.persistence.repository import db
+from app.persistence.migrations import upgrade
+
+
+@pytest.fixture(scope="function")
+def app():
+    """Application bound to a fresh in-memory SQLite database built by the migrations."""
+    app = create_app("config.TestingConfig")
+    with app.app_context():
+        upgrade(db.engine)
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture(scope="function")
+def sql_statements(app):
+    """Collects every SQL statement sent to the database while the test runs."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(db.engine, "before_cursor_execute", record)
+
+
+@pytest.fixture(scope="function")
+def admin_headers(app):
+    """Authorization header carrying an admin access token."""
+    from flask_jwt_extended import create_access_token
+    token = create_access_token(identity="admin-1", additional_claims={"is_admin": True})
+    return {"Authorization": f"Bearer {token}"}
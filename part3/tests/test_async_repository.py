@@ -0,0 +1,105 @@
+import asyncio
+import json
+import pytest
+
+pytest.importorskip("greenlet")
+pytest.importorskip("aiosqlite")
+pytest.importorskip("asgiref")
+
+from app.asgi import create_asgi_app
+from app.models.user import User
+from app.models.place import Place
+from app.persistence.repository import db
+from app.persistence.migrations import upgrade
+from app.services import facade
+from config import TestingConfig
+
+
+@pytest.fixture(scope="function")
+def asgi_app(tmp_path):
+    """ASGI app on a SQLite file (the sync and async engines cannot share an in-memory database)"""
+    class FileConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'async.sqlite3'}"
+
+    application = create_asgi_app(FileConfig)
+    with application.flask_app.app_context():
+        upgrade(db.engine)
+        owner = User(first_name="Owner", last_name="One", email="owner@example.com", password="pw")
+        db.session.add(owner)
+        db.session.flush()
+        db.session.add_all([Place(title=f"Place {i}", description="Nice", price=50.0 + i,
+                                  latitude=10.0, longitude=20.0, owner_id=owner.id) for i in range(5)])
+        db.session.commit()
+    yield application
+    asyncio.run(application.facade.dispose())
+
+
+def asgi_get(application, path, query_string=b""):
+    """Run one GET through the ASGI app, returning (status, decoded JSON body)"""
+    scope = {"type": "http", "method": "GET", "path": path, "query_string": query_string,
+             "headers": [], "http_version": "1.1", "scheme": "http", "server": ("test", 80)}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(application(scope, receive, send))
+    body = b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+    return sent[0]["status"], json.loads(body)
+
+
+# Test the async repository pages through places exactly like the sync one
+def test_async_listing_matches_sync(asgi_app):
+    with asgi_app.flask_app.app_context():
+        sync_pages = facade.get_all_places(sort="price", limit=2)
+    async_pages = asyncio.run(asgi_app.facade.get_all_places(sort="price", limit=2))
+    assert [p.id for p in async_pages[0]] == [p.id for p in sync_pages[0]]
+    assert async_pages[1] == sync_pages[1]
+
+
+# Test the native async route returns the same body as the Flask resource
+def test_asgi_listing_matches_wsgi(asgi_app):
+    status, body = asgi_get(asgi_app, "/api/v1/places/", b"limit=3&sort=-price")
+    expected = asgi_app.flask_app.test_client().get("/api/v1/places/?limit=3&sort=-price")
+    assert status == 200
+    assert body == expected.get_json()
+
+
+# Test validation errors and missing places keep their status codes
+def test_asgi_errors(asgi_app):
+    assert asgi_get(asgi_app, "/api/v1/places/", b"min_price=10&max_price=1")[0] == 400
+    assert asgi_get(asgi_app, "/api/v1/places/", b"sort=bogus")[0] == 400
+    assert asgi_get(asgi_app, "/api/v1/places/does-not-exist")[0] == 404
+
+
+# Test an unexpected handler error answers 500 and is still counted in the request metrics
+def test_asgi_unexpected_error(asgi_app, monkeypatch):
+    from app.utils.metrics import metrics
+
+    async def broken(*args, **kwargs):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(asgi_app.facade, "get_all_places", broken)
+    errors = sum(count for labels, count in metrics.requests.values.items() if labels[2] == "500")
+    assert asgi_get(asgi_app, "/api/v1/places/") == (500, {"message": "Internal Server Error"})
+    assert sum(count for labels, count in metrics.requests.values.items() if labels[2] == "500") == errors + 1
+
+
+# Test collection stamps are read off the event loop thread
+def test_asgi_reads_versions_off_the_loop(asgi_app, monkeypatch):
+    import threading
+    validators = facade.versions.validators
+    threads = []
+
+    def record(*args):
+        threads.append(threading.current_thread())
+        return validators(*args)
+
+    monkeypatch.setattr(facade.versions, "validators", record)
+    assert asgi_get(asgi_app, "/api/v1/places/", b"limit=2")[0] == 200
+    assert asgi_get(asgi_app, "/api/v1/places/search", b"min_lat=0&min_lng=0&max_lat=1&max_lng=1")[0] == 200
+    assert asgi_get(asgi_app, "/api/v1/places/facets")[0] == 200
+    assert len(threads) == 3 and threading.main_thread() not in threads
@@ -0,0 +1,43 @@
+import pytest
+from flask_jwt_extended import create_access_token
+from app.services import facade
+
+
+def bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+# Test a token carrying the is_admin claim is authorized without reading the users table
+def test_claims_need_no_user_lookup(app, sql_statements):
+    token = create_access_token(identity="admin-1", additional_claims={"is_admin": True})
+    response = app.test_client().post("/api/v1/amenities/", headers=bearer(token), json={"name": "Sauna"})
+    assert response.status_code == 201
+    assert not [statement for statement in sql_statements if "FROM users" in statement]
+
+
+# Test a token without the claim follows the user's current role, with and without the repository cache
+@pytest.mark.parametrize("cache_backend", [None, "memory"])
+def test_role_change_applies_to_old_tokens(app, cache_backend):
+    app.config["CACHE_BACKEND"] = cache_backend
+    facade.init_app(app)
+    user = facade.create_user({"first_name": "Ada", "last_name": "Admin", "email": "ada@example.com",
+                               "password": "pw"})
+    headers = bearer(create_access_token(identity=user.id))
+    client = app.test_client()
+    assert client.post("/api/v1/amenities/", headers=headers, json={"name": "Pool"}).status_code == 403
+
+    facade.update_user(user.id, {"is_admin": True})
+    assert client.post("/api/v1/amenities/", headers=headers, json={"name": "Pool"}).status_code == 201
+
+    facade.update_user(user.id, {"is_admin": False})
+    assert client.post("/api/v1/amenities/", headers=headers, json={"name": "Gym"}).status_code == 403
+
+
+# Test requests sharing an application context each get the principal of their own token
+def test_principal_follows_token(app, admin_headers):
+    user = facade.create_user({"first_name": "Bob", "last_name": "Guest", "email": "bob@example.com",
+                               "password": "pw"})
+    guest = bearer(create_access_token(identity=user.id, additional_claims={"is_admin": False}))
+    client = app.test_client()
+    assert client.post("/api/v1/amenities/", headers=admin_headers, json={"name": "Spa"}).status_code == 201
+    assert client.post("/api/v1/amenities/", headers=guest, json={"name": "Gym"}).status_code == 403
@@ -0,0 +1,72 @@
+from flask_jwt_extended import create_access_token
+from app.persistence.repository import db
+from app.services import facade
+
+
+def user_headers(email):
+    user = facade.create_user({"first_name": "Test", "last_name": "User", "email": email, "password": "pw"})
+    return user.id, {"Authorization": f"Bearer {create_access_token(identity=user.id)}"}
+
+
+def place_item(title, **extra):
+    return {"title": title, "description": None, "price": 80.0, "latitude": 10.0, "longitude": 20.0, **extra}
+
+
+# Test a place batch inserts every valid row in one statement and reports the invalid ones
+def test_place_batch(app, sql_statements):
+    owner_id, headers = user_headers("owner@example.com")
+    pool = facade.create_amenity({"name": "Pool"})
+    sql_statements.clear()
+
+    response = app.test_client().post("/api/v1/places/batch", headers=headers, json=[
+        place_item("Loft", amenities=[pool.id]), place_item("Cabin"),
+        place_item("Nowhere", latitude=120.0), place_item("Ghost", amenities=["missing"])])
+    assert response.status_code == 207
+    body = response.get_json()
+    assert [error["index"] for error in body["errors"]] == [2, 3]
+    assert len(body["created"]) == 2
+    assert len([s for s in sql_statements if s.startswith("INSERT INTO places")]) == 1
+
+    db.session.expire_all()
+    loft, cabin = (facade.get_place_by_id(place_id) for place_id in body["created"])
+    assert (loft.title, loft.owner_id, [a.name for a in loft.amenities]) == ("Loft", owner_id, ["Pool"])
+    assert (cabin.title, cabin.amenities, cabin.review_count) == ("Cabin", [], 0)
+
+
+# Test the amenity batch rejects names already taken
+def test_amenity_batch(app, admin_headers):
+    client = app.test_client()
+    response = client.post("/api/v1/amenities/batch", headers=admin_headers,
+                           json=[{"name": "Sauna"}, {"name": "Gym"}])
+    assert response.status_code == 201
+    assert sorted(a.name for a in facade.amenity_repo.get_all()) == ["Gym", "Sauna"]
+    again = client.post("/api/v1/amenities/batch", headers=admin_headers, json=[{"name": "Gym"}])
+    assert again.status_code == 400
+    assert again.get_json()["errors"][0]["index"] == 0
+
+
+# Test a review batch stores the reviews and updates the places' rating aggregates
+def test_review_batch(app):
+    owner_id, _ = user_headers("owner@example.com")
+    _, headers = user_headers("guest@example.com")
+    loft, cabin = (facade.create_place(dict(place_item(title), owner_id=owner_id)) for title in ("Loft", "Cabin"))
+
+    response = app.test_client().post("/api/v1/reviews/batch", headers=headers, json=[
+        {"text": "Great", "rating": 5, "place_id": loft.id},
+        {"text": "Good", "rating": 4, "place_id": cabin.id},
+        {"text": "Again", "rating": 1, "place_id": loft.id}])
+    assert response.status_code == 207
+    assert response.get_json()["errors"] == [{"index": 2, "error": "You have already reviewed this place."}]
+
+    db.session.expire_all()
+    assert [(p.review_count, p.average_rating) for p in map(facade.get_place_by_id, (loft.id, cabin.id))] == [
+        (1, 5.0), (1, 4.0)]
+    assert [review.text for review in facade.get_place_by_id(loft.id).reviews] == ["Great"]
+
+
+# Test malformed batch payloads are refused before anything is validated
+def test_batch_payload_checks(app):
+    _, headers = user_headers("owner@example.com")
+    client = app.test_client()
+    assert client.post("/api/v1/places/batch", headers=headers, json=[]).status_code == 400
+    assert client.post("/api/v1/places/batch", headers=headers, json=["Loft"]).status_code == 400
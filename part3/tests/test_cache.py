@@ -0,0 +1,145 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.persistence.cache import InProcessCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+# Test entries expire after their TTL
+def test_in_process_cache_ttl():
+    clock = FakeClock()
+    cache = InProcessCache(max_entries=10, clock=clock)
+    cache.set("Amenity:1", b"wifi", ttl=30)
+    assert cache.get("Amenity:1") == b"wifi"
+    clock.now = 31
+    assert cache.get("Amenity:1") is None
+
+# Test the least recently used entry is evicted first
+def test_in_process_cache_lru_eviction():
+    cache = InProcessCache(max_entries=2)
+    cache.set("a", b"1", ttl=60)
+    cache.set("b", b"2", ttl=60)
+    cache.get("a")  # "b" is now the least recently used
+    cache.set("c", b"3", ttl=60)
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    assert cache.get("c") == b"3"
+    assert cache.evictions == 1
+    assert len(cache) == 2
+
+# Test explicit invalidation
+def test_in_process_cache_delete():
+    cache = InProcessCache()
+    cache.set("Place:1", b"x", ttl=60)
+    cache.delete("Place:1")
+    assert cache.get("Place:1") is None
+
+
+class FakeRedis:
+    """The part of redis-py's client RedisCache uses"""
+
+    def __init__(self):
+        self.data, self.ttls = {}, {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key], self.ttls[key] = value, ex
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def info(self, section):
+        return {"evicted_keys": 3}
+
+
+def cached_amenities(backend=None):
+    from app.models.amenity import Amenity
+    from app.persistence.cache import CachedRepository
+    from app.persistence.repository import SQLAlchemyRepository
+    return CachedRepository(SQLAlchemyRepository(Amenity), backend or InProcessCache(), ttl=60)
+
+
+# Test a hit is merged into the session without a SELECT and counted
+def test_cached_repository_hit_without_select(app, sql_statements):
+    from app.models.amenity import Amenity
+    from app.persistence.repository import db
+    repo = cached_amenities()
+    amenity_id = repo.add(Amenity(name="Sauna")).id
+    db.session.expunge_all()
+
+    assert repo.get(amenity_id).name == "Sauna"
+    db.session.expunge_all()
+    sql_statements.clear()
+    hit = repo.get(amenity_id)
+    assert sql_statements == []
+    assert hit.name == "Sauna" and hit in db.session
+    assert repo.stats() == {"hits": 1, "misses": 1, "evictions": 0}
+
+
+# Test update and delete invalidate the cached copy
+def test_cached_repository_invalidation(app):
+    from app.models.amenity import Amenity
+    from app.persistence.repository import db
+    repo = cached_amenities()
+    amenity_id = repo.add(Amenity(name="Sauna")).id
+    repo.get(amenity_id)
+    repo.update(amenity_id, {"name": "Steam room"})
+    db.session.expunge_all()
+    assert repo.get(amenity_id).name == "Steam room"
+    assert repo.misses == 2
+
+    repo.delete(amenity_id)
+    assert repo.get(amenity_id) is None
+
+
+# Test the Redis backend stores prefixed keys with the TTL and reports the server's evictions
+def test_cached_repository_on_redis(app):
+    from app.models.amenity import Amenity
+    from app.persistence.cache import RedisCache
+    from app.persistence.repository import db
+    client = FakeRedis()
+    repo = cached_amenities(RedisCache(client))
+    amenity_id = repo.add(Amenity(name="Sauna")).id
+    repo.get(amenity_id)
+    assert client.ttls == {f"hbnb:Amenity:{amenity_id}": 60}
+    db.session.expunge_all()
+    assert repo.get(amenity_id).name == "Sauna"
+    assert repo.stats() == {"hits": 1, "misses": 1, "evictions": 3}
+    repo.invalidate(amenity_id)
+    assert client.data == {}
+
+
+# Test cascading facade writes drop the cached copies of what they deleted or changed
+def test_cascades_invalidate_cached_places(app):
+    from app.persistence.repository import db
+    from app.services import facade
+    app.config["CACHE_BACKEND"] = "memory"
+    facade.init_app(app)
+    owner = facade.create_user({"first_name": "Owner", "last_name": "One", "email": "owner@example.com",
+                                "password": "pw"})
+    wifi = facade.create_amenity({"name": "Wi-Fi"})
+    place = facade.create_place({"title": "Loft", "description": None, "price": 80.0,
+                                 "latitude": 10.0, "longitude": 20.0, "owner_id": owner.id})
+    place.amenities.append(wifi)
+    db.session.commit()
+    owner_id, place_id, wifi_id = owner.id, place.id, wifi.id
+
+    db.session.expunge_all()
+    facade.get_place_by_id(place_id).amenities  # Cached with its amenities loaded
+    facade.update_amenity(wifi_id, {"name": "Fast Wi-Fi"})
+    db.session.expunge_all()
+    assert [amenity.name for amenity in facade.get_place_by_id(place_id).amenities] == ["Fast Wi-Fi"]
+
+    facade.delete_user(owner_id)
+    db.session.expunge_all()
+    assert facade.get_place_by_id(place_id) is None
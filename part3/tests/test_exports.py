@@ -0,0 +1,40 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from app.persistence.repository import db
+from app.services import facade
+
+
+# Test NDJSON export streams one object per row, oldest update first
+def test_ndjson_export(app, admin_headers):
+    for name in ("Wi-Fi", "Pool", "Sauna"):
+        facade.create_amenity({"name": name})
+    response = app.test_client().get("/api/v1/exports/amenities", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert response.is_streamed
+    rows = [json.loads(line) for line in response.data.splitlines()]
+    assert [row["name"] for row in rows] == ["Wi-Fi", "Pool", "Sauna"]
+
+
+# Test updated_since only returns rows changed at or after the watermark
+def test_incremental_csv_export(app, admin_headers):
+    old = facade.create_amenity({"name": "Old"})
+    new = facade.create_amenity({"name": "New"})
+    watermark = datetime.utcnow() - timedelta(minutes=5)
+    old.updated_at = watermark - timedelta(days=1)
+    new.updated_at = watermark + timedelta(minutes=1)
+    db.session.commit()
+
+    response = app.test_client().get(
+        f"/api/v1/exports/amenities?format=csv&updated_since={watermark.isoformat()}", headers=admin_headers)
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [row["name"] for row in rows] == ["New"]
+
+
+# Test unknown collections and non-admin callers are refused
+def test_export_errors(app, admin_headers):
+    client = app.test_client()
+    assert client.get("/api/v1/exports/users", headers=admin_headers).status_code == 404
+    assert client.get("/api/v1/exports/places").status_code == 401
@@ -0,0 +1,53 @@
+from app.services import facade
+
+
+def seed():
+    owner = facade.create_user({"first_name": "Owner", "last_name": "One",
+                                "email": "owner@example.com", "password": "pw"})
+    wifi, pool = facade.create_amenity({"name": "Wi-Fi"}), facade.create_amenity({"name": "Pool"})
+    places = [
+        {"title": "Studio", "price": 40.0, "amenities": [wifi.id]},
+        {"title": "Loft", "price": 90.0, "amenities": [wifi.id, pool.id]},
+        {"title": "Villa", "price": 260.0, "amenities": [wifi.id, pool.id]},
+        {"title": "Cabin", "price": 95.0, "amenities": []},
+    ]
+    created, errors = facade.create_places(
+        [dict(place, description=None, latitude=10.0, longitude=20.0) for place in places], owner_id=owner.id)
+    assert not errors
+    return wifi, pool
+
+
+# Test amenity counts and price buckets cover every place matching the filters
+def test_facets_count_filtered_places(app):
+    wifi, pool = seed()
+    response = app.test_client().get("/api/v1/places/facets")
+    assert response.status_code == 200
+    facets = response.get_json()
+    assert facets["total"] == 4
+    assert [(a["name"], a["count"]) for a in facets["amenities"]] == [("Wi-Fi", 3), ("Pool", 2)]
+    assert [(b["min"], b["max"], b["count"]) for b in facets["price_histogram"]] == [
+        (0.0, 50.0, 1), (50.0, 100.0, 2), (250.0, 300.0, 1)]
+
+    filtered = app.test_client().get(f"/api/v1/places/facets?amenities={pool.id}&max_price=100&bucket_width=100")
+    facets = filtered.get_json()
+    assert facets["total"] == 1
+    assert [(a["name"], a["count"]) for a in facets["amenities"]] == [("Pool", 1), ("Wi-Fi", 1)]  # Ties by name
+    assert facets["price_histogram"] == [{"min": 0.0, "max": 100.0, "count": 1}]
+
+
+# Test facets run as GROUP BY queries, never loading places or their amenities
+def test_facets_query_count(app, sql_statements):
+    seed()
+    sql_statements.clear()
+    facade.get_place_facets()
+    assert len(sql_statements) == 3
+
+
+# Test bad bucket widths are rejected, too narrow ones before the histogram query runs
+def test_facets_bucket_validation(app, sql_statements):
+    seed()
+    client = app.test_client()
+    assert client.get("/api/v1/places/facets?bucket_width=0").status_code == 400
+    sql_statements.clear()
+    assert client.get("/api/v1/places/facets?bucket_width=0.5").status_code == 400
+    assert not [statement for statement in sql_statements if "GROUP BY" in statement]
@@ -0,0 +1,73 @@
+from app.services import facade
+
+
+def seed(titles):
+    owner = facade.create_user({"first_name": "Owner", "last_name": "One",
+                                "email": "owner@example.com", "password": "pw"})
+    places = [facade.create_place({"title": title, "description": description, "price": price,
+                                   "latitude": 10.0, "longitude": 20.0, "owner_id": owner.id})
+              for title, description, price in titles]
+    return owner, places
+
+
+# Test words are matched in titles and descriptions, title matches ranking first
+def test_search_ranks_title_matches_first(app):
+    _, (loft, cabin, flat) = seed([
+        ("Cozy loft", "Bright rooms downtown", 90.0),
+        ("Mountain cabin", "A cozy fireplace and a view", 120.0),
+        ("Plain flat", "Close to the station", 60.0),
+    ])
+    response = app.test_client().get("/api/v1/places/search?q=cozy")
+    assert response.status_code == 200
+    results = response.get_json()["places"]
+    assert [place["id"] for place in results] == [loft.id, cabin.id]
+    assert results[0]["score"] >= results[1]["score"]
+
+
+# Test every word must match and price filters combine with the query
+def test_search_combines_words_and_price(app):
+    _, (cheap, pricey) = seed([
+        ("Sunny studio", "Balcony facing the sea", 50.0),
+        ("Sunny villa", "Pool and sea view", 400.0),
+    ])
+    client = app.test_client()
+    both = client.get("/api/v1/places/search?q=sunny+sea").get_json()["places"]
+    assert {place["id"] for place in both} == {cheap.id, pricey.id}
+    assert [p["id"] for p in client.get("/api/v1/places/search?q=sunny+pool").get_json()["places"]] == [pricey.id]
+    priced = client.get("/api/v1/places/search?q=sunny&max_price=100").get_json()["places"]
+    assert [place["id"] for place in priced] == [cheap.id]
+
+
+# Test review writes through the facade keep the index in sync
+def test_review_text_is_indexed(app):
+    _, (place,) = seed([("Quiet room", "Nothing special", 70.0)])
+    guest = facade.create_user({"first_name": "Guest", "last_name": "Two",
+                                "email": "guest@example.com", "password": "pw"})
+    review = facade.create_review({"text": "Wonderful breakfast", "rating": 5,
+                                   "place_id": place.id, "user_id": guest.id})
+    assert [match.id for match, _ in facade.search_places_text("breakfast")] == [place.id]
+
+    facade.update_review(review.id, {"text": "Noisy street"})
+    assert facade.search_places_text("breakfast") == []
+    facade.delete_review(review.id)
+    assert facade.search_places_text("noisy") == []
+
+
+# Test review text far past MySQL's default GROUP_CONCAT limit (1024 bytes) still reaches the index
+def test_long_review_documents_are_complete(app):
+    _, (place,) = seed([("Quiet room", "Nothing special", 70.0)])
+    for i in range(3):
+        guest = facade.create_user({"first_name": "Guest", "last_name": str(i),
+                                    "email": f"guest{i}@example.com", "password": "pw"})
+        facade.create_review({"text": "filler " * 150 + ("hammock" if i == 2 else ""), "rating": 4,
+                              "place_id": place.id, "user_id": guest.id})
+    assert [match.id for match, _ in facade.search_places_text("hammock")] == [place.id]
+
+
+# Test queries without words are rejected and search syntax is treated as text
+def test_search_query_validation(app):
+    seed([("Loft", "Near the park", 80.0)])
+    client = app.test_client()
+    assert client.get("/api/v1/places/search?q=%22%2A").status_code == 400
+    assert client.get('/api/v1/places/search?q=park"*+OR').get_json()["places"] == []
+    assert len(client.get('/api/v1/places/search?q="park"*').get_json()["places"]) == 1
@@ -0,0 +1,83 @@
+from app.persistence.PlaceRepository import RADIUS_OVERFETCH, radius_statement
+from app.services import facade
+from app.utils.geo import (
+    cell_size, encode_geohash, geohash_cover, haversine_km, radius_bounding_box, split_antimeridian
+)
+
+
+def seed(points):
+    """Create one place per (title, latitude, longitude)"""
+    owner = facade.create_user({"first_name": "Owner", "last_name": "One", "email": "owner@example.com",
+                                "password": "pw"})
+    for title, latitude, longitude in points:
+        facade.create_place({"title": title, "description": None, "price": 50.0,
+                             "latitude": latitude, "longitude": longitude, "owner_id": owner.id})
+
+
+# Test geohashes match known values and nest by prefix
+def test_encode_geohash():
+    assert encode_geohash(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert encode_geohash(48.8584, 2.2945, 9).startswith("u09tun")
+    assert encode_geohash(48.8584, 2.2945, 5) == encode_geohash(48.8584, 2.2945)[:5]
+    assert encode_geohash(-33.8568, 151.2153, 1) == "r"
+
+
+# Test a box straddling a cell boundary is covered by the cells on both sides
+def test_cover_includes_neighbour_cells():
+    height, width = cell_size(5)
+    boundary = (int((20.0 + 180.0) / width) + 1) * width - 180.0  # East edge of the cell holding lng 20
+    west, east = encode_geohash(10.0, boundary - width / 8), encode_geohash(10.0, boundary + width / 8)
+    assert west[:5] != east[:5]
+    cover = geohash_cover(10.0, boundary - width / 4, 10.0 + height / 4, boundary + width / 4)
+    assert any(west.startswith(prefix) for prefix in cover)
+    assert any(east.startswith(prefix) for prefix in cover)
+    assert len(cover) <= 16
+
+
+# Test boxes crossing the antimeridian are split in two and covered on both sides
+def test_antimeridian_boxes():
+    assert split_antimeridian(-10.0, 170.0, 10.0, -170.0) == [(-10.0, 170.0, 10.0, 180.0), (-10.0, -180.0, 10.0, -170.0)]
+    min_lat, min_lng, max_lat, max_lng = radius_bounding_box(0.0, 179.9, 50.0)
+    assert min_lng > max_lng  # Wrapped
+    cover = geohash_cover(min_lat, min_lng, max_lat, max_lng)
+    assert any(encode_geohash(0.0, 179.95).startswith(p) for p in cover)
+    assert any(encode_geohash(0.0, -179.95).startswith(p) for p in cover)
+
+
+# Test radius search returns places within the radius, nearest first, across the antimeridian
+def test_radius_search(app):
+    seed([("Center", 0.0, 179.95), ("Across", 0.0, -179.95), ("Near", 0.1, 179.9), ("Far", 5.0, 179.9)])
+    response = app.test_client().get("/api/v1/places/search?lat=0&lng=179.99&radius_km=50")
+    assert response.status_code == 200
+    places = response.get_json()["places"]
+    assert [place["title"] for place in places] == ["Center", "Across", "Near"]
+    distances = [place["distance_km"] for place in places]
+    assert distances == sorted(distances) and distances[-1] <= 50
+    assert abs(distances[0] - haversine_km(0.0, 179.99, 0.0, 179.95)) < 0.01
+
+
+# Test a radius search reads a bounded number of rows, however many places are in range
+def test_radius_search_limits_rows_in_sql(app):
+    seed([(f"Place {i}", 10.0 + i * 0.001, 20.0) for i in range(30)])
+    results = facade.search_places_near(10.0, 20.0, 100.0, limit=5)
+    assert [place.title for place, _ in results] == [f"Place {i}" for i in range(5)]
+    assert len(facade.place_repo.search_radius(10.0, 20.0, 100.0, limit=5)) == 5
+    assert radius_statement(10.0, 20.0, 100.0, limit=5)._limit_clause.value == 5 * RADIUS_OVERFETCH
+
+
+# Test radius and bounding box arguments are validated
+def test_search_validation(app):
+    client = app.test_client()
+    assert client.get("/api/v1/places/search?lat=0&lng=0&radius_km=5000").status_code == 400
+    assert client.get("/api/v1/places/search?lat=95&lng=0&radius_km=5").status_code == 400
+    assert client.get("/api/v1/places/search?min_lat=10&min_lng=0&max_lat=5&max_lng=1").status_code == 400
+
+
+# Test bounding box search, including a box crossing the antimeridian
+def test_bbox_search(app):
+    seed([("East", 1.0, 179.5), ("West", 1.0, -179.5), ("Elsewhere", 1.0, 0.0)])
+    client = app.test_client()
+    crossing = client.get("/api/v1/places/search?min_lat=0&min_lng=179&max_lat=2&max_lng=-179").get_json()
+    assert sorted(place["title"] for place in crossing["places"]) == ["East", "West"]
+    plain = client.get("/api/v1/places/search?min_lat=0&min_lng=-1&max_lat=2&max_lng=1").get_json()
+    assert [place["title"] for place in plain["places"]] == ["Elsewhere"]
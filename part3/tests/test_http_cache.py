@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta, timezone
+from werkzeug.http import http_date
+from app.persistence.repository import db
+from app.persistence.versions import DatabaseVersionStore, collection_versions
+from app.services import facade
+from app.utils.http_cache import CollectionVersions
+
+
+# Test a matching If-None-Match returns 304 with the same validators and no body
+def test_amenity_etag_round_trip(app):
+    amenity = facade.create_amenity({"name": "Wi-Fi"})
+    client = app.test_client()
+
+    first = client.get(f"/api/v1/amenities/{amenity.id}")
+    assert first.status_code == 200
+    assert first.headers["ETag"] and first.headers["Last-Modified"]
+
+    again = client.get(f"/api/v1/amenities/{amenity.id}", headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+    assert again.data == b""
+    assert again.headers["ETag"] == first.headers["ETag"]
+
+    facade.update_amenity(amenity.id, {"name": "Fast Wi-Fi"})
+    changed = client.get(f"/api/v1/amenities/{amenity.id}", headers={"If-None-Match": first.headers["ETag"]})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != first.headers["ETag"]
+
+
+# Test If-Modified-Since against Last-Modified
+def test_if_modified_since(app):
+    amenity = facade.create_amenity({"name": "Pool"})
+    client = app.test_client()
+    later = http_date(datetime.now(timezone.utc) + timedelta(minutes=1))
+    earlier = http_date(datetime.now(timezone.utc) - timedelta(days=1))
+
+    assert client.get(f"/api/v1/amenities/{amenity.id}", headers={"If-Modified-Since": later}).status_code == 304
+    assert client.get(f"/api/v1/amenities/{amenity.id}", headers={"If-Modified-Since": earlier}).status_code == 200
+
+
+# Test collection ETags change on any facade write and depend on the query string
+def test_collection_version_bumped_by_writes(app):
+    sauna = facade.create_amenity({"name": "Sauna"})
+    client = app.test_client()
+    first = client.get("/api/v1/places/?limit=5")
+    assert client.get("/api/v1/places/?limit=5", headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+    assert client.get("/api/v1/places/?limit=6").headers["ETag"] != first.headers["ETag"]
+
+    facade.update_amenity(sauna.id, {"name": "Steam room"})  # Amenities are embedded in place listings
+    assert client.get("/api/v1/places/?limit=5", headers={"If-None-Match": first.headers["ETag"]}).status_code == 200
+
+
+# Test a write in one process changes the stamps every other process hands out
+def test_collection_versions_shared_between_processes(app):
+    assert isinstance(facade.versions.store, DatabaseVersionStore)
+    worker_a, worker_b = (CollectionVersions(DatabaseVersionStore(db.session)) for _ in range(2))
+    etag = worker_b.validators("places")[0]
+    assert worker_a.validators("places")[0] == etag
+    worker_a.bump("places")
+    assert worker_b.validators("places")[0] != etag
+
+
+# Test conditional GETs of collections only read the stamps, even when a collection has none yet
+def test_collection_reads_never_write_stamps(app, sql_statements):
+    client = app.test_client()
+    first = client.get("/api/v1/amenities/")
+    db.session.execute(collection_versions.delete())
+    db.session.commit()
+    sql_statements.clear()
+    missing = client.get("/api/v1/amenities/")
+    assert client.get("/api/v1/amenities/", headers={"If-None-Match": missing.headers["ETag"]}).status_code == 304
+    assert missing.headers["ETag"] != first.headers["ETag"]
+    assert not [s for s in sql_statements if s.lstrip().upper().startswith(("INSERT", "UPDATE"))]
+
+    facade.create_amenity({"name": "Sauna"})  # The first write creates the row
+    assert client.get("/api/v1/amenities/", headers={"If-None-Match": missing.headers["ETag"]}).status_code == 200
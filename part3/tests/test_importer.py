@@ -0,0 +1,62 @@
+import json
+from app.models.place import Place
+from app.models.review import Review
+from app.persistence.repository import db
+from app.services.importer import Importer
+
+
+def write_ndjson(path, records):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+    return str(path)
+
+
+def partner_files(tmp_path, place_count=5):
+    users = write_ndjson(tmp_path / "users.ndjson", [
+        {"id": "u1", "first_name": "Ada", "last_name": "L", "email": "ada@example.com", "password": "pw"},
+        {"id": "u2", "first_name": "Bob", "last_name": "K", "email": "bob@example.com", "password": "pw"},
+    ])
+    (tmp_path / "amenities.csv").write_text("id,name\na1,Wi-Fi\na2,Pool\n")
+    places = write_ndjson(tmp_path / "places.ndjson", [
+        {"id": f"p{i}", "title": f"Place {i}", "price": 50 + i, "latitude": 10.0, "longitude": 20.0,
+         "owner_id": "u1", "amenities": ["a1", "a2"]}
+        for i in range(place_count)
+    ])
+    reviews = write_ndjson(tmp_path / "reviews.ndjson", [
+        {"text": "Great", "rating": 5, "user_id": "u2", "place_id": "p0"},
+        {"text": "Nope", "rating": 9, "user_id": "u2", "place_id": "p1"},  # Fails @validates
+    ])
+    return {"users": users, "amenities": str(tmp_path / "amenities.csv"), "places": places, "reviews": reviews}
+
+
+# Test a full import resolves partner ids, links amenities and keeps rating aggregates
+def test_import_resolves_references(app, tmp_path):
+    results = {stats.kind: stats for stats in Importer("job-1", batch_size=2).run(partner_files(tmp_path))}
+
+    assert [results[kind].imported for kind in ("users", "amenities", "places", "reviews")] == [2, 2, 5, 1]
+    assert results["reviews"].failed == 1
+    assert "Rating must be between 1 and 5" in results["reviews"].errors[0][1]
+    place = db.session.query(Place).filter_by(title="Place 0").one()
+    assert sorted(a.name for a in place.amenities) == ["Pool", "Wi-Fi"]
+    assert (place.review_count, place.rating_count_5) == (1, 1)
+    assert db.session.query(Review).count() == 1
+
+
+# Test rerunning a job resumes after the last committed batch
+def test_import_resumes_from_checkpoint(app, tmp_path):
+    sources = partner_files(tmp_path, place_count=3)
+    Importer("job-2", batch_size=2).run(sources)
+
+    sources = partner_files(tmp_path, place_count=6)  # The partner file grew
+    results = {stats.kind: stats for stats in Importer("job-2", batch_size=2).run(sources)}
+    assert (results["places"].resumed, results["places"].imported) == (3, 3)
+    assert results["users"].imported == 0
+    assert db.session.query(Place).count() == 6
+
+
+# Test the CLI prints a throughput summary
+def test_import_command(app, tmp_path):
+    sources = partner_files(tmp_path)
+    result = app.test_cli_runner().invoke(args=["hbnb", "import", "--users", sources["users"],
+                                                "--amenities", sources["amenities"], "--places", sources["places"]])
+    assert result.exit_code == 0, result.output
+    assert "rows/s" in result.output
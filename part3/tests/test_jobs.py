@@ -0,0 +1,113 @@
+from datetime import datetime
+from sqlalchemy import select, update
+from app.persistence.fulltext import place_search
+from app.persistence.jobs import jobs
+from app.persistence.repository import db
+from app.services import facade
+from app.services.jobs import HANDLERS
+
+
+def use_queue(app, **config):
+    app.config.update({"JOB_QUEUE_BACKEND": "database", **config})
+    facade.jobs.init_app(app)
+
+
+def job_rows():
+    return db.session.execute(select(jobs.c.name, jobs.c.status, jobs.c.attempts, jobs.c.run_at)
+                              .order_by(jobs.c.id)).all()
+
+
+def make_due():
+    db.session.execute(update(jobs).values(run_at=datetime.utcnow()))
+    db.session.commit()
+
+
+# Test writes only queue their search index refresh, which the worker then runs
+def test_write_defers_search_refresh(app):
+    use_queue(app)
+    owner = facade.create_user({"first_name": "Owner", "last_name": "One",
+                                "email": "owner@example.com", "password": "pw"})
+    facade.create_place({"title": "Lighthouse cottage", "description": None, "price": 80.0,
+                         "latitude": 10.0, "longitude": 20.0, "owner_id": owner.id})
+    assert [(name, status) for name, status, _, _ in job_rows()] == [("refresh_search", "pending")]
+    assert facade.search_places_text("lighthouse") == []
+
+    assert facade.jobs.work(once=True) == (1, 0)
+    assert [status for _, status, _, _ in job_rows()] == ["done"]
+    assert len(facade.search_places_text("lighthouse")) == 1
+
+
+# Test failed jobs are retried later with backoff, then given up after max attempts
+def test_retries_with_backoff(app, monkeypatch):
+    use_queue(app, JOB_MAX_ATTEMPTS=2)
+    calls = []
+
+    def flaky(facade, value):
+        calls.append(value)
+        raise RuntimeError("temporary failure")
+
+    monkeypatch.setitem(HANDLERS, "flaky", flaky)
+    facade.jobs.enqueue("flaky", value=1)
+
+    assert facade.jobs.run_pending() == (0, 1)
+    (_, status, attempts, run_at), = job_rows()
+    assert (status, attempts) == ("pending", 1) and run_at > datetime.utcnow()
+    assert facade.jobs.run_pending() == (0, 0)  # Not due yet
+
+    make_due()
+    assert facade.jobs.run_pending() == (0, 1)
+    (_, status, attempts, _), = job_rows()
+    assert (status, attempts) == ("failed", 2)
+    assert calls == [1, 1]
+    assert "temporary failure" in db.session.scalar(select(jobs.c.last_error))
+
+
+# Test enqueueing the same idempotency key twice creates a single job
+def test_idempotency_key(app, monkeypatch):
+    use_queue(app)
+    monkeypatch.setitem(HANDLERS, "noop", lambda facade: None)
+    first = facade.jobs.enqueue("noop", key="welcome:42")
+    assert facade.jobs.enqueue("noop", key="welcome:42") == first
+    assert facade.jobs.enqueue("noop", key="welcome:43") != first
+    assert len(job_rows()) == 2
+
+
+# Test a user who deletes their review and reviews the place again notifies the owner again
+def test_new_review_after_delete_notifies_again(app):
+    use_queue(app)
+    owner, guest = (facade.create_user({"first_name": name, "last_name": "One", "email": f"{name}@example.com",
+                                        "password": "pw"}) for name in ("owner", "guest"))
+    place = facade.create_place({"title": "Loft", "description": None, "price": 80.0,
+                                 "latitude": 10.0, "longitude": 20.0, "owner_id": owner.id})
+    review = facade.create_review({"text": "Nice", "rating": 4, "place_id": place.id, "user_id": guest.id})
+    facade.delete_review(review.id)
+    facade.create_review({"text": "Even better", "rating": 5, "place_id": place.id, "user_id": guest.id})
+    assert [name for name, _, _, _ in job_rows()].count("notify_place_owner") == 2
+
+
+# Test the owner is notified whatever the level of the notifications logger
+def test_notification_sent_with_quiet_logger(app, monkeypatch):
+    import logging
+    import sys
+    facade_module = sys.modules["app.services.facade"]  # The package re-exports the instance under this name
+    use_queue(app)
+    sent = []
+    monkeypatch.setattr(facade_module, "send_owner_notification", lambda email, message: sent.append(email))
+    monkeypatch.setattr(logging.getLogger("hbnb.notifications"), "level", logging.WARNING)
+    owner, guest = (facade.create_user({"first_name": name, "last_name": "One", "email": f"{name}@example.com",
+                                        "password": "pw"}) for name in ("owner", "guest"))
+    place = facade.create_place({"title": "Loft", "description": None, "price": 80.0,
+                                 "latitude": 10.0, "longitude": 20.0, "owner_id": owner.id})
+    facade.create_review({"text": "Nice", "rating": 4, "place_id": place.id, "user_id": guest.id})
+    facade.jobs.run_pending()
+    assert sent == ["owner@example.com"]
+
+
+# Test deleting a user drops the search documents of their own places
+def test_delete_user_refreshes_owned_places(app):
+    owner = facade.create_user({"first_name": "Owner", "last_name": "One",
+                                "email": "owner@example.com", "password": "pw"})
+    facade.create_place({"title": "Lighthouse cottage", "description": None, "price": 80.0,
+                         "latitude": 10.0, "longitude": 20.0, "owner_id": owner.id})
+    facade.delete_user(owner.id)
+    assert db.session.execute(select(place_search.c.place_id)).all() == []
@@ -0,0 +1,84 @@
+import pytest
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.services import facade
+from config import TestingConfig
+
+
+@pytest.fixture(scope="function")
+def memory_app():
+    """Application on the in-memory repositories"""
+    class MemoryConfig(TestingConfig):
+        PERSISTENCE_BACKEND = "memory"
+
+    app = create_app(MemoryConfig)
+    with app.app_context():
+        yield app
+
+
+def seed():
+    owner, guest = (facade.create_user({"first_name": name, "last_name": "One", "email": f"{name}@example.com",
+                                        "password": "pw"}) for name in ("owner", "guest"))
+    place = facade.create_place({"title": "Loft", "description": "Bright", "price": 80.0,
+                                 "latitude": 10.0, "longitude": 20.0, "owner_id": owner.id})
+    review = facade.create_review({"text": "Wonderful breakfast", "rating": 5, "place_id": place.id,
+                                   "user_id": guest.id})
+    return owner, guest, place, review
+
+
+# Test place details show the owner and the reviews created through the API
+def test_place_details_through_the_api(memory_app):
+    owner, guest, _, _ = seed()
+    client = memory_app.test_client()
+    headers = {"Authorization": f"Bearer {create_access_token(identity=owner.id)}"}
+    created = client.post("/api/v1/places/", headers=headers, json={
+        "title": "Cabin", "description": "Quiet", "price": 60.0, "latitude": 11.0, "longitude": 21.0})
+    assert created.status_code == 201
+    place_id = created.get_json()["place"]["id"]
+
+    headers = {"Authorization": f"Bearer {create_access_token(identity=guest.id)}"}
+    response = client.post("/api/v1/reviews/", headers=headers,
+                           json={"text": "Lovely hammock", "rating": 4, "place_id": place_id})
+    assert response.status_code == 201
+
+    details = client.get(f"/api/v1/places/{place_id}").get_json()
+    assert details["owner"]["email"] == "owner@example.com"
+    assert [review["text"] for review in details["reviews"]] == ["Lovely hammock"]
+    assert details["review_count"] == 1
+
+
+# Test full-text search matches review words
+def test_search_matches_reviews(memory_app):
+    _, _, place, review = seed()
+    assert [match.id for match, _ in facade.search_places_text("breakfast")] == [place.id]
+    facade.delete_review(review.id)
+    assert facade.search_places_text("breakfast") == []
+    assert place.reviews == []
+
+
+# Test deleting a user removes their places, the reviews of those places and their own reviews
+def test_delete_user_cascades(memory_app):
+    owner, guest, place, review = seed()
+    other = facade.create_place({"title": "Barn", "description": None, "price": 40.0,
+                                 "latitude": 12.0, "longitude": 22.0, "owner_id": guest.id})
+    own_review = facade.create_review({"text": "Rustic", "rating": 3, "place_id": other.id, "user_id": owner.id})
+
+    facade.delete_user(owner.id)
+    assert facade.get_place_by_id(place.id) is None
+    assert facade.get_review_by_id(review.id) is None
+    assert facade.get_review_by_id(own_review.id) is None
+    assert guest.reviews == [] and other.reviews == []
+    assert [p.id for p, _ in facade.search_places_text("loft")] == []
+
+    facade.delete_user(guest.id)
+    assert facade.get_place_by_id(other.id) is None
+    assert facade.place_repo.get_all() == [] and facade.review_repo.get_all() == []
+
+
+# Test deleting a place removes its reviews from the repository and from their author
+def test_delete_place_cascades(memory_app):
+    owner, guest, place, review = seed()
+    facade.delete_place(place.id)
+    assert facade.get_review_by_id(review.id) is None
+    assert guest.reviews == [] and owner.places == []
+    assert facade.get_review_by_user_and_place(guest.id, place.id) is None
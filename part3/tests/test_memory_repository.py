@@ -0,0 +1,55 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.persistence.repository import InMemoryRepository, HashIndex, SortedIndex
+
+
+class Item:
+    def __init__(self, id, email=None, price=None, user_id=None, place_id=None):
+        self.id = id
+        self.email = email
+        self.price = price
+        self.user_id = user_id
+        self.place_id = place_id
+
+
+def make_repo():
+    return InMemoryRepository(indexes=[HashIndex("email"), SortedIndex("price"), HashIndex("user_id", "place_id")])
+
+# Test equality lookups through the hash index
+def test_hash_index_lookup():
+    repo = make_repo()
+    repo.add(Item("1", email="a@example.com"))
+    repo.add(Item("2", email="b@example.com"))
+    assert repo.get_by_attribute("email", "b@example.com").id == "2"
+    assert repo.get_by_attribute("email", "missing@example.com") is None
+
+# Test composite lookups
+def test_composite_index_lookup():
+    repo = make_repo()
+    repo.add(Item("1", user_id="u1", place_id="p1"))
+    repo.add(Item("2", user_id="u1", place_id="p2"))
+    assert [item.id for item in repo.find(user_id="u1", place_id="p2")] == ["2"]
+    assert repo.find(user_id="u2", place_id="p1") == []
+
+# Test range lookups come back ordered by the indexed value
+def test_sorted_index_range():
+    repo = make_repo()
+    for i, price in enumerate([50, 10, 300, 120, 75]):
+        repo.add(Item(str(i), price=price))
+    assert [item.price for item in repo.find_range("price", 50, 150)] == [50, 75, 120]
+    assert [item.price for item in repo.find_range("price", high=20)] == [10]
+
+# Test indexes follow updates and deletes
+def test_indexes_follow_writes():
+    repo = make_repo()
+    repo.add(Item("1", email="old@example.com", price=10))
+    repo.update("1", {"email": "new@example.com", "price": 99})
+    assert repo.get_by_attribute("email", "old@example.com") is None
+    assert repo.get_by_attribute("email", "new@example.com").id == "1"
+    assert [item.id for item in repo.find_range("price", 90, 100)] == ["1"]
+    repo.delete("1")
+    assert repo.find_range("price") == []
+    assert repo.get_by_attribute("email", "new@example.com") is None
@@ -0,0 +1,49 @@
+import logging
+from app.persistence.repository import db
+from app.services import facade
+from app.utils.metrics import metrics
+
+
+def scrape(app):
+    response = app.test_client().get("/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    return response.get_data(as_text=True)
+
+
+def sample(text, prefix):
+    """Value of the exposition line starting with prefix"""
+    return next(float(line.rsplit(" ", 1)[1]) for line in text.splitlines() if line.startswith(prefix))
+
+
+# Test API requests are counted per route template with their SQL statements
+def test_request_and_sql_metrics(app):
+    amenity = facade.create_amenity({"name": "Wi-Fi"})
+    route = 'route="/api/v1/amenities/<amenity_id>"'
+    before = metrics.requests.values.get(("GET", "/api/v1/amenities/<amenity_id>", "200"), 0)
+
+    app.test_client().get(f"/api/v1/amenities/{amenity.id}")
+    text = scrape(app)
+    assert sample(text, f'hbnb_requests_total{{method="GET",{route},status="200"}}') == before + 1
+    assert sample(text, f"hbnb_request_sql_statements_count{{{route}}}") >= 1
+    assert sample(text, f'hbnb_request_phase_seconds_count{{{route},phase="serialization"}}') >= 1
+    assert sample(text, 'hbnb_sql_statements_total{engine="primary"}') > 0
+    assert 'hbnb_pool_in_use{pool="primary"}' in text
+
+
+# Test bcrypt time is recorded when a user is created
+def test_bcrypt_metrics(app):
+    before = metrics.bcrypt_seconds.series.get(("hash",), [0])[-1]
+    facade.create_user({"first_name": "A", "last_name": "B", "email": "ab@example.com", "password": "pw"})
+    assert metrics.bcrypt_seconds.series[("hash",)][-1] == before + 1
+
+
+# Test requests over SLOW_REQUEST_MS are logged with their SQL
+def test_slow_request_log(app, caplog):
+    app.config["SLOW_REQUEST_MS"] = 0.001
+    amenity_id = facade.create_amenity({"name": "Pool"}).id
+    db.session.expunge_all()  # The request shares this session: make it query the amenity
+    with caplog.at_level(logging.WARNING, logger="hbnb.slow_requests"):
+        app.test_client().get(f"/api/v1/amenities/{amenity_id}")
+    assert f"GET /api/v1/amenities/{amenity_id} took" in caplog.text
+    assert "SELECT" in caplog.text and "amenities" in caplog.text
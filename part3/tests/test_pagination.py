@@ -0,0 +1,110 @@
+import sys
+import os
+from datetime import datetime
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.utils.pagination import (
+    encode_cursor, decode_cursor, clamp_page_size, InvalidCursor, MAX_PAGE_SIZE, DEFAULT_PAGE_SIZE
+)
+
+# Test cursor round trip for numeric sort keys
+def test_cursor_round_trip_price():
+    token = encode_cursor("-price", 120.5, "abc")
+    assert decode_cursor(token, "-price") == (120.5, "abc")
+
+# Test cursor round trip for datetime sort keys
+def test_cursor_round_trip_created_at():
+    created = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    token = encode_cursor("created_at", created, "xyz")
+    assert decode_cursor(token, "created_at") == (created, "xyz")
+
+# Test a cursor cannot be replayed against another sort order
+def test_cursor_sort_mismatch():
+    token = encode_cursor("price", 10.0, "abc")
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token, "title")
+
+# Test garbage cursors are rejected
+def test_cursor_malformed():
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor", "price")
+
+# Test the page size cap
+def test_page_size_is_clamped():
+    assert clamp_page_size(None) == DEFAULT_PAGE_SIZE
+    assert clamp_page_size(0) == 1
+    assert clamp_page_size(10_000) == MAX_PAGE_SIZE
+
+
+SORTS = ("price", "-price", "created_at", "-created_at", "title", "-title")
+
+
+def seed_listing():
+    """Places with tied prices, titles and creation times; all but the cabins priced 80 or more offer a pool"""
+    from sqlalchemy import update
+    from app.models.user import User
+    from app.models.place import Place
+    from app.models.amenity import Amenity
+    from app.persistence.repository import db
+    owner = User(first_name="Owner", last_name="One", email="owner@example.com", password="pw")
+    pool = Amenity(name="Pool")
+    db.session.add_all([owner, pool])
+    db.session.flush()
+    places = []
+    for title, price in [("Loft", 50.0), ("Cabin", 50.0), ("Loft", 80.0), ("Barn", 80.0),
+                         ("Villa", 80.0), ("Cabin", 120.0), ("Studio", 200.0)]:
+        place = Place(title=title, description=None, price=price, latitude=10.0, longitude=20.0, owner_id=owner.id)
+        if price >= 80 and title != "Cabin":
+            place.amenities.append(pool)
+        db.session.add(place)
+        places.append(place)
+    db.session.commit()
+    created = datetime(2024, 1, 1)
+    for i, place in enumerate(places):
+        db.session.execute(update(Place).where(Place.id == place.id).values(created_at=created.replace(day=1 + i // 2)))
+    db.session.commit()
+    db.session.expire_all()
+    return places, pool.id
+
+
+def walk(client, query):
+    """Ids of every page of a listing, following next_cursor"""
+    ids, cursor = [], None
+    while True:
+        response = client.get(f"/api/v1/places/?{query}" + (f"&cursor={cursor}" if cursor else ""))
+        assert response.status_code == 200
+        body = response.get_json()
+        ids += [place["id"] for place in body["places"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+# Test keyset pages under every sort order visit each place exactly once, in order, ties broken by id
+@pytest.mark.parametrize("sort", SORTS)
+def test_pages_walk_every_row_once(app, sort):
+    places, _ = seed_listing()
+    field = sort.lstrip("-")
+    expected = sorted(places, key=lambda place: (getattr(place, field), place.id), reverse=sort.startswith("-"))
+    assert walk(app.test_client(), f"sort={sort}&limit=2") == [place.id for place in expected]
+
+
+# Test price and amenity filters hold on every page after the first
+def test_filters_combine_with_cursor(app):
+    places, pool_id = seed_listing()
+    ids = walk(app.test_client(), f"sort=-price&limit=1&min_price=60&max_price=150&amenities={pool_id}")
+    pooled = [p for p in places if 60 <= p.price <= 150 and p.title != "Cabin"]
+    expected = sorted(pooled, key=lambda p: (p.price, p.id), reverse=True)
+    assert ids == [place.id for place in expected]
+
+
+# Test a cursor issued for one sort order is refused under another
+def test_cursor_from_another_sort_is_rejected(app):
+    seed_listing()
+    client = app.test_client()
+    cursor = client.get("/api/v1/places/?sort=price&limit=2").get_json()["next_cursor"]
+    assert client.get(f"/api/v1/places/?sort=title&limit=2&cursor={cursor}").status_code == 400
+    assert client.get(f"/api/v1/places/?sort=-price&limit=2&cursor={cursor}").status_code == 400
+    assert client.get("/api/v1/places/?sort=price&cursor=garbage").status_code == 400
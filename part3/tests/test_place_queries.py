@@ -0,0 +1,75 @@
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.models.amenity import Amenity
+from app.persistence.repository import db
+from app.services import facade
+
+
+def seed_places(count):
+    """Create `count` places, each with 2 amenities and 3 reviews from distinct users."""
+    owner = User(first_name="Owner", last_name="One", email=f"owner{count}@example.com", password="pw")
+    reviewers = [User(first_name="Rev", last_name=str(i), email=f"rev{count}_{i}@example.com", password="pw")
+                 for i in range(3)]
+    wifi, pool = Amenity(name=f"Wi-Fi {count}"), Amenity(name=f"Pool {count}")
+    db.session.add_all([owner, wifi, pool, *reviewers])
+    db.session.flush()
+    place_ids = []
+    for i in range(count):
+        place = Place(title=f"Place {i}", description="Nice", price=50.0 + i,
+                      latitude=10.0, longitude=20.0, owner_id=owner.id)
+        place.amenities.extend([wifi, pool])
+        db.session.add(place)
+        db.session.flush()
+        for reviewer in reviewers:
+            db.session.add(Review(text="Great", rating=4, place_id=place.id, user_id=reviewer.id))
+        place_ids.append(place.id)
+    db.session.commit()
+    db.session.expunge_all()
+    return place_ids
+
+
+def count_listing_queries(sql_statements):
+    sql_statements.clear()
+    places, _ = facade.get_all_places(limit=100, with_relations=True)
+    for place in places:
+        _ = place.owner.email, [a.name for a in place.amenities], [r.text for r in place.reviews]
+    return len(places), len(sql_statements)
+
+# Test the listing issues the same number of queries for 2 and 20 places
+def test_place_listing_query_count_is_constant(app, sql_statements):
+    seed_places(2)
+    small_rows, small_count = count_listing_queries(sql_statements)
+    db.session.expunge_all()
+    seed_places(18)
+    large_rows, large_count = count_listing_queries(sql_statements)
+    assert (small_rows, large_rows) == (2, 20)
+    assert small_count == large_count
+
+# Test the place detail loads owner, amenities and reviews without lazy loads
+def test_place_detail_query_count_is_constant(app, sql_statements):
+    place_id = seed_places(3)[0]
+    sql_statements.clear()
+    place = facade.get_place_details(place_id)
+    loaded = len(sql_statements)
+    _ = place.owner.email, [a.name for a in place.amenities], [r.text for r in place.reviews]
+    assert len(place.reviews) == 3
+    assert len(sql_statements) == loaded
+
+# Test the create and update endpoints answer with the stored place
+def test_place_create_and_update(app):
+    from flask_jwt_extended import create_access_token
+    owner = facade.create_user({"first_name": "Owner", "last_name": "One", "email": "owner@example.com",
+                                "password": "pw"})
+    headers = {"Authorization": f"Bearer {create_access_token(identity=owner.id)}"}
+    client = app.test_client()
+    created = client.post("/api/v1/places/", headers=headers, json={
+        "title": "Loft", "description": "Bright", "price": 90.0, "latitude": 48.85, "longitude": 2.35})
+    assert created.status_code == 201
+    place_id = created.get_json()["place"]["id"]
+    assert created.get_json()["place"]["owner_id"] == owner.id
+
+    updated = client.put(f"/api/v1/places/{place_id}", headers=headers, json={"price": 110.0})
+    assert updated.status_code == 200
+    assert updated.get_json()["place"]["price"] == 110.0
+    assert facade.get_place_by_id(place_id).price == 110.0
@@ -0,0 +1,102 @@
+import re
+import pytest
+from sqlalchemy import event, text
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.models.amenity import Amenity
+from app.persistence.repository import db
+from app.persistence.migrations import upgrade
+from app.services import facade
+
+# "SCAN <table>" in SQLite's plan reads every row, with or without "USING INDEX" (which only sets the order);
+# indexed lookups show as "SEARCH"
+FULL_SCAN = re.compile(r"^SCAN (\w+)")
+
+# Tables the hot paths may scan in full
+ALLOWED_SCANS = frozenset()
+
+
+def capture(fn):
+    """Run fn and return the (statement, parameters) pairs it sent to the database"""
+    captured = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        fn()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+    return captured
+
+
+def query_plan(statement, parameters):
+    """SQLite's plan steps for a statement run with these bound parameters"""
+    with db.engine.connect() as connection:
+        return [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+
+
+def full_scans(statements):
+    """Tables read with a full scan by any of the statements"""
+    scans = []
+    for statement, parameters in statements:
+        for step in query_plan(statement, parameters):
+            match = FULL_SCAN.match(step)
+            if match and match.group(1) not in ALLOWED_SCANS:
+                scans.append((match.group(1), statement))
+    return scans
+
+
+def seed():
+    owner = User(first_name="Owner", last_name="One", email="owner@example.com", password="pw")
+    guest = User(first_name="Guest", last_name="Two", email="guest@example.com", password="pw")
+    wifi = Amenity(name="Wi-Fi")
+    db.session.add_all([owner, guest, wifi])
+    db.session.flush()
+    place = Place(title="Loft", description="Bright", price=80.0, latitude=48.85, longitude=2.35, owner_id=owner.id)
+    place.amenities.append(wifi)
+    db.session.add(place)
+    db.session.flush()
+    db.session.add(Review(text="Lovely", rating=5, place_id=place.id, user_id=guest.id))
+    db.session.commit()
+    return owner.id, guest.id, place.id, wifi.id
+
+# Test hot lookups are all served by indexes
+def test_hot_queries_use_indexes(app):
+    owner_id, guest_id, place_id, amenity_id = seed()
+    db.session.expunge_all()
+
+    def hot_paths():
+        facade.get_review_by_user_and_place(guest_id, place_id)
+        db.session.query(Place).filter(Place.owner_id == owner_id).all()
+        db.session.query(Review).filter(Review.place_id == place_id).all()
+        db.session.execute(text("SELECT place_id FROM place_amenity WHERE amenity_id = :a"), {"a": amenity_id}).all()
+        facade.search_places_in_bbox(48.8, 2.3, 48.9, 2.4)
+        facade.search_places_near(48.85, 2.35, 5)
+
+    statements = capture(hot_paths)
+    assert statements
+    assert full_scans(statements) == []
+
+# Test the bounding-box search reads the geohash ranges, never the whole table in key order
+def test_bbox_search_uses_geohash_ranges(app):
+    seed()
+    (statement, parameters), = capture(lambda: facade.search_places_in_bbox(48.8, 2.3, 48.9, 2.4))
+    steps = query_plan(statement, parameters)
+    assert any(step.startswith("SEARCH places USING INDEX ix_places_geohash") for step in steps)
+    assert not [step for step in steps if step.startswith("SCAN places")]
+
+# Test the database rejects a second review of the same place by the same user
+def test_one_review_per_user_and_place(app):
+    _, guest_id, place_id, _ = seed()
+    db.session.add(Review(text="Again", rating=4, place_id=place_id, user_id=guest_id))
+    with pytest.raises(Exception):
+        db.session.commit()
+    db.session.rollback()
+
+# Test migrations are idempotent
+def test_upgrade_twice_is_a_no_op(app):
+    assert upgrade(db.engine) == []
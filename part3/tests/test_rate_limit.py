@@ -0,0 +1,54 @@
+from app.utils.rate_limit import MemoryTokenBuckets, limiter
+
+
+def enable(app, **config):
+    app.config.update({"RATE_LIMIT_ENABLED": True, **config})
+    limiter.init_app(app)
+
+
+# Test a bucket allows its burst, then refills at its rate
+def test_token_bucket_refills():
+    now = [0.0]
+    buckets = MemoryTokenBuckets(clock=lambda: now[0])
+    assert [buckets.take("k", rate=1, burst=3)[0] for _ in range(4)] == [True, True, True, False]
+    now[0] += 1.0
+    assert buckets.take("k", rate=1, burst=3) == (True, 0.0)
+    assert buckets.take("other", rate=1, burst=3) == (True, 2.0)
+
+
+# Test logins past the auth burst get 429 while other namespaces keep their own buckets
+def test_login_rate_limited(app):
+    enable(app, RATE_LIMITS={"auth": (0.01, 2), "default": (100, 100)})
+    client = app.test_client()
+    credentials = {"email": "nobody@example.com", "password": "wrong"}
+    statuses = [client.post("/api/v1/auth/login", json=credentials).status_code for _ in range(3)]
+    assert statuses == [401, 401, 429]
+    refused = client.post("/api/v1/auth/login", json=credentials)
+    assert int(refused.headers["Retry-After"]) > 0
+    assert refused.headers["X-RateLimit-Remaining"] == "0"
+
+    listing = client.get("/api/v1/amenities/")
+    assert listing.status_code == 200
+    assert listing.headers["X-RateLimit-Limit"] == "100"
+
+
+# Test writes use the stricter ":write" rule and clients with tokens get their own buckets
+def test_write_rule_per_identity(app, admin_headers):
+    enable(app, RATE_LIMITS={"default": (100, 100), "default:write": (0.01, 1)})
+    client = app.test_client()
+    assert client.post("/api/v1/amenities/", json={"name": "Wi-Fi"}, headers=admin_headers).status_code == 201
+    assert client.post("/api/v1/amenities/", json={"name": "Pool"}, headers=admin_headers).status_code == 429
+    assert client.post("/api/v1/amenities/", json={"name": "Pool"}).status_code != 429  # Anonymous: IP bucket
+    assert client.get("/api/v1/amenities/", headers=admin_headers).status_code == 200
+
+
+# Test requests over the in-flight cap are shed with 503
+def test_admission_control_sheds_load(app):
+    enable(app, RATE_LIMIT_ENABLED=False, ADMISSION_MAX_IN_FLIGHT=1, ADMISSION_QUEUE_TIMEOUT=0)
+    client = app.test_client()
+    assert limiter.admission.enter()
+    shed = client.get("/api/v1/amenities/")
+    assert shed.status_code == 503 and shed.headers["Retry-After"] == "1"
+    limiter.admission.leave()
+    assert client.get("/api/v1/amenities/").status_code == 200
+    assert limiter.admission.in_flight == 0 and limiter.admission.shed == 1
@@ -0,0 +1,72 @@
+from sqlalchemy import update
+from app.models.place import Place
+from app.persistence.repository import db
+from app.services import facade
+
+
+def seed(reviewers=3):
+    """A place and `reviewers` users who have not reviewed it yet"""
+    owner = facade.create_user({"first_name": "Owner", "last_name": "One", "email": "owner@example.com",
+                                "password": "pw"})
+    users = [facade.create_user({"first_name": "Guest", "last_name": str(i), "email": f"guest{i}@example.com",
+                                 "password": "pw"}) for i in range(reviewers)]
+    place = facade.create_place({"title": "Loft", "description": None, "price": 80.0,
+                                 "latitude": 10.0, "longitude": 20.0, "owner_id": owner.id})
+    return place.id, [user.id for user in users]
+
+
+def aggregates(place_id):
+    db.session.expire_all()  # Read the stored counters, not the session's copy
+    place = facade.get_place_by_id(place_id)
+    return place.review_count, place.rating_sum, place.rating_histogram, place.average_rating
+
+
+# Test the counters follow review create, update and delete
+def test_aggregates_follow_review_writes(app):
+    place_id, (ada, bob, cyd) = seed()
+    first = facade.create_review({"text": "Great", "rating": 5, "place_id": place_id, "user_id": ada})
+    facade.create_review({"text": "Fine", "rating": 3, "place_id": place_id, "user_id": bob})
+    assert aggregates(place_id) == (2, 8, {"1": 0, "2": 0, "3": 1, "4": 0, "5": 1}, 4.0)
+
+    facade.update_review(first.id, {"rating": 4})
+    assert aggregates(place_id) == (2, 7, {"1": 0, "2": 0, "3": 1, "4": 1, "5": 0}, 3.5)
+
+    facade.update_review(first.id, {"text": "Still great"})  # Text only: counters unchanged
+    assert aggregates(place_id)[:2] == (2, 7)
+
+    facade.delete_review(first.id)
+    assert aggregates(place_id) == (1, 3, {"1": 0, "2": 0, "3": 1, "4": 0, "5": 0}, 3.0)
+
+    created, errors = facade.create_reviews([{"text": "Meh", "rating": 2, "place_id": place_id}], user_id=cyd)
+    assert created and not errors
+    assert aggregates(place_id) == (2, 5, {"1": 0, "2": 1, "3": 1, "4": 0, "5": 0}, 2.5)
+    assert facade.reconcile_rating_aggregates(fix=False) == []
+
+
+# Test deleting a reviewer takes their ratings out of the places they reviewed
+def test_aggregates_follow_reviewer_deletion(app):
+    place_id, (ada, bob, _) = seed()
+    facade.create_review({"text": "Great", "rating": 5, "place_id": place_id, "user_id": ada})
+    facade.create_review({"text": "Fine", "rating": 3, "place_id": place_id, "user_id": bob})
+    facade.delete_user(ada)
+    assert aggregates(place_id) == (1, 3, {"1": 0, "2": 0, "3": 1, "4": 0, "5": 0}, 3.0)
+    assert facade.reconcile_rating_aggregates(fix=False) == []
+
+
+# Test reconcile reports counters that drifted from the reviews and writes the true values back
+def test_reconcile_finds_and_fixes_drift(app):
+    place_id, (ada, bob, _) = seed()
+    facade.create_review({"text": "Great", "rating": 5, "place_id": place_id, "user_id": ada})
+    facade.create_review({"text": "Good", "rating": 4, "place_id": place_id, "user_id": bob})
+    db.session.execute(update(Place).where(Place.id == place_id).values(review_count=7, rating_count_5=0))
+    db.session.commit()
+
+    (drifted, stored, expected), = facade.reconcile_rating_aggregates(fix=False)
+    assert drifted == place_id
+    assert (stored["review_count"], stored["rating_count_5"]) == (7, 0)
+    assert (expected["review_count"], expected["rating_count_5"], expected["rating_sum"]) == (2, 1, 9)
+    assert aggregates(place_id)[0] == 7  # A dry run changes nothing
+
+    assert len(facade.reconcile_rating_aggregates()) == 1
+    assert aggregates(place_id) == (2, 9, {"1": 0, "2": 0, "3": 0, "4": 1, "5": 1}, 4.5)
+    assert facade.reconcile_rating_aggregates(fix=False) == []
@@ -0,0 +1,109 @@
+import threading
+import time
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import create_engine, text
+from app import create_app
+from app.models.amenity import Amenity
+from app.persistence.repository import db
+from app.persistence.migrations import upgrade
+from app.persistence.routing import PRIMARY_UNTIL_COOKIE, ReplicaSet
+from app.services import facade
+from config import TestingConfig
+
+
+@pytest.fixture(scope="function")
+def replica_app(tmp_path):
+    """Primary and replica as two SQLite files; the replica is filled by hand instead of replication"""
+    class ReplicaConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'primary.sqlite3'}"
+        SQLALCHEMY_REPLICA_URIS = [f"sqlite:///{tmp_path / 'replica.sqlite3'}"]
+
+    app = create_app(ReplicaConfig)
+    with app.app_context():
+        upgrade(db.engine)
+        replica = app.extensions["hbnb_replicas"].engines[0]
+        upgrade(replica)
+        with replica.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO amenities (id, name, created_at, updated_at) "
+                "VALUES (9001, 'Sauna', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"))
+    yield app
+
+
+# Test read-only facade calls are served by the replica, other queries by the primary
+def test_reads_go_to_replica(replica_app):
+    with replica_app.app_context():
+        assert db.session.get(Amenity, 9001) is None  # Before the identity map holds the replica row
+        assert facade.get_amenity_by_id(9001).name == "Sauna"
+        db.session.remove()
+
+
+# Test a request that wrote keeps reading from the primary
+def test_read_your_writes(replica_app):
+    with replica_app.app_context():
+        amenity = facade.create_amenity({"name": "Pool"})
+        assert facade.get_amenity_by_id(amenity.id) is not None
+        assert facade.get_amenity_by_id(9001) is None
+        db.session.remove()
+
+
+# Test round-robin skips a replica that fails its health check and falls back to None
+def test_replica_set_skips_unhealthy_engines(tmp_path):
+    good = create_engine(f"sqlite:///{tmp_path / 'good.sqlite3'}")
+    bad = create_engine(f"sqlite:///{tmp_path / 'missing' / 'bad.sqlite3'}")  # Directory does not exist
+    now = [0.0]
+    replicas = ReplicaSet([good, bad], check_interval=5, retry_after=30, clock=lambda: now[0])
+
+    assert [replicas.choose() for _ in range(4)] == [good, good, good, good]
+    assert [entry["up"] for entry in replicas.status()] == [True, False]
+
+    now[0] = 31.0  # The bad replica is retried, and still fails
+    assert replicas.choose() is good
+
+    only_bad = ReplicaSet([bad], clock=lambda: now[0])
+    assert only_bad.choose() is None
+
+
+# Test a client that wrote keeps reading from the primary on its next requests, other clients do not
+def test_read_your_writes_follows_the_client(replica_app):
+    with replica_app.app_context():
+        headers = {"Authorization": f"Bearer {create_access_token('admin-1', additional_claims={'is_admin': True})}"}
+    writer, other = replica_app.test_client(), replica_app.test_client()
+    created = writer.post("/api/v1/amenities/", headers=headers, json={"name": "Pool"})
+    assert created.status_code == 201
+    assert writer.get_cookie(PRIMARY_UNTIL_COOKIE) is not None
+    amenity_id = created.get_json()["amenity"]["id"]
+
+    assert writer.get(f"/api/v1/amenities/{amenity_id}").status_code == 200
+    assert other.get(f"/api/v1/amenities/{amenity_id}").status_code == 404  # Not replicated yet
+
+    writer.set_cookie(PRIMARY_UNTIL_COOKIE, f"{time.time() - 1:.3f}")  # Expired
+    assert writer.get(f"/api/v1/amenities/{amenity_id}").status_code == 404
+    writer.set_cookie(PRIMARY_UNTIL_COOKIE, f"{time.time() + 3600:.3f}")  # Beyond the TTL, ignored
+    assert writer.get(f"/api/v1/amenities/{amenity_id}").status_code == 404
+
+
+# Test a slow health check does not hold up threads choosing another replica
+def test_health_check_runs_outside_the_lock(tmp_path):
+    probing, release = threading.Event(), threading.Event()
+
+    class SlowEngine:
+        def connect(self):
+            probing.set()
+            release.wait(5)
+            return create_engine("sqlite://").connect()
+
+    good = create_engine(f"sqlite:///{tmp_path / 'good.sqlite3'}")
+    replicas = ReplicaSet([SlowEngine(), good])
+    replicas._checked_at[1] = replicas._clock()  # Checked recently, no probe due
+    slow = threading.Thread(target=replicas.choose)
+    slow.start()
+    assert probing.wait(5)
+    chosen = []
+    fast = threading.Thread(target=lambda: chosen.append(replicas.choose()))
+    fast.start()
+    fast.join(1)
+    release.set()
+    slow.join()
+    assert chosen == [good]  # Answered while the probe was still running
@@ -0,0 +1,42 @@
+import threading
+import time
+import pytest
+from app.services import facade
+from app.utils.security import HasherBusy, PasswordHasher, hasher
+
+
+# Test a hash its caller gave up on keeps its slot until bcrypt finishes
+def test_timed_out_hash_keeps_its_slot():
+    pool = PasswordHasher(rounds=4, max_workers=1, max_pending=1, timeout=0.05)
+    release = threading.Event()
+    with pytest.raises(HasherBusy, match="timed out"):
+        pool._run("hash", release.wait)
+    with pytest.raises(HasherBusy, match="in progress"):
+        pool.hash("pw")  # The first task still runs
+    release.set()
+    deadline = time.monotonic() + 5
+    while pool._slots._value == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.verify(pool.hash("pw"), "pw")
+
+
+# Test a saturated hashing pool answers 503 with Retry-After instead of 500
+def test_hasher_busy_is_503(app, admin_headers, monkeypatch):
+    def busy(password):
+        raise HasherBusy("Too many password operations in progress.")
+
+    monkeypatch.setattr(hasher, "hash", busy)
+    response = app.test_client().post("/api/v1/users/", headers=admin_headers, json={
+        "first_name": "Ada", "last_name": "L", "email": "ada@example.com", "password": "pw"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+# Test logging in upgrades a hash made with another bcrypt cost
+def test_login_rehashes_old_cost(app, monkeypatch):
+    facade.create_user({"first_name": "Ada", "last_name": "L", "email": "ada@example.com", "password": "pw"})
+    monkeypatch.setattr(hasher, "rounds", hasher.rounds + 1)
+    response = app.test_client().post("/api/v1/auth/login", json={"email": "ada@example.com", "password": "pw"})
+    assert response.status_code == 200
+    stored = facade.get_user_by_email("ada@example.com").password
+    assert int(stored.split("$")[2]) == hasher.rounds and not hasher.needs_rehash(stored)
@@ -0,0 +1,44 @@
+import json
+from datetime import datetime
+from flask_restx import marshal
+from app.api.v1.places import place_detail_model, serialize_place_detail, serialize_place
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.utils.serialization import ResponseEncoder, compile_tuple
+
+
+def make_place():
+    owner = User(first_name="Ada", last_name="L", email="ada@example.com", password="pw")
+    owner.id = "owner-1"
+    place = Place(title="Loft", description="Bright", price=120, latitude=48.85, longitude=2.35, owner_id=owner.id)
+    place.id = "place-1"
+    place.created_at = place.updated_at = datetime(2024, 5, 1, 12, 30, 15, 250)
+    place.owner = owner
+    amenity = Amenity(name="Wi-Fi")
+    amenity.id = "amenity-1"
+    place.amenities.append(amenity)
+    return place
+
+
+# Test the compiled serializer matches flask_restx marshalling field for field
+def test_compiled_serializer_matches_marshal(app):
+    place = make_place()
+    assert serialize_place_detail(place) == json.loads(json.dumps(marshal(place, place_detail_model)))
+
+
+# Test every encoder writes the compiled summary exactly like to_dict + json
+def test_encoders_match_to_dict(app):
+    place = make_place()
+    expected = json.loads(json.dumps(place.to_dict()))
+    for backend in ("json", "orjson", "msgspec"):
+        try:
+            encoder = ResponseEncoder(backend)
+        except RuntimeError:  # Not installed here
+            continue
+        assert json.loads(encoder.dumps(serialize_place(place))) == expected, backend
+
+
+# Test tuple rows are serialized by position
+def test_compile_tuple():
+    assert compile_tuple("row", ["id", "price"])(("p1", 10.0)) == {"id": "p1", "price": 10.0}
@@ -0,0 +1,77 @@
+import gzip
+from app.persistence.repository import db
+from app.services import facade
+
+
+def seed_places(count):
+    """Create `count` places with 2 amenities and a 4-star review each"""
+    owner, reviewer = (facade.create_user({"first_name": name, "last_name": "One", "email": f"{name}@example.com",
+                                           "password": "pw"}) for name in ("Owner", "Reviewer"))
+    amenity_ids, _ = facade.create_amenities([{"name": "Wi-Fi"}, {"name": "Pool"}])
+    place_ids, errors = facade.create_places([
+        {"title": f"Place {i}", "description": "Nice " * 40, "price": 50.0 + i,
+         "latitude": 10.0, "longitude": 20.0, "amenities": amenity_ids}
+        for i in range(count)], owner_id=owner.id)
+    assert not errors
+    facade.create_reviews([{"text": "Great", "rating": 4, "place_id": place_id} for place_id in place_ids],
+                          user_id=reviewer.id)
+    db.session.expunge_all()
+
+
+# Test ?fields= returns only those attributes and the SQL reads only their columns
+def test_fields_select_only_requested_columns(app, sql_statements):
+    seed_places(3)
+    sql_statements.clear()
+    response = app.test_client().get("/api/v1/places/?fields=id,title,price,average_rating")
+    assert response.status_code == 200
+    places = response.get_json()["places"]
+    assert len(places) == 3
+    assert set(places[0]) == {"id", "title", "price", "average_rating"}
+    assert places[0]["average_rating"] == 4.0
+    place_select = next(s for s in sql_statements if "FROM places" in s)
+    assert "description" not in place_select and "latitude" not in place_select
+    data_selects = [s for s in sql_statements if s.lstrip().startswith("SELECT") and "collection_versions" not in s]
+    assert len(data_selects) == 1  # No relationship loads
+
+
+# Test ?include= expands only the requested relationships, whatever the page size
+def test_include_expands_relationships(app, sql_statements):
+    seed_places(4)
+    client = app.test_client()
+    sql_statements.clear()
+    places = client.get("/api/v1/places/?fields=title&include=owner").get_json()["places"]
+    assert set(places[0]) == {"title", "owner"}
+    assert places[0]["owner"]["first_name"] == "Owner"
+    assert len([s for s in sql_statements if "collection_versions" not in s]) == 2  # Besides the ETag stamp
+
+    db.session.expunge_all()
+    full = client.get("/api/v1/places/?include=amenities").get_json()["places"][0]
+    assert "description" in full and len(full["amenities"]) == 2 and "reviews" not in full
+    default = client.get("/api/v1/places/").get_json()["places"][0]
+    assert {"owner", "amenities", "reviews", "description"} <= set(default)
+
+
+# Test unknown fields or relationships are rejected
+def test_unknown_fields_rejected(app):
+    client = app.test_client()
+    assert client.get("/api/v1/places/?fields=title,password").status_code == 400
+    assert client.get("/api/v1/places/?include=bookings").status_code == 400
+
+
+# Test responses are gzipped above the size threshold when the client accepts it
+def test_listing_compression(app):
+    seed_places(20)
+    client = app.test_client()
+    compressed = client.get("/api/v1/places/", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+    assert compressed.headers["ETag"].startswith('W/"')
+    plain = client.get("/api/v1/places/")
+    assert "Content-Encoding" not in plain.headers
+    assert gzip.decompress(compressed.data) == plain.data
+
+    revalidated = client.get("/api/v1/places/", headers={"Accept-Encoding": "gzip",
+                                                         "If-None-Match": compressed.headers["ETag"]})
+    assert revalidated.status_code == 304
+    small = client.get("/api/v1/places/?fields=id&limit=1", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
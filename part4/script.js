@@ -93,10 +93,15 @@ async function loginUser(email, password) {
   }
 }
 
-async function fetchPlaces(token) {
+async function fetchPlaces(token, maxPrice) {
+  const params = new URLSearchParams({ limit: '100' });
+  if (maxPrice && maxPrice !== 'All') {
+    params.set('max_price', maxPrice);
+  }
   try {
-    const response = await fetch('https://localhost:5000/api/places', {
+    const response = await fetch(`https://localhost:5000/api/places?${params}`, {
       method: 'GET',
+      cache: 'no-cache',  // Revalidate with the stored ETag; a 304 reuses the cached body
       headers: {
         'Authorization': `Bearer ${token}`,
         'Content-Type': 'application/json'
@@ -104,8 +109,8 @@ async function fetchPlaces(token) {
     });
 
     if (response.ok) {
-      const places = await response.json();
-      displayPlaces(places);
+      const data = await response.json();
+      displayPlaces(data.places);
     } else {
       alert('Failed to fetch places');
     }
@@ -140,17 +145,8 @@ function displayPlaces(places) {
 }
 
 function filterPlacesByPrice(selectedPrice) {
-  const placesList = document.querySelector('#places-list');
-  const placeCards = Array.from(placesList.querySelectorAll('.place-card'));
-  placeCards.forEach(placeCard => {
-    const priceText = placeCard.querySelector('p').textContent;
-    const price = parseInt(priceText.replace("Price per night: $", "").trim());
-    if (selectedPrice === 'All' || price <= selectedPrice) {
-      placeCard.style.display = 'flex';
-    } else {
-      placeCard.style.display = 'none';
-    }
-  });
+  // The price filter is applied by the API so only matching places are sent
+  fetchPlaces(getCookie('token'), selectedPrice);
 }
 
 function getPlaceIdFromUrl() {
@@ -162,6 +158,7 @@ async function fetchPlaceDetails(placeId, token) {
   try {
     const response = await fetch(`https://localhost:5000/api/places/${placeId}`, {
       method: 'GET',
+      cache: 'no-cache',  // Revalidate with the stored ETag; a 304 reuses the cached body
       headers: {
         'Authorization': `Bearer ${token}`,
         'Content-Type': 'application/json'